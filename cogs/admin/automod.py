@@ -1,7 +1,38 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from datetime import datetime, timedelta
+from collections import OrderedDict
 import aiosqlite
+import time
+from wordfilter import KeywordMatcher
+
+SPAM_MAX_TRACKED = 50000
+WORDLIST_MAX_SIZE = 250000
+DIGEST_INTERVAL = 60
+DIGEST_MAX_LINES = 15
+SPAM_DEFAULTS = {
+    "enabled": 1,
+    "rate": 5,
+    "per": 5,
+    "duplicates": 3,
+    "mentions": 8,
+    "action": "delete",
+    "timeout_seconds": 60
+}
+
+
+class SpamState:
+    """Per-(guild, user) token buckets and the last content hash"""
+    
+    __slots__ = ("tokens", "mention_tokens", "updated", "last_hash", "repeats", "punished_until")
+    
+    def __init__(self, config, now):
+        self.tokens = float(config["rate"])
+        self.mention_tokens = float(config["mentions"])
+        self.updated = now
+        self.last_hash = None
+        self.repeats = 0
+        self.punished_until = 0.0
 
 
 class AutoMod(commands.Cog):
@@ -10,7 +41,19 @@ class AutoMod(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db_path = "data/automod.db"
+        self.spam_configs = {}  # {guild_id: config dict}
+        self.spam_states = OrderedDict()  # {(guild_id, user_id): SpamState}, LRU bounded by SPAM_MAX_TRACKED
+        self.pending_deletes = {}  # {channel_id: [message, ...]}
+        self.rule_cache = {}  # {guild_id: {rule_id: AutoModRule}}, kept fresh by the rule listeners
+        self.keyword_matchers = {}  # {guild_id: KeywordMatcher}
+        self.digests = {}  # {guild_id: {"seen": {user_id}, "counted": {rule_id: action type}, "hits": {(rule_id, user_id, channel_id): [count, {keywords}]}}}
         self.bot.loop.create_task(self.setup_db())
+        self.flush_spam_deletes.start()
+        self.flush_action_digests.start()
+    
+    def cog_unload(self):
+        self.flush_spam_deletes.cancel()
+        self.flush_action_digests.cancel()
     
     async def setup_db(self):
         """Initialize the database"""
@@ -21,7 +64,43 @@ class AutoMod(commands.Cog):
                     log_channel_id INTEGER
                 )
             """)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS spam_config (
+                    guild_id INTEGER PRIMARY KEY,
+                    enabled INTEGER DEFAULT 1,
+                    rate INTEGER DEFAULT 5,
+                    per INTEGER DEFAULT 5,
+                    duplicates INTEGER DEFAULT 3,
+                    mentions INTEGER DEFAULT 8,
+                    action TEXT DEFAULT 'delete',
+                    timeout_seconds INTEGER DEFAULT 60
+                )
+            """)
+            await db.commit()
+            
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS keyword_filters (
+                    guild_id INTEGER NOT NULL,
+                    pattern TEXT NOT NULL,
+                    PRIMARY KEY (guild_id, pattern)
+                ) WITHOUT ROWID
+            """)
             await db.commit()
+            
+            async with db.execute("SELECT guild_id, pattern FROM keyword_filters ORDER BY guild_id") as cursor:
+                async for guild_id, pattern in cursor:
+                    matcher = self.keyword_matchers.get(guild_id)
+                    if matcher is None:
+                        matcher = self.keyword_matchers[guild_id] = KeywordMatcher()
+                    matcher.add(pattern)
+            
+            for matcher in self.keyword_matchers.values():
+                matcher.schedule_rebuild()
+            
+            db.row_factory = aiosqlite.Row
+            async with db.execute("SELECT * FROM spam_config") as cursor:
+                for row in await cursor.fetchall():
+                    self.spam_configs[row["guild_id"]] = dict(row)
     
     async def get_log_channel(self, guild_id):
         """Get the log channel for a guild"""
@@ -54,9 +133,207 @@ class AutoMod(commands.Cog):
                 except:
                     pass
     
+    # ==================== RULE CACHE ====================
+    
+    async def get_rules(self, guild):
+        """AutoMod rules for a guild ordered by creation, fetched once and then served from cache"""
+        rules = self.rule_cache.get(guild.id)
+        if rules is None:
+            fetched = await guild.fetch_automod_rules()
+            rules = self.rule_cache[guild.id] = {rule.id: rule for rule in fetched}
+        return [rules[rule_id] for rule_id in sorted(rules)]
+    
+    def cache_rule(self, rule):
+        """Insert or replace a rule in an already-populated guild cache"""
+        rules = self.rule_cache.get(rule.guild.id)
+        if rules is not None:
+            rules[rule.id] = rule
+    
+    def uncache_rule(self, rule):
+        rules = self.rule_cache.get(rule.guild.id)
+        if rules is not None:
+            rules.pop(rule.id, None)
+    
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.rule_cache.pop(guild.id, None)
+    
+    # ==================== LOCAL SPAM FILTER ====================
+    
+    async def save_spam_config(self, guild_id, config):
+        """Persist a guild's spam filter config and reset its buckets"""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute("""
+                INSERT INTO spam_config (guild_id, enabled, rate, per, duplicates, mentions, action, timeout_seconds)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(guild_id) DO UPDATE SET
+                    enabled = excluded.enabled,
+                    rate = excluded.rate,
+                    per = excluded.per,
+                    duplicates = excluded.duplicates,
+                    mentions = excluded.mentions,
+                    action = excluded.action,
+                    timeout_seconds = excluded.timeout_seconds
+            """, (guild_id, config["enabled"], config["rate"], config["per"], config["duplicates"],
+                  config["mentions"], config["action"], config["timeout_seconds"]))
+            await db.commit()
+        
+        self.spam_configs[guild_id] = config
+        for key in [key for key in self.spam_states if key[0] == guild_id]:
+            del self.spam_states[key]
+    
+    def check_spam(self, message, config):
+        """Update the author's buckets and return the violation, if any. No I/O."""
+        now = time.monotonic()
+        key = (message.guild.id, message.author.id)
+        state = self.spam_states.get(key)
+        
+        if state is None:
+            state = self.spam_states[key] = SpamState(config, now)
+            if len(self.spam_states) > SPAM_MAX_TRACKED:
+                self.spam_states.popitem(last=False)
+        else:
+            self.spam_states.move_to_end(key)
+        
+        elapsed = now - state.updated
+        state.updated = now
+        state.tokens = min(config["rate"], state.tokens + elapsed * config["rate"] / config["per"])
+        state.mention_tokens = min(config["mentions"], state.mention_tokens + elapsed * config["mentions"] / config["per"])
+        
+        state.tokens -= 1
+        state.mention_tokens -= len(message.raw_mentions) + len(message.raw_role_mentions)
+        
+        content_hash = hash(message.content.lower().strip()) if message.content else None
+        if content_hash is not None and content_hash == state.last_hash and elapsed < config["per"] * 2:
+            state.repeats += 1
+        else:
+            state.repeats = 1
+        state.last_hash = content_hash
+        
+        if state.mention_tokens < 0:
+            return state, "mention spam"
+        if state.repeats >= config["duplicates"]:
+            return state, "duplicate messages"
+        if state.tokens < 0:
+            return state, "message rate"
+        return state, None
+    
+    @tasks.loop(seconds=1)
+    async def flush_spam_deletes(self):
+        """Bulk delete queued spam, one request per channel per tick"""
+        pending, self.pending_deletes = self.pending_deletes, {}
+        for messages in pending.values():
+            channel = messages[0].channel
+            for index in range(0, len(messages), 100):
+                try:
+                    await channel.delete_messages(messages[index:index + 100])
+                except discord.HTTPException:
+                    pass
+    
+    async def punish_spammer(self, message, state, config, reason):
+        """Apply the configured action for a spam violation"""
+        action = config["action"]
+        
+        if action in ("delete", "timeout"):
+            self.pending_deletes.setdefault(message.channel.id, []).append(message)
+        
+        # One punishment/log per burst; later messages in the burst are only deleted
+        now = time.monotonic()
+        if now < state.punished_until:
+            return
+        state.punished_until = now + config["per"]
+        
+        if action == "timeout":
+            try:
+                await message.author.timeout(
+                    timedelta(seconds=config["timeout_seconds"]),
+                    reason=f"Spam filter: {reason}"
+                )
+            except discord.HTTPException:
+                pass
+        
+        embed = discord.Embed(
+            title="🛡️ Spam Filter",
+            description=f"**{reason.capitalize()}** from {message.author.mention} in {message.channel.mention}",
+            color=discord.Color.from_str("#a6afe7"),
+            timestamp=datetime.utcnow()
+        )
+        embed.add_field(name="Action", value=action.capitalize(), inline=True)
+        embed.set_author(name=str(message.author), icon_url=message.author.display_avatar.url)
+        await self.send_log(message.guild, embed)
+    
+    # ==================== LOCAL KEYWORD FILTER ====================
+    
+    async def add_keywords(self, guild_id, patterns):
+        """Add patterns to a guild's word list; returns how many were new"""
+        matcher = self.keyword_matchers.setdefault(guild_id, KeywordMatcher())
+        added = [pattern for pattern in patterns if matcher.add(pattern)]
+        rebuild = matcher.schedule_rebuild()
+        
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.executemany(
+                "INSERT OR IGNORE INTO keyword_filters (guild_id, pattern) VALUES (?, ?)",
+                [(guild_id, pattern) for pattern in added]
+            )
+            await db.commit()
+        await rebuild
+        return len(added)
+    
+    async def remove_keywords(self, guild_id, patterns):
+        """Remove patterns from a guild's word list; returns how many existed"""
+        matcher = self.keyword_matchers.get(guild_id)
+        if matcher is None:
+            return 0
+        removed = [pattern for pattern in patterns if matcher.remove(pattern)]
+        rebuild = matcher.schedule_rebuild()
+        
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.executemany(
+                "DELETE FROM keyword_filters WHERE guild_id = ? AND pattern = ?",
+                [(guild_id, pattern) for pattern in removed]
+            )
+            await db.commit()
+        await rebuild
+        return len(removed)
+    
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        """Local spam and keyword filters on top of Discord's AutoMod"""
+        if not message.guild or message.author.bot:
+            return
+        
+        config = self.spam_configs.get(message.guild.id)
+        matcher = self.keyword_matchers.get(message.guild.id)
+        if not matcher and (not config or not config["enabled"]):
+            return
+        
+        if not isinstance(message.author, discord.Member) or message.channel.permissions_for(message.author).manage_messages:
+            return
+        
+        if matcher and message.content:
+            keyword = matcher.match(message.content)
+            if keyword:
+                self.pending_deletes.setdefault(message.channel.id, []).append(message)
+                embed = discord.Embed(
+                    title="🚫 Keyword Filter",
+                    description=f"Message from {message.author.mention} in {message.channel.mention} was removed",
+                    color=discord.Color.from_str("#a6afe7"),
+                    timestamp=datetime.utcnow()
+                )
+                embed.add_field(name="Triggered by", value=f"`{keyword}`", inline=False)
+                embed.set_author(name=str(message.author), icon_url=message.author.display_avatar.url)
+                await self.send_log(message.guild, embed)
+                return
+        
+        if config and config["enabled"]:
+            state, reason = self.check_spam(message, config)
+            if reason:
+                await self.punish_spammer(message, state, config, reason)
+    
     @commands.Cog.listener()
     async def on_automod_rule_create(self, rule: discord.AutoModRule):
         """Called when an AutoMod rule is created"""
+        self.cache_rule(rule)
         embed = discord.Embed(
             title="✅ New AutoMod Rule Created",
             description=f"**{rule.name}** is now protecting your server!",
@@ -77,6 +354,7 @@ class AutoMod(commands.Cog):
     @commands.Cog.listener()
     async def on_automod_rule_update(self, rule: discord.AutoModRule):
         """Called when an AutoMod rule is updated"""
+        self.cache_rule(rule)
         embed = discord.Embed(
             title="🔧 AutoMod Rule Updated",
             description=f"Changes made to **{rule.name}**",
@@ -94,6 +372,7 @@ class AutoMod(commands.Cog):
     @commands.Cog.listener()
     async def on_automod_rule_delete(self, rule: discord.AutoModRule):
         """Called when an AutoMod rule is deleted"""
+        self.uncache_rule(rule)
         embed = discord.Embed(
             title="🗑️ AutoMod Rule Removed",
             description=f"**{rule.name}** has been deleted",
@@ -107,8 +386,35 @@ class AutoMod(commands.Cog):
     
     @commands.Cog.listener()
     async def on_automod_action(self, execution: discord.AutoModAction):
-        """Called when an AutoMod action is executed"""
+        """Called when an AutoMod action is executed
+        
+        The first hit from each user in a digest window is logged right away; the rest
+        are folded into a summary posted every DIGEST_INTERVAL seconds. Discord sends one
+        event per action of a rule, so a message that is blocked, alerted and timed out
+        arrives three times. Only one action type per rule is counted: the rule's first
+        action, or the first type seen in this window for rules missing from the cache.
+        """
         member = execution.member
+        digest = self.digests.setdefault(execution.guild.id, {"seen": set(), "counted": {}, "hits": {}})
+        
+        counted = digest["counted"].get(execution.rule_id)
+        if counted is None:
+            rule = self.rule_cache.get(execution.guild.id, {}).get(execution.rule_id)
+            counted = rule.actions[0].type if rule and rule.actions else execution.action.type
+            digest["counted"][execution.rule_id] = counted
+        if execution.action.type != counted:
+            return
+        
+        if execution.user_id in digest["seen"]:
+            key = (execution.rule_id, execution.user_id, execution.channel_id)
+            hit = digest["hits"].get(key)
+            if hit is None:
+                hit = digest["hits"][key] = [0, set()]
+            hit[0] += 1
+            if execution.matched_keyword and len(hit[1]) < 3:
+                hit[1].add(execution.matched_keyword)
+            return
+        digest["seen"].add(execution.user_id)
         
         # Determine action emoji and description
         action_type = str(execution.action.type).replace("AutoModAction.", "").lower()
@@ -143,6 +449,44 @@ class AutoMod(commands.Cog):
         
         await self.send_log(execution.guild, embed)
     
+    @tasks.loop(seconds=DIGEST_INTERVAL)
+    async def flush_action_digests(self):
+        """Post one summary embed per guild for the AutoMod hits folded into the last window"""
+        digests, self.digests = self.digests, {}
+        
+        for guild_id, digest in digests.items():
+            if not digest["hits"]:
+                continue
+            guild = self.bot.get_guild(guild_id)
+            if guild is None:
+                continue
+            
+            rules = self.rule_cache.get(guild_id, {})
+            hits = sorted(digest["hits"].items(), key=lambda item: item[1][0], reverse=True)
+            lines = []
+            for (rule_id, user_id, channel_id), (count, keywords) in hits[:DIGEST_MAX_LINES]:
+                rule = rules.get(rule_id)
+                line = f"**{count}x** <@{user_id}> in <#{channel_id}> • {rule.name if rule else f'rule {rule_id}'}"
+                if keywords:
+                    line += f" • `{'`, `'.join(keywords)}`"
+                lines.append(line)
+            if len(hits) > DIGEST_MAX_LINES:
+                lines.append(f"*...and {len(hits) - DIGEST_MAX_LINES} more*")
+            
+            total = sum(count for count, _ in digest["hits"].values())
+            embed = discord.Embed(
+                title="📊 AutoMod Digest",
+                description="\n".join(lines),
+                color=discord.Color.from_str("#a6afe7"),
+                timestamp=datetime.utcnow()
+            )
+            embed.set_footer(text=f"{total} more action(s) from {len(digest['seen'])} user(s) in the last {DIGEST_INTERVAL}s")
+            await self.send_log(guild, embed)
+    
+    @flush_action_digests.before_loop
+    async def before_flush_action_digests(self):
+        await self.bot.wait_until_ready()
+    
     @commands.group(name="automod", aliases=["am"], invoke_without_command=True)
     @commands.has_permissions(manage_guild=True)
     async def automod(self, ctx):
@@ -180,6 +524,18 @@ class AutoMod(commands.Cog):
                 "syntax": "Syntax: ;automod spam",
                 "example": "Example: ;automod spam"
             },
+            {
+                "title": "Command: automod spamfilter • AutoMod Module",
+                "description": "Local per-user rate, duplicate and mention limits",
+                "syntax": "Syntax: ;automod spamfilter [on/off/rate/mentions/duplicates/action]",
+                "example": "Example: ;automod spamfilter rate 5 5"
+            },
+            {
+                "title": "Command: automod wordlist • AutoMod Module",
+                "description": "Block large word lists locally, with wildcard and leetspeak matching",
+                "syntax": "Syntax: ;automod wordlist [add/remove/import/clear]",
+                "example": "Example: ;automod wordlist add badword, bad phrase"
+            },
             {
                 "title": "Command: automod mentions • AutoMod Module",
                 "description": "Block mass mentions (mention spam)",
@@ -248,11 +604,13 @@ class AutoMod(commands.Cog):
                 2: "info, show",
                 3: "keyword, word",
                 4: "antispam",
-                5: "mentionspam",
-                6: "enable, activate",
-                7: "disable, deactivate",
-                8: "remove, del",
-                9: "setlog, logging"
+                5: "sf, ratelimit",
+                6: "wl, filter",
+                7: "mentionspam",
+                8: "enable, activate",
+                9: "disable, deactivate",
+                10: "remove, del",
+                11: "setlog, logging"
             }
             
             aliases = aliases_map.get(page_index, "am")
@@ -328,7 +686,7 @@ class AutoMod(commands.Cog):
     async def automod_rules(self, ctx):
         """View all AutoMod rules (simple list)"""
         try:
-            rules = await ctx.guild.fetch_automod_rules()
+            rules = await self.get_rules(ctx.guild)
         except discord.Forbidden:
             await ctx.send("❌ I need **Manage Server** permission to view AutoMod rules!")
             return
@@ -364,7 +722,7 @@ class AutoMod(commands.Cog):
     async def automod_view(self, ctx, rule_number: int):
         """View details about a specific rule by number"""
         try:
-            rules = await ctx.guild.fetch_automod_rules()
+            rules = await self.get_rules(ctx.guild)
         except discord.Forbidden:
             await ctx.send("❌ I need **Manage Server** permission to view AutoMod rules!")
             return
@@ -377,7 +735,7 @@ class AutoMod(commands.Cog):
             await ctx.send(f"❌ Invalid rule number! Choose between 1 and {len(rules)}")
             return
         
-        rule = list(rules)[rule_number - 1]
+        rule = rules[rule_number - 1]
         
         status = "🟢 Active" if rule.enabled else "🔴 Inactive"
         
@@ -428,7 +786,7 @@ class AutoMod(commands.Cog):
     async def automod_on(self, ctx, rule_number: int):
         """Turn on an AutoMod rule by number"""
         try:
-            rules = await ctx.guild.fetch_automod_rules()
+            rules = await self.get_rules(ctx.guild)
         except discord.Forbidden:
             await ctx.send("❌ I need **Manage Server** permission to manage AutoMod rules!")
             return
@@ -441,14 +799,14 @@ class AutoMod(commands.Cog):
             await ctx.send(f"❌ Invalid rule number! Choose between 1 and {len(rules)}")
             return
         
-        rule = list(rules)[rule_number - 1]
+        rule = rules[rule_number - 1]
         
         if rule.enabled:
             await ctx.send(f"ℹ️ **{rule.name}** is already active!")
             return
         
         try:
-            await rule.edit(enabled=True)
+            self.cache_rule(await rule.edit(enabled=True))
             
             embed = discord.Embed(
                 title="✅ Rule Activated",
@@ -465,7 +823,7 @@ class AutoMod(commands.Cog):
     async def automod_off(self, ctx, rule_number: int):
         """Turn off an AutoMod rule by number"""
         try:
-            rules = await ctx.guild.fetch_automod_rules()
+            rules = await self.get_rules(ctx.guild)
         except discord.Forbidden:
             await ctx.send("❌ I need **Manage Server** permission to manage AutoMod rules!")
             return
@@ -478,14 +836,14 @@ class AutoMod(commands.Cog):
             await ctx.send(f"❌ Invalid rule number! Choose between 1 and {len(rules)}")
             return
         
-        rule = list(rules)[rule_number - 1]
+        rule = rules[rule_number - 1]
         
         if not rule.enabled:
             await ctx.send(f"ℹ️ **{rule.name}** is already inactive!")
             return
         
         try:
-            await rule.edit(enabled=False)
+            self.cache_rule(await rule.edit(enabled=False))
             
             embed = discord.Embed(
                 title="⏸️ Rule Deactivated",
@@ -540,6 +898,7 @@ class AutoMod(commands.Cog):
                 enabled=True,
                 reason=f"Created by {ctx.author}"
             )
+            self.cache_rule(rule)
             
             embed = discord.Embed(
                 title="✅ Keyword Filter Created",
@@ -583,6 +942,7 @@ class AutoMod(commands.Cog):
                 enabled=True,
                 reason=f"Created by {ctx.author}"
             )
+            self.cache_rule(rule)
             
             embed = discord.Embed(
                 title="✅ Anti-Spam Protection Enabled",
@@ -602,6 +962,177 @@ class AutoMod(commands.Cog):
         except discord.HTTPException as e:
             await ctx.send(f"❌ Failed to create rule: {e}")
     
+    @automod.group(name="spamfilter", aliases=["sf", "ratelimit"], invoke_without_command=True)
+    @commands.has_permissions(manage_guild=True)
+    async def automod_spamfilter(self, ctx):
+        """Show the local spam filter settings"""
+        config = self.spam_configs.get(ctx.guild.id)
+        
+        if not config:
+            await ctx.send(f"ℹ️ The spam filter is off. Enable it with `{ctx.prefix}automod spamfilter on`")
+            return
+        
+        embed = discord.Embed(
+            title="🛡️ Spam Filter",
+            description=f"Status: {'🟢 Active' if config['enabled'] else '🔴 Inactive'}",
+            color=discord.Color.from_str("#a6afe7")
+        )
+        embed.add_field(name="Rate", value=f"{config['rate']} messages / {config['per']}s", inline=True)
+        embed.add_field(name="Mentions", value=f"{config['mentions']} / {config['per']}s", inline=True)
+        embed.add_field(name="Duplicates", value=f"{config['duplicates']} in a row", inline=True)
+        action = config["action"].capitalize()
+        if config["action"] == "timeout":
+            action += f" ({config['timeout_seconds']}s)"
+        embed.add_field(name="Action", value=action, inline=True)
+        await ctx.send(embed=embed)
+    
+    @automod_spamfilter.command(name="on", aliases=["enable"])
+    @commands.has_permissions(manage_guild=True)
+    async def spamfilter_on(self, ctx):
+        """Enable the local spam filter"""
+        config = dict(self.spam_configs.get(ctx.guild.id) or SPAM_DEFAULTS)
+        config["enabled"] = 1
+        await self.save_spam_config(ctx.guild.id, config)
+        await ctx.send("✅ Spam filter is now **active**")
+    
+    @automod_spamfilter.command(name="off", aliases=["disable"])
+    @commands.has_permissions(manage_guild=True)
+    async def spamfilter_off(self, ctx):
+        """Disable the local spam filter"""
+        config = dict(self.spam_configs.get(ctx.guild.id) or SPAM_DEFAULTS)
+        config["enabled"] = 0
+        await self.save_spam_config(ctx.guild.id, config)
+        await ctx.send("⏸️ Spam filter has been turned **off**")
+    
+    @automod_spamfilter.command(name="rate")
+    @commands.has_permissions(manage_guild=True)
+    async def spamfilter_rate(self, ctx, messages: int, seconds: int):
+        """Set how many messages a user may send per window"""
+        if not 1 <= messages <= 50 or not 1 <= seconds <= 120:
+            await ctx.send("❌ Messages must be 1-50 and seconds 1-120!")
+            return
+        config = dict(self.spam_configs.get(ctx.guild.id) or SPAM_DEFAULTS)
+        config["rate"] = messages
+        config["per"] = seconds
+        await self.save_spam_config(ctx.guild.id, config)
+        await ctx.send(f"✅ Users may send **{messages}** messages every **{seconds}s**")
+    
+    @automod_spamfilter.command(name="mentions")
+    @commands.has_permissions(manage_guild=True)
+    async def spamfilter_mentions(self, ctx, limit: int):
+        """Set how many mentions a user may send per window"""
+        if not 1 <= limit <= 100:
+            await ctx.send("❌ Mention limit must be between 1 and 100!")
+            return
+        config = dict(self.spam_configs.get(ctx.guild.id) or SPAM_DEFAULTS)
+        config["mentions"] = limit
+        await self.save_spam_config(ctx.guild.id, config)
+        await ctx.send(f"✅ Users may send **{limit}** mentions every **{config['per']}s**")
+    
+    @automod_spamfilter.command(name="duplicates", aliases=["dupes"])
+    @commands.has_permissions(manage_guild=True)
+    async def spamfilter_duplicates(self, ctx, count: int):
+        """Set how many identical messages in a row count as spam"""
+        if not 2 <= count <= 20:
+            await ctx.send("❌ Duplicate count must be between 2 and 20!")
+            return
+        config = dict(self.spam_configs.get(ctx.guild.id) or SPAM_DEFAULTS)
+        config["duplicates"] = count
+        await self.save_spam_config(ctx.guild.id, config)
+        await ctx.send(f"✅ **{count}** identical messages in a row will be treated as spam")
+    
+    @automod_spamfilter.command(name="action")
+    @commands.has_permissions(manage_guild=True)
+    async def spamfilter_action(self, ctx, action: str, timeout_seconds: int = 60):
+        """Choose what happens to spam: delete, timeout or log"""
+        action = action.lower()
+        if action not in ("delete", "timeout", "log"):
+            await ctx.send("❌ Action must be `delete`, `timeout` or `log`!")
+            return
+        if not 1 <= timeout_seconds <= 2419200:
+            await ctx.send("❌ Timeout must be between 1 second and 28 days!")
+            return
+        config = dict(self.spam_configs.get(ctx.guild.id) or SPAM_DEFAULTS)
+        config["action"] = action
+        config["timeout_seconds"] = timeout_seconds
+        await self.save_spam_config(ctx.guild.id, config)
+        await ctx.send(f"✅ Spam filter action set to **{action}**")
+    
+    @automod.group(name="wordlist", aliases=["wl", "filter"], invoke_without_command=True)
+    @commands.has_permissions(manage_guild=True)
+    async def automod_wordlist(self, ctx):
+        """Show the local word list (no size cap like Discord's keyword rules)"""
+        matcher = self.keyword_matchers.get(ctx.guild.id)
+        
+        embed = discord.Embed(
+            title="🚫 Word List",
+            description=f"**{len(matcher) if matcher else 0}** pattern(s) blocked",
+            color=discord.Color.from_str("#a6afe7")
+        )
+        embed.add_field(
+            name="Usage",
+            value=(
+                f"`{ctx.prefix}automod wordlist add <words>` • `{ctx.prefix}automod wordlist remove <words>`\n"
+                f"`{ctx.prefix}automod wordlist import` with a .txt attachment (one pattern per line)\n"
+                "Wildcards: `word*` starts with, `*word` ends with, `*word*` anywhere"
+            ),
+            inline=False
+        )
+        await ctx.send(embed=embed)
+    
+    @automod_wordlist.command(name="add")
+    @commands.has_permissions(manage_guild=True)
+    async def wordlist_add(self, ctx, *, words: str):
+        """Block words or phrases (comma separated for phrases)"""
+        separator = "," if "," in words else None
+        patterns = [word.strip() for word in words.split(separator) if word.strip()]
+        matcher = self.keyword_matchers.get(ctx.guild.id)
+        
+        if (len(matcher) if matcher else 0) + len(patterns) > WORDLIST_MAX_SIZE:
+            await ctx.send(f"❌ Word lists are limited to {WORDLIST_MAX_SIZE:,} patterns!")
+            return
+        
+        added = await self.add_keywords(ctx.guild.id, patterns)
+        await ctx.send(f"✅ Added **{added}** pattern(s) to the word list")
+    
+    @automod_wordlist.command(name="remove", aliases=["del", "delete"])
+    @commands.has_permissions(manage_guild=True)
+    async def wordlist_remove(self, ctx, *, words: str):
+        """Unblock words or phrases"""
+        separator = "," if "," in words else None
+        patterns = [word.strip() for word in words.split(separator) if word.strip()]
+        removed = await self.remove_keywords(ctx.guild.id, patterns)
+        await ctx.send(f"✅ Removed **{removed}** pattern(s) from the word list")
+    
+    @automod_wordlist.command(name="import")
+    @commands.has_permissions(manage_guild=True)
+    async def wordlist_import(self, ctx):
+        """Import a .txt attachment with one pattern per line"""
+        if not ctx.message.attachments:
+            await ctx.send("❌ Attach a .txt file with one word or phrase per line!")
+            return
+        
+        content = (await ctx.message.attachments[0].read()).decode("utf-8", errors="ignore")
+        patterns = [line.strip() for line in content.splitlines() if line.strip()]
+        matcher = self.keyword_matchers.get(ctx.guild.id)
+        
+        if (len(matcher) if matcher else 0) + len(patterns) > WORDLIST_MAX_SIZE:
+            await ctx.send(f"❌ Word lists are limited to {WORDLIST_MAX_SIZE:,} patterns!")
+            return
+        
+        added = await self.add_keywords(ctx.guild.id, patterns)
+        await ctx.send(f"✅ Imported **{added}** new pattern(s)")
+    
+    @automod_wordlist.command(name="clear")
+    @commands.has_permissions(manage_guild=True)
+    async def wordlist_clear(self, ctx):
+        """Remove every pattern from the word list"""
+        self.keyword_matchers.pop(ctx.guild.id, None)
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute("DELETE FROM keyword_filters WHERE guild_id = ?", (ctx.guild.id,))
+            await db.commit()
+        await ctx.send("🗑️ Word list cleared")
+    
     @automod.command(name="mentions", aliases=["mentionspam"])
     @commands.has_permissions(manage_guild=True)
     async def automod_mentions(self, ctx, limit: int = 5):
@@ -626,6 +1157,7 @@ class AutoMod(commands.Cog):
                 enabled=True,
                 reason=f"Created by {ctx.author}"
             )
+            self.cache_rule(rule)
             
             embed = discord.Embed(
                 title="✅ Mention Spam Protection Enabled",
@@ -650,7 +1182,7 @@ class AutoMod(commands.Cog):
     async def automod_delete(self, ctx, rule_number: int):
         """Delete an AutoMod rule by number"""
         try:
-            rules = await ctx.guild.fetch_automod_rules()
+            rules = await self.get_rules(ctx.guild)
         except discord.Forbidden:
             await ctx.send("❌ I need **Manage Server** permission to manage AutoMod rules!")
             return
@@ -663,11 +1195,12 @@ class AutoMod(commands.Cog):
             await ctx.send(f"❌ Invalid rule number! Choose between 1 and {len(rules)}")
             return
         
-        rule = list(rules)[rule_number - 1]
+        rule = rules[rule_number - 1]
         rule_name = rule.name
         
         try:
             await rule.delete(reason=f"Deleted by {ctx.author}")
+            self.uncache_rule(rule)
             
             embed = discord.Embed(
                 title="🗑️ Rule Deleted",
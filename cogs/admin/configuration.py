@@ -1,10 +1,16 @@
 import discord
 from discord.ext import commands, tasks
 import aiosqlite
+import asyncio
 import os
 import sqlite3
+import time
 from datetime import datetime, timedelta
 
+VOICEMASTER_MAX_POOL_SIZE = 10
+VOICEMASTER_POOL_NAME = "vm-pool"
+VOICEMASTER_SWEEP_DELAY = 1.0
+
 class TicketView(discord.ui.View):
     def __init__(self, ctx):
         super().__init__(timeout=60)
@@ -378,6 +384,14 @@ class VoiceMasterView(discord.ui.View):
                 "permissions": "Administrator",
                 "aliases": None
             },
+            {
+                "title": "Command: voicemaster pool • VoiceMaster Module",
+                "description": "Keep hidden channels ready so join-to-create is instant",
+                "syntax": f"{ctx.prefix}voicemaster pool [size]",
+                "example": f"{ctx.prefix}vm pool 3",
+                "permissions": "Administrator",
+                "aliases": None
+            },
             {
                 "title": "Command: voicemaster lock • VoiceMaster Module",
                 "description": "Lock your temporary voice channel",
@@ -605,15 +619,23 @@ class Configuration(commands.Cog):
         self.bot = bot
         self.db_path = "data/configuration.db"
         self.temp_channels = {}
+        self.voice_pools = {}
+        self.pool_refills = {}
+        self.queued_pool_configs = {}  # Latest config seen while a refill was running
+        self.autoroles_paused = {}  # {guild_id: unix time}, set by anti-raid
         self.purple = discord.Color.from_str("#a6afe7")
         self.approve = "<:approve:1429468807348486305>"
         self.deny = "<:deny:1429468818094424075>"
         self.bot.loop.create_task(self.setup_db())
         self.check_jail_timers.start()
+        self.reconcile_temp_channels.start()
     
     def cog_unload(self):
         """Cancel tasks when cog is unloaded"""
         self.check_jail_timers.cancel()
+        self.reconcile_temp_channels.cancel()
+        for task in self.pool_refills.values():
+            task.cancel()
     
     async def cog_load(self):
         """Add persistent view when cog loads"""
@@ -630,10 +652,17 @@ class Configuration(commands.Cog):
                     guild_id INTEGER PRIMARY KEY,
                     join_channel_id INTEGER,
                     category_id INTEGER,
-                    channel_name TEXT DEFAULT '🎤 {user}''s channel'
+                    channel_name TEXT DEFAULT '🎤 {user}''s channel',
+                    pool_size INTEGER DEFAULT 0
                 )
             """)
             
+            # Older databases predate the channel pool
+            async with db.execute("PRAGMA table_info(voicemaster_config)") as cursor:
+                columns = [row[1] for row in await cursor.fetchall()]
+            if 'pool_size' not in columns:
+                await db.execute("ALTER TABLE voicemaster_config ADD COLUMN pool_size INTEGER DEFAULT 0")
+            
             # Temporary voice channels
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS temp_channels (
@@ -644,6 +673,15 @@ class Configuration(commands.Cog):
                 )
             """)
             
+            # Pre-created hidden channels waiting to be handed out
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS voicemaster_pool (
+                    channel_id INTEGER PRIMARY KEY,
+                    guild_id INTEGER,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
             # Autoroles
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS autoroles (
@@ -719,6 +757,8 @@ class Configuration(commands.Cog):
             """)
             
             await db.commit()
+        
+        await self.load_voice_pools()
     
     
     # ==================== VOICEMASTER METHODS ====================
@@ -727,7 +767,7 @@ class Configuration(commands.Cog):
         """Get voicemaster config for a specific guild"""
         async with aiosqlite.connect(self.db_path) as db:
             async with db.execute(
-                "SELECT join_channel_id, category_id, channel_name FROM voicemaster_config WHERE guild_id = ?",
+                "SELECT join_channel_id, category_id, channel_name, pool_size FROM voicemaster_config WHERE guild_id = ?",
                 (guild_id,)
             ) as cursor:
                 row = await cursor.fetchone()
@@ -735,7 +775,8 @@ class Configuration(commands.Cog):
                     return {
                         'join_channel_id': row[0],
                         'category_id': row[1],
-                        'channel_name': row[2]
+                        'channel_name': row[2],
+                        'pool_size': row[3] or 0
                     }
                 return None
     
@@ -758,6 +799,15 @@ class Configuration(commands.Cog):
             await db.execute("DELETE FROM voicemaster_config WHERE guild_id = ?", (guild_id,))
             await db.commit()
     
+    async def set_pool_size(self, guild_id, pool_size):
+        """Set how many pre-created channels to keep ready for a guild"""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute(
+                "UPDATE voicemaster_config SET pool_size = ? WHERE guild_id = ?",
+                (pool_size, guild_id)
+            )
+            await db.commit()
+    
     async def add_temp_channel(self, channel_id, guild_id, owner_id):
         """Add a temporary channel to the database"""
         async with aiosqlite.connect(self.db_path) as db:
@@ -792,6 +842,142 @@ class Configuration(commands.Cog):
                     return row[0]
                 return None
     
+    # ==================== VOICEMASTER POOL METHODS ====================
+    
+    async def load_voice_pools(self):
+        """Load pooled channel IDs into memory"""
+        async with aiosqlite.connect(self.db_path) as db:
+            async with db.execute("SELECT channel_id, guild_id FROM voicemaster_pool ORDER BY created_at") as cursor:
+                rows = await cursor.fetchall()
+        
+        for channel_id, guild_id in rows:
+            self.voice_pools.setdefault(guild_id, []).append(channel_id)
+    
+    async def add_pool_channel(self, channel_id, guild_id):
+        """Add a pre-created channel to the pool"""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute(
+                "INSERT INTO voicemaster_pool (channel_id, guild_id) VALUES (?, ?)",
+                (channel_id, guild_id)
+            )
+            await db.commit()
+        self.voice_pools.setdefault(guild_id, []).append(channel_id)
+    
+    async def remove_pool_channels(self, channel_ids):
+        """Forget pooled channels that were deleted or went missing"""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.executemany(
+                "DELETE FROM voicemaster_pool WHERE channel_id = ?",
+                [(channel_id,) for channel_id in channel_ids]
+            )
+            await db.commit()
+    
+    async def assign_pool_channel(self, channel_id, guild_id, owner_id):
+        """Move a pooled channel over to the temp channel table"""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute("DELETE FROM voicemaster_pool WHERE channel_id = ?", (channel_id,))
+            await db.execute(
+                "INSERT INTO temp_channels (channel_id, guild_id, owner_id) VALUES (?, ?, ?)",
+                (channel_id, guild_id, owner_id)
+            )
+            await db.commit()
+    
+    def take_pool_channel(self, guild):
+        """Pop a ready pooled channel for a guild, dropping any that no longer exist"""
+        pool = self.voice_pools.get(guild.id)
+        missing = []
+        channel = None
+        
+        while pool:
+            channel_id = pool.pop(0)
+            candidate = guild.get_channel(channel_id)
+            if isinstance(candidate, discord.VoiceChannel):
+                channel = candidate
+                break
+            missing.append(channel_id)
+        
+        if missing:
+            self.bot.loop.create_task(self.remove_pool_channels(missing))
+        return channel
+    
+    def schedule_pool_refill(self, guild, config):
+        """Start a background refill for a guild, or queue another pass if one is running"""
+        task = self.pool_refills.get(guild.id)
+        if task and not task.done():
+            self.queued_pool_configs[guild.id] = config
+            return
+        self.pool_refills[guild.id] = self.bot.loop.create_task(self.run_pool_refills(guild, config))
+    
+    async def run_pool_refills(self, guild, config):
+        """Refill, then repeat with the newest config if it changed mid-run (e.g. `vm pool`)"""
+        while config is not None:
+            await self.refill_voice_pool(guild, config)
+            config = self.queued_pool_configs.pop(guild.id, None)
+    
+    async def refill_voice_pool(self, guild, config):
+        """Create or trim hidden channels until the pool matches its configured size"""
+        pool = self.voice_pools.setdefault(guild.id, [])
+        pool_size = min(config.get('pool_size', 0), VOICEMASTER_MAX_POOL_SIZE)
+        category = guild.get_channel(config['category_id'])
+        
+        if not category:
+            return
+        
+        while len(pool) > pool_size:
+            channel_id = pool.pop()
+            channel = guild.get_channel(channel_id)
+            if channel:
+                try:
+                    await channel.delete(reason="VoiceMaster: Shrinking channel pool")
+                except discord.HTTPException:
+                    pass
+            await self.remove_pool_channels([channel_id])
+        
+        # Copied overwrites may allow view_channel for some roles; pooled channels stay hidden from all
+        overwrites = {}
+        for target, overwrite in category.overwrites.items():
+            hidden = discord.PermissionOverwrite.from_pair(*overwrite.pair())
+            hidden.update(view_channel=False, connect=False)
+            overwrites[target] = hidden
+        overwrites[guild.default_role] = discord.PermissionOverwrite(view_channel=False, connect=False)
+        overwrites[guild.me] = discord.PermissionOverwrite(view_channel=True, connect=True, manage_channels=True)
+        
+        while len(pool) < pool_size:
+            try:
+                channel = await guild.create_voice_channel(
+                    name=VOICEMASTER_POOL_NAME,
+                    category=category,
+                    overwrites=overwrites,
+                    reason="VoiceMaster: Pre-creating pooled channel"
+                )
+            except discord.HTTPException:
+                return
+            await self.add_pool_channel(channel.id, guild.id)
+    
+    async def activate_pool_channel(self, channel, member, channel_name):
+        """Rename and unhide a pooled channel after its owner has been moved in"""
+        try:
+            await channel.edit(
+                name=channel_name,
+                sync_permissions=True,
+                reason=f"VoiceMaster: Created by {member}"
+            )
+        except discord.HTTPException:
+            pass
+        
+        # Everyone may have left while the edit was in flight; the leave handler then
+        # already dropped (or tried to drop) the channel, so don't record it as temp again
+        if member.guild.get_channel(channel.id) is None or not channel.members:
+            self.temp_channels.pop(channel.id, None)
+            await self.remove_pool_channels([channel.id])
+            if member.guild.get_channel(channel.id) is not None:
+                try:
+                    await channel.delete(reason="VoiceMaster: Empty temporary channel")
+                except discord.HTTPException:
+                    pass
+            return
+        await self.assign_pool_channel(channel.id, member.guild.id, member.id)
+    
     # ==================== AUTOROLE METHODS ====================
     
     async def get_autoroles(self, guild_id):
@@ -1094,6 +1280,96 @@ class Configuration(commands.Cog):
     async def before_check_jail_timers(self):
         await self.bot.wait_until_ready()
 
+    
+    @tasks.loop(minutes=30)
+    async def reconcile_temp_channels(self):
+        """Delete orphaned temp channels and drop rows for channels that no longer exist"""
+        started = time.perf_counter()
+        
+        async with aiosqlite.connect(self.db_path) as db:
+            async with db.execute("SELECT channel_id, guild_id FROM temp_channels") as cursor:
+                rows = await cursor.fetchall()
+            async with db.execute(
+                "SELECT guild_id, join_channel_id, category_id, channel_name, pool_size FROM voicemaster_config WHERE pool_size > 0"
+            ) as cursor:
+                pooled_configs = await cursor.fetchall()
+        
+        stale = []
+        orphans = []
+        for channel_id, guild_id in rows:
+            guild = self.bot.get_guild(guild_id)
+            if guild is None:
+                stale.append(channel_id)
+                continue
+            if guild.unavailable:
+                continue
+            
+            channel = guild.get_channel(channel_id)
+            if channel is None:
+                stale.append(channel_id)
+            elif not channel.members:
+                orphans.append(channel)
+        
+        missing_pooled = []
+        for guild_id, pool in self.voice_pools.items():
+            guild = self.bot.get_guild(guild_id)
+            if guild is None or guild.unavailable:
+                continue
+            alive = [channel_id for channel_id in pool if guild.get_channel(channel_id)]
+            missing_pooled.extend(channel_id for channel_id in pool if channel_id not in alive)
+            pool[:] = alive
+        
+        scan_time = time.perf_counter() - started
+        
+        # Deletions go out one at a time so a large backlog doesn't trip rate limits
+        deleted = 0
+        for channel in orphans:
+            if channel.members:
+                continue
+            try:
+                await channel.delete(reason="VoiceMaster: Orphaned temporary channel")
+            except discord.NotFound:
+                pass
+            except discord.HTTPException:
+                continue
+            stale.append(channel.id)
+            deleted += 1
+            await asyncio.sleep(VOICEMASTER_SWEEP_DELAY)
+        
+        if stale or missing_pooled:
+            async with aiosqlite.connect(self.db_path) as db:
+                await db.executemany(
+                    "DELETE FROM temp_channels WHERE channel_id = ?",
+                    [(channel_id,) for channel_id in stale]
+                )
+                await db.executemany(
+                    "DELETE FROM voicemaster_pool WHERE channel_id = ?",
+                    [(channel_id,) for channel_id in missing_pooled]
+                )
+                await db.commit()
+            
+            for channel_id in stale:
+                self.temp_channels.pop(channel_id, None)
+        
+        for guild_id, join_channel_id, category_id, channel_name, pool_size in pooled_configs:
+            guild = self.bot.get_guild(guild_id)
+            if guild and not guild.unavailable:
+                self.schedule_pool_refill(guild, {
+                    'join_channel_id': join_channel_id,
+                    'category_id': category_id,
+                    'channel_name': channel_name,
+                    'pool_size': pool_size
+                })
+        
+        print(
+            f"✅ VoiceMaster sweep: {len(rows)} tracked, {deleted} orphan(s) deleted, "
+            f"{len(stale)} stale row(s) dropped, {len(missing_pooled)} pooled row(s) dropped "
+            f"(scan {scan_time * 1000:.1f}ms, total {time.perf_counter() - started:.1f}s)"
+        )
+    
+    @reconcile_temp_channels.before_loop
+    async def before_reconcile_temp_channels(self):
+        await self.bot.wait_until_ready()
         
     def add_alias(self, guild_id: int, alias: str, real_command: str):
         """Add or update an alias in the database"""
@@ -1157,6 +1433,21 @@ class Configuration(commands.Cog):
                 
                 channel_name = config['channel_name'].replace('{user}', member.display_name)
                 
+                if config['pool_size']:
+                    pooled = self.take_pool_channel(member.guild)
+                    self.schedule_pool_refill(member.guild, config)
+                    
+                    if pooled:
+                        self.temp_channels[pooled.id] = member.id
+                        try:
+                            await member.move_to(pooled)
+                        except discord.HTTPException:
+                            del self.temp_channels[pooled.id]
+                            self.voice_pools.setdefault(member.guild.id, []).insert(0, pooled.id)
+                            return
+                        self.bot.loop.create_task(self.activate_pool_channel(pooled, member, channel_name))
+                        return
+                
                 try:
                     temp_channel = await member.guild.create_voice_channel(
                         name=channel_name,
@@ -1189,6 +1480,9 @@ class Configuration(commands.Cog):
     @commands.Cog.listener()
     async def on_member_join(self, member):
         """Give auto roles to new members"""
+        if self.autoroles_paused.get(member.guild.id, 0) > time.time():
+            return
+        
         role_ids = await self.get_autoroles(member.guild.id)
         
         if not role_ids:
@@ -1565,6 +1859,22 @@ class Configuration(commands.Cog):
             except:
                 pass
         
+        task = self.pool_refills.pop(ctx.guild.id, None)
+        if task:
+            task.cancel()
+        self.queued_pool_configs.pop(ctx.guild.id, None)
+        
+        pooled_ids = self.voice_pools.pop(ctx.guild.id, [])
+        for channel_id in pooled_ids:
+            pooled = ctx.guild.get_channel(channel_id)
+            if pooled:
+                try:
+                    await pooled.delete(reason="VoiceMaster: Configuration removed")
+                except:
+                    pass
+        if pooled_ids:
+            await self.remove_pool_channels(pooled_ids)
+        
         await self.remove_guild_config(ctx.guild.id)
         
         embed = discord.Embed(
@@ -1574,6 +1884,47 @@ class Configuration(commands.Cog):
         
         await ctx.send(embed=embed)
     
+    @voicemaster.command(name="pool")
+    @commands.has_permissions(administrator=True)
+    async def vm_pool(self, ctx, size: int = None):
+        """Keep pre-created channels ready so joins only need a move"""
+        config = await self.get_guild_config(ctx.guild.id)
+        
+        if not config:
+            embed = discord.Embed(
+                description="VoiceMaster is not configured for this server!",
+                color=discord.Color.from_str("#a6afe7")
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        if size is None:
+            ready = len(self.voice_pools.get(ctx.guild.id, []))
+            embed = discord.Embed(
+                description=f"Channel pool size is **{config['pool_size']}** ({ready} ready)",
+                color=discord.Color.from_str("#a6afe7")
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        if size < 0 or size > VOICEMASTER_MAX_POOL_SIZE:
+            embed = discord.Embed(
+                description=f"Pool size must be between 0 and {VOICEMASTER_MAX_POOL_SIZE}!",
+                color=discord.Color.from_str("#a6afe7")
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        await self.set_pool_size(ctx.guild.id, size)
+        config['pool_size'] = size
+        self.schedule_pool_refill(ctx.guild, config)
+        
+        embed = discord.Embed(
+            description=f"<:approve:1429468807348486305> Channel pool size set to **{size}**",
+            color=discord.Color.from_str("#a6afe7")
+        )
+        await ctx.send(embed=embed)
+    
     @voicemaster.command(name="lock")
     async def lock(self, ctx):
         """Lock your temporary voice channel"""
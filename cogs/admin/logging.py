@@ -2,8 +2,44 @@ import discord
 from discord.ext import commands
 import aiosqlite
 import os
+import time
 from datetime import datetime, timedelta
 
+# event: (default threshold, default window in seconds)
+ANTINUKE_DEFAULTS = {
+    "join": (10, 10),
+    "ban": (5, 30),
+    "channel": (3, 30),
+    "role": (3, 30),
+}
+ANTINUKE_MAX_THRESHOLD = 100
+ANTINUKE_COOLDOWN = 60
+BULK_ACTION_TTL = 300  # Seconds a bulk-action marker waits for its audit event before it is dropped
+DANGEROUS_PERMISSIONS = (
+    "administrator", "ban_members", "kick_members", "manage_channels",
+    "manage_roles", "manage_guild", "manage_webhooks"
+)
+
+class RateWindow:
+    """Ring buffer of the last `threshold` event timestamps"""
+
+    __slots__ = ("times", "index", "window", "cooldown_until")
+
+    def __init__(self, threshold, window):
+        self.times = [0.0] * threshold
+        self.index = 0
+        self.window = window
+        self.cooldown_until = 0.0
+
+    def hit(self, now):
+        """Record an event; True when `threshold` events fell inside the window"""
+        self.times[self.index] = now
+        self.index = (self.index + 1) % len(self.times)
+        if now < self.cooldown_until or now - self.times[self.index] > self.window:
+            return False
+        self.cooldown_until = now + ANTINUKE_COOLDOWN
+        return True
+
 class Logging(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -11,6 +47,10 @@ class Logging(commands.Cog):
         self.bot.loop.create_task(self.setup_db())
         self.case_numbers = {}
         self.recent_actions = {}  # {guild_id: {"ban": {user_id: moderator_id}, "kick": {user_id: moderator_id}, ...}}
+        self.bulk_actions = {}  # {guild_id: {"ban": {user_id: expires_at}, ...}} - logged once as an aggregate instead
+        self.antinuke_configs = {}  # {guild_id: config dict}, kept in memory so the event path never touches disk
+        self.rate_windows = {}  # {guild_id: {"join": RateWindow, ...}}
+        self.lockdowns = {}  # {guild_id: {channel_id: previous @everyone send_messages}} locked by anti-raid, mirrored in antinuke_lockdowns
     
     async def setup_db(self):
         os.makedirs("data", exist_ok=True)
@@ -34,8 +74,42 @@ class Logging(commands.Cog):
                     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS antinuke_config (
+                    guild_id INTEGER PRIMARY KEY,
+                    enabled INTEGER DEFAULT 1,
+                    join_threshold INTEGER DEFAULT 10,
+                    join_window INTEGER DEFAULT 10,
+                    ban_threshold INTEGER DEFAULT 5,
+                    ban_window INTEGER DEFAULT 30,
+                    channel_threshold INTEGER DEFAULT 3,
+                    channel_window INTEGER DEFAULT 30,
+                    role_threshold INTEGER DEFAULT 3,
+                    role_window INTEGER DEFAULT 30,
+                    raid_actions TEXT DEFAULT 'lockdown,autoroles',
+                    nuke_action TEXT DEFAULT 'strip'
+                )
+            """)
+            # send_messages is the overwrite to restore on lift: NULL (inherit), 1 (allow) or 0 (deny)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS antinuke_lockdowns (
+                    guild_id INTEGER NOT NULL,
+                    channel_id INTEGER NOT NULL,
+                    send_messages INTEGER,
+                    PRIMARY KEY (guild_id, channel_id)
+                )
+            """)
             await db.commit()
 
+            db.row_factory = aiosqlite.Row
+            async with db.execute("SELECT * FROM antinuke_config") as cursor:
+                for row in await cursor.fetchall():
+                    self.antinuke_configs[row["guild_id"]] = dict(row)
+            async with db.execute("SELECT * FROM antinuke_lockdowns") as cursor:
+                for row in await cursor.fetchall():
+                    previous = None if row["send_messages"] is None else bool(row["send_messages"])
+                    self.lockdowns.setdefault(row["guild_id"], {})[row["channel_id"]] = previous
+
     def record_action(self, guild_id, action_type, user_id, moderator_id):
         """Store which moderator performed a specific action"""
         if guild_id not in self.recent_actions:
@@ -44,6 +118,29 @@ class Logging(commands.Cog):
             self.recent_actions[guild_id][action_type] = {}
         self.recent_actions[guild_id][action_type][user_id] = moderator_id
 
+    def record_bulk_action(self, guild_id, action_type, user_ids):
+        """Mark users whose individual log entries are covered by one aggregate entry"""
+        now = time.monotonic()
+        users = self.bulk_actions.setdefault(guild_id, {}).setdefault(action_type, {})
+        for user_id in [user_id for user_id, expires_at in users.items() if expires_at <= now]:
+            del users[user_id]
+        users.update(dict.fromkeys(user_ids, now + BULK_ACTION_TTL))
+
+    def release_bulk_action(self, guild_id, action_type, user_ids):
+        """Drop markers for users the bulk action never reached"""
+        users = self.bulk_actions.get(guild_id, {}).get(action_type)
+        if users:
+            for user_id in user_ids:
+                users.pop(user_id, None)
+
+    def is_bulk_action(self, guild_id, action_type, user_id):
+        """Check (and consume) whether an event belongs to a bulk action"""
+        users = self.bulk_actions.get(guild_id, {}).get(action_type)
+        if not users:
+            return False
+        expires_at = users.pop(user_id, None)
+        return expires_at is not None and expires_at > time.monotonic()
+
     async def get_log_channel(self, guild_id):
         async with aiosqlite.connect(self.db_path) as db:
             async with db.execute("SELECT log_channel_id FROM log_config WHERE guild_id = ?", (guild_id,)) as cursor:
@@ -124,6 +221,113 @@ class Logging(commands.Cog):
         except discord.Forbidden:
             pass
 
+    # ==================== ANTI-NUKE ====================
+
+    def antinuke_hit(self, guild, event):
+        """O(1) bookkeeping on the event path; only schedules work when a window trips"""
+        config = self.antinuke_configs.get(guild.id)
+        if not config or not config["enabled"]:
+            return False
+
+        windows = self.rate_windows.get(guild.id)
+        if windows is None:
+            windows = self.rate_windows[guild.id] = {
+                name: RateWindow(config[f"{name}_threshold"], config[f"{name}_window"])
+                for name in ANTINUKE_DEFAULTS
+            }
+        return windows[event].hit(time.monotonic())
+
+    async def save_antinuke_config(self, guild_id, config):
+        async with aiosqlite.connect(self.db_path) as db:
+            columns = [column for column in config if column != "guild_id"]
+            await db.execute(
+                f"INSERT INTO antinuke_config (guild_id, {', '.join(columns)}) VALUES (?, {', '.join('?' for _ in columns)}) "
+                f"ON CONFLICT(guild_id) DO UPDATE SET {', '.join(f'{column} = excluded.{column}' for column in columns)}",
+                (guild_id, *(config[column] for column in columns))
+            )
+            await db.commit()
+        self.antinuke_configs[guild_id] = config
+        self.rate_windows.pop(guild_id, None)
+
+    def default_antinuke_config(self, guild_id):
+        config = {"guild_id": guild_id, "enabled": 1, "raid_actions": "lockdown,autoroles", "nuke_action": "strip"}
+        for name, (threshold, window) in ANTINUKE_DEFAULTS.items():
+            config[f"{name}_threshold"] = threshold
+            config[f"{name}_window"] = window
+        return config
+
+    async def handle_raid(self, guild):
+        """Respond to a join flood"""
+        config = self.antinuke_configs[guild.id]
+        actions = config["raid_actions"].split(",")
+        taken = []
+
+        if "autoroles" in actions:
+            configuration_cog = self.bot.get_cog("Configuration")
+            if configuration_cog:
+                configuration_cog.autoroles_paused[guild.id] = time.time() + ANTINUKE_COOLDOWN * 10
+                taken.append("Autoroles paused for 10 minutes")
+
+        if "lockdown" in actions and guild.id not in self.lockdowns:
+            locked = self.lockdowns[guild.id] = {}
+            async with aiosqlite.connect(self.db_path) as db:
+                for channel in guild.text_channels:
+                    if not channel.permissions_for(guild.default_role).send_messages:
+                        continue
+                    overwrite = channel.overwrites_for(guild.default_role)
+                    previous = overwrite.send_messages
+                    overwrite.send_messages = False
+                    try:
+                        await channel.set_permissions(guild.default_role, overwrite=overwrite, reason="Anti-raid: join flood")
+                    except discord.HTTPException:
+                        continue
+                    locked[channel.id] = previous
+                    # Saved per channel so a restart mid-lockdown can still lift it
+                    await db.execute(
+                        "INSERT OR REPLACE INTO antinuke_lockdowns (guild_id, channel_id, send_messages) VALUES (?, ?, ?)",
+                        (guild.id, channel.id, previous)
+                    )
+                    await db.commit()
+            taken.append(f"Locked {len(locked)} channel(s)")
+
+        threshold, window = config["join_threshold"], config["join_window"]
+        await self.send_log(
+            guild, "Anti-Raid", None, None, None,
+            f"**Trigger**: {threshold} joins in {window}s\n**Response**: {', '.join(taken) or 'Logged only'}"
+        )
+
+    async def handle_nuke(self, guild, event, audit_action):
+        """Respond to a burst of destructive actions by finding and stripping the responsible admin"""
+        config = self.antinuke_configs[guild.id]
+        actor = None
+        try:
+            async for entry in guild.audit_logs(limit=1, action=audit_action):
+                actor = entry.user
+        except discord.HTTPException:
+            pass
+
+        taken = "Logged only"
+        member = guild.get_member(actor.id) if actor else None
+        trusted = member is None or member.id in (guild.owner_id, self.bot.user.id) or member.id in self.bot.owner_ids
+
+        if config["nuke_action"] == "strip" and not trusted:
+            keep = [
+                role for role in member.roles
+                if role.is_default() or role >= guild.me.top_role or role.managed
+                or not any(getattr(role.permissions, permission) for permission in DANGEROUS_PERMISSIONS)
+            ]
+            try:
+                await member.edit(roles=keep, reason=f"Anti-nuke: too many {event} actions")
+                taken = f"Stripped {len(member.roles) - len(keep)} role(s) from {member.mention}"
+            except discord.HTTPException:
+                taken = "Failed to strip roles"
+
+        threshold, window = config[f"{event}_threshold"], config[f"{event}_window"]
+        await self.send_log(
+            guild, "Anti-Nuke", actor, None, None,
+            f"**Trigger**: {threshold} {event} actions in {window}s\n**Response**: {taken}"
+        )
+
     # ==================== COMMANDS ====================
 
     @commands.command(name="setlogs")
@@ -154,10 +358,158 @@ class Logging(commands.Cog):
                 )
         await ctx.send(embed=embed)
 
+    @commands.group(name="antinuke", aliases=["antiraid", "an"], invoke_without_command=True)
+    @commands.has_permissions(administrator=True)
+    async def antinuke(self, ctx):
+        """Show anti-raid and anti-nuke settings"""
+        config = self.antinuke_configs.get(ctx.guild.id)
+        if not config:
+            embed = discord.Embed(
+                description=f"<:deny:1429468818094424075> Anti-nuke is not set up. Use `{ctx.prefix}antinuke enable`",
+                color=discord.Color.from_str("#a6afe7")
+            )
+            return await ctx.send(embed=embed)
+
+        embed = discord.Embed(
+            title="Anti-Nuke Settings",
+            description=f"Status: {'🟢 Enabled' if config['enabled'] else '🔴 Disabled'}",
+            color=discord.Color.from_str("#a6afe7")
+        )
+        for name in ANTINUKE_DEFAULTS:
+            embed.add_field(
+                name=name.title(),
+                value=f"{config[f'{name}_threshold']} in {config[f'{name}_window']}s",
+                inline=True
+            )
+        embed.add_field(name="Raid response", value=config["raid_actions"] or "log", inline=False)
+        embed.add_field(name="Nuke response", value=config["nuke_action"], inline=False)
+        await ctx.send(embed=embed)
+
+    @antinuke.command(name="enable", aliases=["on"])
+    @commands.has_permissions(administrator=True)
+    async def antinuke_enable(self, ctx):
+        config = dict(self.antinuke_configs.get(ctx.guild.id) or self.default_antinuke_config(ctx.guild.id))
+        config["enabled"] = 1
+        await self.save_antinuke_config(ctx.guild.id, config)
+        embed = discord.Embed(
+            description="<:approve:1429468807348486305> Anti-nuke is now **enabled**",
+            color=discord.Color.from_str("#a6afe7")
+        )
+        await ctx.send(embed=embed)
+
+    @antinuke.command(name="disable", aliases=["off"])
+    @commands.has_permissions(administrator=True)
+    async def antinuke_disable(self, ctx):
+        config = dict(self.antinuke_configs.get(ctx.guild.id) or self.default_antinuke_config(ctx.guild.id))
+        config["enabled"] = 0
+        await self.save_antinuke_config(ctx.guild.id, config)
+        embed = discord.Embed(
+            description="<:approve:1429468807348486305> Anti-nuke is now **disabled**",
+            color=discord.Color.from_str("#a6afe7")
+        )
+        await ctx.send(embed=embed)
+
+    @antinuke.command(name="threshold", aliases=["set"])
+    @commands.has_permissions(administrator=True)
+    async def antinuke_threshold(self, ctx, event: str, count: int, seconds: int):
+        """Set how many join/ban/channel/role events within a window trigger a response"""
+        event = event.lower()
+        if event not in ANTINUKE_DEFAULTS:
+            return await ctx.send(f"<:deny:1429468818094424075> Event must be one of: {', '.join(ANTINUKE_DEFAULTS)}")
+        if not 2 <= count <= ANTINUKE_MAX_THRESHOLD or not 1 <= seconds <= 3600:
+            return await ctx.send(f"<:deny:1429468818094424075> Count must be 2-{ANTINUKE_MAX_THRESHOLD} and seconds 1-3600!")
+
+        config = dict(self.antinuke_configs.get(ctx.guild.id) or self.default_antinuke_config(ctx.guild.id))
+        config[f"{event}_threshold"] = count
+        config[f"{event}_window"] = seconds
+        await self.save_antinuke_config(ctx.guild.id, config)
+        embed = discord.Embed(
+            description=f"<:approve:1429468807348486305> **{event}** triggers at **{count}** events in **{seconds}s**",
+            color=discord.Color.from_str("#a6afe7")
+        )
+        await ctx.send(embed=embed)
+
+    @antinuke.command(name="raid")
+    @commands.has_permissions(administrator=True)
+    async def antinuke_raid(self, ctx, *actions: str):
+        """Choose join flood responses: lockdown, autoroles, or log"""
+        actions = [action.lower() for action in actions if action.lower() in ("lockdown", "autoroles")]
+        config = dict(self.antinuke_configs.get(ctx.guild.id) or self.default_antinuke_config(ctx.guild.id))
+        config["raid_actions"] = ",".join(actions)
+        await self.save_antinuke_config(ctx.guild.id, config)
+        embed = discord.Embed(
+            description=f"<:approve:1429468807348486305> Raid response: **{', '.join(actions) or 'log only'}**",
+            color=discord.Color.from_str("#a6afe7")
+        )
+        await ctx.send(embed=embed)
+
+    @antinuke.command(name="nuke")
+    @commands.has_permissions(administrator=True)
+    async def antinuke_nuke(self, ctx, action: str):
+        """Choose the response to mass bans/deletions: strip or log"""
+        action = action.lower()
+        if action not in ("strip", "log"):
+            return await ctx.send("<:deny:1429468818094424075> Action must be `strip` or `log`!")
+        config = dict(self.antinuke_configs.get(ctx.guild.id) or self.default_antinuke_config(ctx.guild.id))
+        config["nuke_action"] = action
+        await self.save_antinuke_config(ctx.guild.id, config)
+        embed = discord.Embed(
+            description=f"<:approve:1429468807348486305> Nuke response: **{action}**",
+            color=discord.Color.from_str("#a6afe7")
+        )
+        await ctx.send(embed=embed)
+
+    @antinuke.command(name="lift", aliases=["unlock"])
+    @commands.has_permissions(administrator=True)
+    async def antinuke_lift(self, ctx):
+        """Undo an anti-raid lockdown and resume autoroles"""
+        locked = self.lockdowns.pop(ctx.guild.id, {})
+        for channel_id, previous in locked.items():
+            channel = ctx.guild.get_channel(channel_id)
+            if channel:
+                overwrite = channel.overwrites_for(ctx.guild.default_role)
+                overwrite.send_messages = previous
+                try:
+                    await channel.set_permissions(
+                        ctx.guild.default_role,
+                        overwrite=None if overwrite.is_empty() else overwrite,
+                        reason=f"Lockdown lifted by {ctx.author}"
+                    )
+                except discord.HTTPException:
+                    pass
+
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute("DELETE FROM antinuke_lockdowns WHERE guild_id = ?", (ctx.guild.id,))
+            await db.commit()
+
+        configuration_cog = self.bot.get_cog("Configuration")
+        if configuration_cog:
+            configuration_cog.autoroles_paused.pop(ctx.guild.id, None)
+
+        embed = discord.Embed(
+            description=f"<:approve:1429468807348486305> Lockdown lifted ({len(locked)} channel(s) unlocked)",
+            color=discord.Color.from_str("#a6afe7")
+        )
+        await ctx.send(embed=embed)
+
     # ==================== EVENT LISTENERS ====================
 
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        if self.antinuke_hit(member.guild, "join"):
+            self.bot.loop.create_task(self.handle_raid(member.guild))
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        if self.antinuke_hit(channel.guild, "channel"):
+            self.bot.loop.create_task(self.handle_nuke(channel.guild, "channel", discord.AuditLogAction.channel_delete))
+
     @commands.Cog.listener()
     async def on_member_ban(self, guild, user):
+        if self.antinuke_hit(guild, "ban"):
+            self.bot.loop.create_task(self.handle_nuke(guild, "ban", discord.AuditLogAction.ban))
+        if self.is_bulk_action(guild.id, "ban", user.id):
+            return
         await discord.utils.sleep_until(discord.utils.utcnow() + timedelta(seconds=1))
         try:
             ban_entry = await guild.fetch_ban(user)
@@ -206,6 +558,8 @@ class Logging(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_remove(self, member):
+        if self.is_bulk_action(member.guild.id, "kick", member.id):
+            return
         await discord.utils.sleep_until(discord.utils.utcnow() + timedelta(seconds=1))
         try:
             moderator = None
@@ -287,6 +641,8 @@ class Logging(commands.Cog):
 
     @commands.Cog.listener()
     async def on_guild_role_delete(self, role):
+        if self.antinuke_hit(role.guild, "role"):
+            self.bot.loop.create_task(self.handle_nuke(role.guild, "role", discord.AuditLogAction.role_delete))
         await discord.utils.sleep_until(discord.utils.utcnow() + timedelta(seconds=1))
         try:
             moderator = None
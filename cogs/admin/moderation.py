@@ -2,11 +2,25 @@ import discord
 from discord.ext import commands
 from datetime import timedelta
 import asyncio
-from typing import Union
+from typing import Optional, Union
 import sqlite3
 import os
 import json
 import re
+import shlex
+import time
+from collections import deque
+
+PURGE_MAX_AMOUNT = 10000
+PURGE_MAX_SCAN = 50000
+PURGE_PROGRESS_INTERVAL = 2.0
+PURGE_SINGLE_DELETE_DELAY = 1.0
+PURGE_MAX_REGEX_LENGTH = 100  # Patterns run on the event loop for every scanned message
+MASS_BAN_CHUNK = 200
+MASS_KICK_CONCURRENCY = 5
+MASS_ACTION_MAX = 5000
+ROLE_JOB_WORKERS = 4
+ROLE_JOB_CHECKPOINT = 25
 
 class HelpView(discord.ui.View):
     """View for navigating through command help pages"""
@@ -83,8 +97,43 @@ class Moderation(commands.Cog):
                 strict INTEGER
             )
         """)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS role_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER NOT NULL,
+                channel_id INTEGER,
+                role_id INTEGER NOT NULL,
+                action TEXT NOT NULL,
+                target TEXT NOT NULL,
+                moderator_id INTEGER,
+                status TEXT DEFAULT 'running',
+                total INTEGER DEFAULT 0,
+                processed INTEGER DEFAULT 0,
+                failed INTEGER DEFAULT 0,
+                last_member_id INTEGER DEFAULT 0,
+                created_at INTEGER
+            )
+        """)
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_role_jobs_guild_status ON role_jobs (guild_id, status)")
         self.db.commit()
         
+        self.role_jobs = {}  # {job_id: job state}, only running jobs
+        self.role_job_queue = deque()  # round-robin of running job ids, at most one per guild
+        self.role_job_ready = asyncio.Event()
+        self.role_workers = []
+    
+    async def cog_load(self):
+        """Start role job workers and pick up jobs interrupted by a restart"""
+        self.role_workers = [self.bot.loop.create_task(self.role_job_worker()) for _ in range(ROLE_JOB_WORKERS)]
+        self.bot.loop.create_task(self.resume_role_jobs())
+    
+    async def cog_unload(self):
+        """Stop workers and checkpoint running jobs"""
+        for worker in self.role_workers:
+            worker.cancel()
+        for job in self.role_jobs.values():
+            self.save_role_job(job)
+        
     def get_command_permissions(self, command):
         """Extract permissions from command checks"""
         permissions = []
@@ -231,6 +280,226 @@ class Moderation(commands.Cog):
         except Exception as e:
             await ctx.send(f"<:deny:1429468818094424075> Failed to ban user: {e}")
     
+    async def collect_mass_targets(self, ctx, arguments):
+        """Resolve user IDs, mentions, attachments and a joined:<minutes> selector into targets
+        
+        Returns the target IDs and whatever text is left over as the reason.
+        """
+        target_ids = []
+        reason_words = []
+        
+        for token in (arguments or "").split():
+            key, _, value = token.partition(":")
+            match = re.fullmatch(r"<@!?(\d{15,20})>|(\d{15,20}),?", token)
+            
+            if match and not reason_words:
+                target_ids.append(int(match.group(1) or match.group(2)))
+            elif key.lower() == "joined" and value.rstrip("m").isdigit() and not reason_words:
+                cutoff = discord.utils.utcnow() - timedelta(minutes=int(value.rstrip("m")))
+                target_ids.extend(
+                    member.id for member in ctx.guild.members
+                    if member.joined_at and member.joined_at >= cutoff
+                )
+            else:
+                reason_words.append(token)
+        
+        for attachment in ctx.message.attachments:
+            if attachment.size > 1024 * 1024:
+                continue
+            try:
+                content = (await attachment.read()).decode("utf-8", errors="ignore")
+            except discord.HTTPException:
+                continue
+            target_ids.extend(int(found) for found in re.findall(r"\d{15,20}", content))
+        
+        reason = " ".join(reason_words) or "No reason provided"
+        return list(dict.fromkeys(target_ids)), reason
+    
+    def filter_mass_targets(self, ctx, target_ids):
+        """Drop targets the invoker isn't allowed to act on"""
+        allowed = []
+        skipped = 0
+        
+        for user_id in target_ids:
+            member = ctx.guild.get_member(user_id)
+            if user_id in (ctx.author.id, ctx.guild.owner_id, self.bot.user.id):
+                skipped += 1
+            elif member and member.top_role >= ctx.author.top_role and ctx.author != ctx.guild.owner:
+                skipped += 1
+            elif member and member.top_role >= ctx.guild.me.top_role:
+                skipped += 1
+            else:
+                allowed.append(user_id)
+        
+        return allowed, skipped
+    
+    async def update_mass_status(self, status, action, done, total, failed):
+        """Edit the progress message for a mass action"""
+        embed = discord.Embed(
+            description=f"⏳ {action}: **{done}/{total}** processed, **{failed}** failed",
+            color=discord.Color.from_str("#a6afe7")
+        )
+        try:
+            await status.edit(embed=embed)
+        except discord.HTTPException:
+            pass
+    
+    async def send_mass_modlog(self, ctx, action_type, succeeded, failed, reason):
+        """Send one aggregated modlog entry for a mass action"""
+        logging_cog = self.bot.get_cog("Logging")
+        if not logging_cog or not succeeded:
+            return
+        
+        preview = ", ".join(str(user_id) for user_id in succeeded[:20])
+        if len(succeeded) > 20:
+            preview += f" (+{len(succeeded) - 20} more)"
+        
+        await logging_cog.send_log(
+            ctx.guild,
+            action_type,
+            ctx.author,
+            None,
+            reason,
+            f"**Affected**: {len(succeeded)}\n**Failed**: {len(failed)}\n**Users**: {preview}"
+        )
+    
+    @commands.command(name="massban", aliases=["mb"])
+    @commands.has_permissions(ban_members=True)
+    @commands.bot_has_permissions(ban_members=True, manage_guild=True)
+    async def massban(self, ctx, *, arguments: str = None):
+        """Ban many users at once. Accepts IDs, mentions, .txt attachments or joined:<minutes>, followed by a reason"""
+        
+        target_ids, reason = await self.collect_mass_targets(ctx, arguments)
+        
+        if not target_ids:
+            embed = self.create_command_help_embed(ctx.command, ctx)
+            return await ctx.send(embed=embed)
+        
+        target_ids, skipped = self.filter_mass_targets(ctx, target_ids)
+        
+        if len(target_ids) > MASS_ACTION_MAX:
+            return await ctx.send(f"<:deny:1429468818094424075> You can only target up to {MASS_ACTION_MAX} users at once!")
+        
+        if not target_ids:
+            return await ctx.send("<:deny:1429468818094424075> None of those users can be banned by you!")
+        
+        logging_cog = self.bot.get_cog("Logging")
+        if logging_cog:
+            logging_cog.record_bulk_action(ctx.guild.id, "ban", target_ids)
+            logging_cog.record_bulk_action(
+                ctx.guild.id, "kick", [user_id for user_id in target_ids if ctx.guild.get_member(user_id)]
+            )
+        
+        status = await ctx.send(embed=discord.Embed(
+            description=f"⏳ Banning **{len(target_ids)}** users...",
+            color=discord.Color.from_str("#a6afe7")
+        ))
+        
+        banned = []
+        failed = []
+        forbidden = False
+        try:
+            for index in range(0, len(target_ids), MASS_BAN_CHUNK):
+                chunk = [discord.Object(id=user_id) for user_id in target_ids[index:index + MASS_BAN_CHUNK]]
+                try:
+                    result = await ctx.guild.bulk_ban(chunk, reason=f"{reason} | Mass banned by {ctx.author}")
+                    banned.extend(user.id for user in result.banned)
+                    failed.extend(user.id for user in result.failed)
+                except discord.Forbidden:
+                    forbidden = True
+                    break
+                except discord.HTTPException:
+                    failed.extend(user.id for user in chunk)
+                await self.update_mass_status(status, "Banning", len(banned) + len(failed), len(target_ids), len(failed))
+        finally:
+            if logging_cog:
+                banned_ids = set(banned)
+                missed = [user_id for user_id in target_ids if user_id not in banned_ids]
+                logging_cog.release_bulk_action(ctx.guild.id, "ban", missed)
+                logging_cog.release_bulk_action(ctx.guild.id, "kick", missed)
+        
+        if forbidden:
+            failed.extend(target_ids[len(banned) + len(failed):])
+        
+        await self.send_mass_modlog(ctx, "Mass Ban", banned, failed, reason)
+        
+        response = f"<:approve:1429468807348486305> Banned **{len(banned)}** users."
+        if forbidden:
+            response += "\nStopped early: I need both **Ban Members** and **Manage Server** to bulk ban."
+        elif failed:
+            response += f"\n**{len(failed)}** failed (already banned or not bannable)."
+        if skipped:
+            response += f"\n**{skipped}** skipped due to role hierarchy."
+        await status.edit(embed=discord.Embed(description=response, color=discord.Color.from_str("#a6afe7")))
+    
+    @commands.command(name="masskick", aliases=["mk"])
+    @commands.has_permissions(kick_members=True)
+    @commands.bot_has_permissions(kick_members=True)
+    async def masskick(self, ctx, *, arguments: str = None):
+        """Kick many members at once. Accepts IDs, mentions, .txt attachments or joined:<minutes>, followed by a reason"""
+        
+        target_ids, reason = await self.collect_mass_targets(ctx, arguments)
+        
+        if not target_ids:
+            embed = self.create_command_help_embed(ctx.command, ctx)
+            return await ctx.send(embed=embed)
+        
+        target_ids, skipped = self.filter_mass_targets(ctx, target_ids)
+        members = [member for member in map(ctx.guild.get_member, target_ids) if member]
+        
+        if len(members) > MASS_ACTION_MAX:
+            return await ctx.send(f"<:deny:1429468818094424075> You can only target up to {MASS_ACTION_MAX} members at once!")
+        
+        if not members:
+            return await ctx.send("<:deny:1429468818094424075> None of those users are members you can kick!")
+        
+        logging_cog = self.bot.get_cog("Logging")
+        if logging_cog:
+            logging_cog.record_bulk_action(ctx.guild.id, "kick", [member.id for member in members])
+        
+        status = await ctx.send(embed=discord.Embed(
+            description=f"⏳ Kicking **{len(members)}** members...",
+            color=discord.Color.from_str("#a6afe7")
+        ))
+        
+        kicked = []
+        failed = []
+        semaphore = asyncio.Semaphore(MASS_KICK_CONCURRENCY)
+        last_update = time.monotonic()
+        
+        async def kick_one(member):
+            nonlocal last_update
+            async with semaphore:
+                try:
+                    await member.kick(reason=f"{reason} | Mass kicked by {ctx.author}")
+                    kicked.append(member.id)
+                except discord.HTTPException:
+                    failed.append(member.id)
+                    if logging_cog:
+                        logging_cog.release_bulk_action(ctx.guild.id, "kick", [member.id])
+            
+            if time.monotonic() - last_update >= PURGE_PROGRESS_INTERVAL:
+                last_update = time.monotonic()
+                await self.update_mass_status(status, "Kicking", len(kicked) + len(failed), len(members), len(failed))
+        
+        try:
+            await asyncio.gather(*(kick_one(member) for member in members))
+        finally:
+            if logging_cog:
+                kicked_ids = set(kicked)
+                logging_cog.release_bulk_action(
+                    ctx.guild.id, "kick", [member.id for member in members if member.id not in kicked_ids]
+                )
+        
+        await self.send_mass_modlog(ctx, "Mass Kick", kicked, failed, reason)
+        
+        response = f"<:approve:1429468807348486305> Kicked **{len(kicked)}** members."
+        if failed:
+            response += f"\n**{len(failed)}** failed."
+        if skipped:
+            response += f"\n**{skipped}** skipped due to role hierarchy."
+        await status.edit(embed=discord.Embed(description=response, color=discord.Color.from_str("#a6afe7")))
+    
     @commands.command(name="unban", aliases=["ub"])
     @commands.has_permissions(ban_members=True)
     @commands.bot_has_permissions(ban_members=True)
@@ -410,11 +679,137 @@ class Moderation(commands.Cog):
         except Exception as e:
             await ctx.send(f"<:deny:1429468818094424075> Failed to unlock channel: {e}")
     
+    def parse_purge_filters(self, raw):
+        """Parse purge filter flags into a predicate plus before/after bounds"""
+        checks = []
+        before = None
+        after = None
+        
+        try:
+            tokens = shlex.split(raw) if raw else []
+        except ValueError:
+            raise commands.BadArgument("Unbalanced quotes in filters")
+        
+        for token in tokens:
+            key, _, value = token.partition(":")
+            key = key.lower().lstrip("-")
+            
+            if key in ("bots", "bot"):
+                checks.append(lambda m: m.author.bot)
+            elif key in ("humans", "human"):
+                checks.append(lambda m: not m.author.bot)
+            elif key in ("attachments", "files", "images"):
+                checks.append(lambda m: bool(m.attachments))
+            elif key == "embeds":
+                checks.append(lambda m: bool(m.embeds))
+            elif key == "links":
+                checks.append(lambda m: "http://" in m.content or "https://" in m.content)
+            elif key == "user" and value:
+                user_id = int(value.strip("<@!>")) if value.strip("<@!>").isdigit() else None
+                if user_id is None:
+                    raise commands.BadArgument(f"Invalid user: {value}")
+                checks.append(lambda m, user_id=user_id: m.author.id == user_id)
+            elif key == "contains" and value:
+                needle = value.lower()
+                checks.append(lambda m, needle=needle: needle in m.content.lower())
+            elif key == "regex" and value:
+                if len(value) > PURGE_MAX_REGEX_LENGTH:
+                    raise commands.BadArgument(f"Regex is too long (max {PURGE_MAX_REGEX_LENGTH} characters)")
+                try:
+                    pattern = re.compile(value, re.IGNORECASE)
+                except re.error:
+                    raise commands.BadArgument(f"Invalid regex: {value}")
+                checks.append(lambda m, pattern=pattern: pattern.search(m.content) is not None)
+            elif key in ("before", "after") and value.isdigit():
+                if key == "before":
+                    before = discord.Object(id=int(value))
+                else:
+                    after = discord.Object(id=int(value))
+            else:
+                raise commands.BadArgument(f"Unknown filter: {token}")
+        
+        def check(message):
+            return all(predicate(message) for predicate in checks)
+        
+        return check, before, after
+    
+    async def run_purge(self, ctx, limit=None, check=None, before=None, after=None, scan_limit=PURGE_MAX_SCAN, status=None):
+        """Scan history lazily and delete matching messages in bulk batches
+        
+        Messages newer than 14 days are deleted 100 at a time; older ones can't be
+        bulk deleted, so they go through a slower one-by-one lane.
+        """
+        channel = ctx.channel
+        bulk_cutoff = discord.utils.utcnow() - timedelta(days=14, minutes=-1)
+        batch = []
+        old_messages = []
+        scanned = 0
+        deleted = 0
+        last_update = time.monotonic()
+        
+        async def flush():
+            nonlocal deleted
+            if not batch:
+                return
+            try:
+                await channel.delete_messages(batch)
+                deleted += len(batch)
+            except discord.NotFound:
+                pass
+            batch.clear()
+        
+        async def report(final=False):
+            nonlocal last_update
+            if status is None:
+                return
+            if not final and time.monotonic() - last_update < PURGE_PROGRESS_INTERVAL:
+                return
+            last_update = time.monotonic()
+            embed = discord.Embed(
+                description=f"🧹 Scanned **{scanned}** messages, deleted **{deleted}**"
+                + (f" ({len(old_messages)} older than 14 days queued)" if old_messages else ""),
+                color=discord.Color.from_str("#a6afe7")
+            )
+            try:
+                await status.edit(embed=embed)
+            except discord.HTTPException:
+                pass
+        
+        async for message in channel.history(limit=scan_limit, before=before or ctx.message, after=after, oldest_first=False):
+            scanned += 1
+            # Throttled, so reporting per scanned message still shows progress on sparse matches
+            await report()
+            if check and not check(message):
+                continue
+            
+            if message.created_at < bulk_cutoff:
+                old_messages.append(message)
+            else:
+                batch.append(message)
+                if len(batch) >= 100:
+                    await flush()
+            
+            if limit and deleted + len(batch) + len(old_messages) >= limit:
+                break
+        
+        await flush()
+        
+        for message in old_messages:
+            try:
+                await message.delete()
+                deleted += 1
+            except discord.NotFound:
+                pass
+            await report()
+            await asyncio.sleep(PURGE_SINGLE_DELETE_DELAY)
+        
+        return deleted
+    
     @commands.command(name="purge", aliases=["clear", "clean", "c"])
     @commands.has_permissions(manage_messages=True)
     @commands.bot_has_permissions(manage_messages=True)
-    async def purge(self, ctx, member: discord.Member = None, amount: int = None):
-        """Delete multiple messages."""
+    async def purge(self, ctx, member: Optional[discord.Member] = None, amount: int = None, *, filters: str = None):
+        """Delete multiple messages. Filters: bots, humans, attachments, embeds, links, user:<id>, contains:<text>, regex:<pattern>, before:<id>, after:<id>"""
         
         if amount is None:
             embed = self.create_command_help_embed(ctx, ctx.command)
@@ -423,21 +818,42 @@ class Moderation(commands.Cog):
         if amount < 1:
             return await ctx.send("<:deny:1429468818094424075> Amount must be at least 1!")
         
-        if amount > 100:
-            return await ctx.send("<:deny:1429468818094424075> Amount cannot exceed 100!")
+        if amount > PURGE_MAX_AMOUNT:
+            return await ctx.send(f"<:deny:1429468818094424075> Amount cannot exceed {PURGE_MAX_AMOUNT}!")
+        
+        try:
+            check, before, after = self.parse_purge_filters(filters)
+        except commands.BadArgument as e:
+            return await ctx.send(f"<:deny:1429468818094424075> {e}")
+        if member:
+            member_check = check
+            check = lambda m: m.author.id == member.id and member_check(m)
+        
+        try:
+            await ctx.message.delete()
+        except discord.HTTPException:
+            pass
         
         try:
-            # If a member is mentioned, only delete their messages
+            status = None
+            if amount > 100:
+                status = await ctx.send(embed=discord.Embed(
+                    description="🧹 Scanning messages...",
+                    color=discord.Color.from_str("#a6afe7")
+                ))
+            
+            deleted = await self.run_purge(ctx, limit=amount, check=check, before=before, after=after, status=status)
+            
             if member:
-                def check(m):
-                    return m.author.id == member.id
-                
-                deleted = await ctx.channel.purge(limit=amount + 1, check=check)
-                msg = await ctx.send(f"<:approve:1429468807348486305> Deleted {len(deleted) - 1} messages from {member.mention}.")
+                text = f"<:approve:1429468807348486305> Deleted {deleted} messages from {member.mention}."
             else:
-                # Delete all messages
-                deleted = await ctx.channel.purge(limit=amount + 1)
-                msg = await ctx.send(f"<:approve:1429468807348486305> Deleted {len(deleted) - 1} messages.")
+                text = f"<:approve:1429468807348486305> Deleted {deleted} messages."
+            
+            if status:
+                await status.edit(content=text, embed=None)
+                msg = status
+            else:
+                msg = await ctx.send(text)
             
             await asyncio.sleep(3)
             await msg.delete()
@@ -457,9 +873,9 @@ class Moderation(commands.Cog):
             )
             return await ctx.send(embed=embed)
         
-        if amount > 100:
+        if amount > PURGE_MAX_AMOUNT:
             embed = discord.Embed(
-                description="<:deny:1429468818094424075> Amount cannot exceed 100!",
+                description=f"<:deny:1429468818094424075> Amount cannot exceed {PURGE_MAX_AMOUNT}!",
                 color=discord.Color.from_str("#a6afe7")
             )
             return await ctx.send(embed=embed)
@@ -474,12 +890,31 @@ class Moderation(commands.Cog):
                     return True
                 return False
             
-            deleted = await ctx.channel.purge(limit=amount, check=is_bot_or_command)
+            status = None
+            if amount > 100:
+                status = await ctx.send(embed=discord.Embed(
+                    description="🧹 Scanning messages...",
+                    color=discord.Color.from_str("#a6afe7")
+                ))
+            
+            # The amount is how far back to look, not how many to delete
+            deleted = await self.run_purge(ctx, check=is_bot_or_command, scan_limit=amount, status=status)
+            if is_bot_or_command(ctx.message):
+                try:
+                    await ctx.message.delete()
+                    deleted += 1
+                except discord.HTTPException:
+                    pass
+            
             embed = discord.Embed(
-                description=f"<:approve:1429468807348486305> Deleted **{len(deleted)}** bot messages and commands",
+                description=f"<:approve:1429468807348486305> Deleted **{deleted}** bot messages and commands",
                 color=discord.Color.from_str("#a6afe7")
             )
-            msg = await ctx.send(embed=embed)
+            if status:
+                await status.edit(embed=embed)
+                msg = status
+            else:
+                msg = await ctx.send(embed=embed)
             await msg.delete(delay=3)
         except discord.Forbidden:
             embed = discord.Embed(
@@ -796,6 +1231,214 @@ class Moderation(commands.Cog):
             )
             await ctx.send(embed=embed)
 
+    # ==================== ROLE JOBS ====================
+    
+    def role_job_members(self, guild, role, action, target, after_id=0):
+        """Sorted IDs of members that still need the change, starting after a checkpoint
+        
+        Membership is checked with get_role, since Member.roles builds and sorts a new
+        list on every access.
+        """
+        if action == "remove":
+            candidates = role.members
+        else:
+            candidates = [member for member in guild.members if member.get_role(role.id) is None]
+        member_ids = [
+            member.id for member in candidates
+            if member.id > after_id
+            and (target == "everyone" or member.bot == (target == "bots"))
+        ]
+        member_ids.sort()
+        return member_ids
+    
+    def save_role_job(self, job):
+        """Checkpoint a job's progress"""
+        self.cursor.execute(
+            "UPDATE role_jobs SET status = ?, total = ?, processed = ?, failed = ?, last_member_id = ? WHERE id = ?",
+            (job["status"], job["total"], job["processed"], job["failed"], job["last_member_id"], job["id"])
+        )
+        self.db.commit()
+    
+    def start_role_job(self, row, guild):
+        """Queue a job row for the workers; returns the job state or None if the role is gone"""
+        job_id, guild_id, channel_id, role_id, action, target, moderator_id, status, total, processed, failed, last_member_id, created_at = row
+        role = guild.get_role(role_id)
+        if role is None:
+            self.cursor.execute("UPDATE role_jobs SET status = 'cancelled' WHERE id = ?", (job_id,))
+            self.db.commit()
+            return None
+        
+        pending = deque(self.role_job_members(guild, role, action, target, last_member_id))
+        job = {
+            "id": job_id,
+            "guild": guild,
+            "channel_id": channel_id,
+            "role": role,
+            "action": action,
+            "target": target,
+            "moderator_id": moderator_id,
+            "status": "running",
+            "total": processed + failed + len(pending),
+            "processed": processed,
+            "failed": failed,
+            "last_member_id": last_member_id,
+            "pending": pending,
+            "started_at": time.monotonic(),
+            "started_done": processed + failed
+        }
+        self.role_jobs[job_id] = job
+        self.role_job_queue.append(job_id)
+        self.role_job_ready.set()
+        self.save_role_job(job)
+        return job
+    
+    def get_guild_role_job(self, guild_id, statuses):
+        """Latest job for a guild in one of the given statuses"""
+        placeholders = ", ".join("?" for _ in statuses)
+        self.cursor.execute(
+            f"SELECT * FROM role_jobs WHERE guild_id = ? AND status IN ({placeholders}) ORDER BY id DESC LIMIT 1",
+            (guild_id, *statuses)
+        )
+        return self.cursor.fetchone()
+    
+    async def resume_role_jobs(self):
+        """Requeue jobs that were running when the bot stopped"""
+        await self.bot.wait_until_ready()
+        self.cursor.execute("SELECT * FROM role_jobs WHERE status = 'running'")
+        for row in self.cursor.fetchall():
+            if row[0] in self.role_jobs:
+                continue
+            guild = self.bot.get_guild(row[1])
+            if guild:
+                self.start_role_job(row, guild)
+    
+    async def finish_role_job(self, job):
+        """Mark a job done and tell the channel it was started from"""
+        job["status"] = "done"
+        self.role_jobs.pop(job["id"], None)
+        self.save_role_job(job)
+        
+        channel = job["guild"].get_channel(job["channel_id"])
+        if channel:
+            verb = "Added" if job["action"] == "add" else "Removed"
+            embed = discord.Embed(
+                description=f"<:approve:1429468807348486305> {verb} {job['role'].mention} for **{job['processed']}** {job['target']} (job #{job['id']})"
+                + (f", **{job['failed']}** failed" if job["failed"] else ""),
+                color=discord.Color.from_str("#a6afe7")
+            )
+            try:
+                await channel.send(embed=embed)
+            except discord.HTTPException:
+                pass
+    
+    async def role_job_worker(self):
+        """Take turns across guilds, one in-flight request per job"""
+        while True:
+            if not self.role_job_queue:
+                self.role_job_ready.clear()
+                await self.role_job_ready.wait()
+                continue
+            
+            job = self.role_jobs.get(self.role_job_queue.popleft())
+            if job is None or job["status"] != "running":
+                continue
+            
+            if not job["pending"]:
+                await self.finish_role_job(job)
+                continue
+            
+            member_id = job["pending"].popleft()
+            member = job["guild"].get_member(member_id)
+            role = job["role"]
+            
+            try:
+                # Members can change while the job runs, so re-check before spending a request
+                if member and (member.get_role(role.id) is None) == (job["action"] == "add"):
+                    if job["action"] == "add":
+                        await member.add_roles(role, reason=f"Role all (job #{job['id']})")
+                    else:
+                        await member.remove_roles(role, reason=f"Role all (job #{job['id']})")
+                job["processed"] += 1
+            except discord.Forbidden:
+                job["failed"] += 1
+                job["status"] = "paused"
+                pause_reason = f"I lost permission to manage {role.mention}"
+            except discord.NotFound as e:
+                job["failed"] += 1
+                # Unknown Role: every remaining member would fail the same way
+                if e.code == 10011 or job["guild"].get_role(role.id) is None:
+                    job["status"] = "paused"
+                    pause_reason = f"the role `{role.name}` no longer exists"
+            except discord.HTTPException:
+                job["failed"] += 1
+            
+            # Cancelled (and maybe resumed as a new job) while the request was in flight;
+            # the cancel already saved it, so this stale iteration must not touch it again
+            if self.role_jobs.get(job["id"]) is not job:
+                continue
+            
+            job["last_member_id"] = member_id
+            done = job["processed"] + job["failed"]
+            
+            if job["status"] != "running":
+                self.role_jobs.pop(job["id"], None)
+                self.save_role_job(job)
+                channel = job["guild"].get_channel(job["channel_id"])
+                if job["status"] == "paused" and channel:
+                    try:
+                        await channel.send(f"<:deny:1429468818094424075> Job **#{job['id']}** paused: {pause_reason}. Fix it and use `role resume`.")
+                    except discord.HTTPException:
+                        pass
+                continue
+            
+            if done % ROLE_JOB_CHECKPOINT == 0:
+                self.save_role_job(job)
+            
+            self.role_job_queue.append(job["id"])
+    
+    def describe_role_job(self, job):
+        """Progress line with ETA for a running job"""
+        done = job["processed"] + job["failed"]
+        elapsed = time.monotonic() - job["started_at"]
+        rate = (done - job["started_done"]) / elapsed if elapsed > 0 else 0
+        remaining = len(job["pending"])
+        eta = f"<t:{int(time.time() + remaining / rate)}:R>" if rate > 0 else "calculating..."
+        percent = done / job["total"] * 100 if job["total"] else 100
+        return (
+            f"**Job #{job['id']}** • {job['action']} {job['role'].mention} for {job['target']}\n"
+            f"Progress: **{done}/{job['total']}** ({percent:.1f}%), **{job['failed']}** failed\n"
+            f"Rate: **{rate:.1f}**/s • ETA: {eta}"
+        )
+    
+    async def create_role_job(self, ctx, target, action, role):
+        """Validate and queue a role-all job"""
+        action = action.lower()
+        if action not in ("add", "remove"):
+            return await ctx.send("<:deny:1429468818094424075> Action must be `add` or `remove`!")
+        
+        if role.position >= ctx.guild.me.top_role.position or role.managed:
+            return await ctx.send("<:deny:1429468818094424075> I cannot manage this role!")
+        
+        if role.position >= ctx.author.top_role.position and ctx.author != ctx.guild.owner:
+            return await ctx.send("<:deny:1429468818094424075> You cannot manage this role as it's higher than or equal to your highest role!")
+        
+        if self.get_guild_role_job(ctx.guild.id, ("running",)):
+            return await ctx.send("<:deny:1429468818094424075> A role job is already running in this server! Use `role progress` or `role cancel`.")
+        
+        self.cursor.execute(
+            "INSERT INTO role_jobs (guild_id, channel_id, role_id, action, target, moderator_id, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (ctx.guild.id, ctx.channel.id, role.id, action, target, ctx.author.id, int(time.time()))
+        )
+        self.db.commit()
+        
+        job = self.start_role_job(self.get_guild_role_job(ctx.guild.id, ("running",)), ctx.guild)
+        
+        embed = discord.Embed(
+            description=f"⏳ Started job **#{job['id']}**: {action} {role.mention} for **{job['total']}** {target}",
+            color=discord.Color.from_str("#a6afe7")
+        )
+        await ctx.send(embed=embed)
+    
     @commands.group(name="role", aliases=["r"], invoke_without_command=True)
     @commands.has_permissions(manage_roles=True)
     @commands.bot_has_permissions(manage_roles=True)
@@ -848,6 +1491,85 @@ class Moderation(commands.Cog):
             )
             await ctx.send(embed=embed)
     
+    @role.command(name="humans")
+    @commands.has_permissions(manage_roles=True)
+    @commands.bot_has_permissions(manage_roles=True)
+    async def role_humans(self, ctx, action: str, *, role: discord.Role):
+        """Add or remove a role for every human member"""
+        await self.create_role_job(ctx, "humans", action, role)
+    
+    @role.command(name="bots")
+    @commands.has_permissions(manage_roles=True)
+    @commands.bot_has_permissions(manage_roles=True)
+    async def role_bots(self, ctx, action: str, *, role: discord.Role):
+        """Add or remove a role for every bot"""
+        await self.create_role_job(ctx, "bots", action, role)
+    
+    @role.command(name="everyone", aliases=["all"])
+    @commands.has_permissions(manage_roles=True)
+    @commands.bot_has_permissions(manage_roles=True)
+    async def role_everyone(self, ctx, action: str, *, role: discord.Role):
+        """Add or remove a role for every member"""
+        await self.create_role_job(ctx, "everyone", action, role)
+    
+    @role.command(name="progress", aliases=["status"])
+    @commands.has_permissions(manage_roles=True)
+    async def role_progress(self, ctx):
+        """Show progress of the running role job"""
+        job = next((job for job in self.role_jobs.values() if job["guild"].id == ctx.guild.id), None)
+        
+        if job is None:
+            return await ctx.send("<:deny:1429468818094424075> No role job is running in this server!")
+        
+        embed = discord.Embed(description=self.describe_role_job(job), color=discord.Color.from_str("#a6afe7"))
+        await ctx.send(embed=embed)
+    
+    @role.command(name="cancel", aliases=["stop"])
+    @commands.has_permissions(manage_roles=True)
+    async def role_cancel(self, ctx):
+        """Cancel the running role job (it can be resumed later)"""
+        job = next((job for job in self.role_jobs.values() if job["guild"].id == ctx.guild.id), None)
+        
+        if job is None:
+            row = self.get_guild_role_job(ctx.guild.id, ("running",))
+            if row is None:
+                return await ctx.send("<:deny:1429468818094424075> No role job is running in this server!")
+            self.cursor.execute("UPDATE role_jobs SET status = 'cancelled' WHERE id = ?", (row[0],))
+            self.db.commit()
+            return await ctx.send(f"<:approve:1429468807348486305> Cancelled job **#{row[0]}**")
+        
+        job["status"] = "cancelled"
+        self.role_jobs.pop(job["id"], None)
+        self.save_role_job(job)
+        
+        embed = discord.Embed(
+            description=f"<:approve:1429468807348486305> Cancelled job **#{job['id']}** after **{job['processed']}/{job['total']}** members",
+            color=discord.Color.from_str("#a6afe7")
+        )
+        await ctx.send(embed=embed)
+    
+    @role.command(name="resume")
+    @commands.has_permissions(manage_roles=True)
+    @commands.bot_has_permissions(manage_roles=True)
+    async def role_resume(self, ctx):
+        """Resume the last cancelled or paused role job"""
+        if self.get_guild_role_job(ctx.guild.id, ("running",)):
+            return await ctx.send("<:deny:1429468818094424075> A role job is already running in this server!")
+        
+        row = self.get_guild_role_job(ctx.guild.id, ("cancelled", "paused"))
+        if row is None:
+            return await ctx.send("<:deny:1429468818094424075> There is no role job to resume!")
+        
+        job = self.start_role_job(row, ctx.guild)
+        if job is None:
+            return await ctx.send("<:deny:1429468818094424075> The role for that job no longer exists!")
+        
+        embed = discord.Embed(
+            description=f"⏳ Resumed job **#{job['id']}** with **{len(job['pending'])}** members left",
+            color=discord.Color.from_str("#a6afe7")
+        )
+        await ctx.send(embed=embed)
+    
     @role.command(name="create", aliases=["add"])
     @commands.has_permissions(manage_roles=True)
     @commands.bot_has_permissions(manage_roles=True)
@@ -1356,6 +2078,8 @@ class Moderation(commands.Cog):
     @unlock.error
     @purge.error
     @botclear.error
+    @massban.error
+    @masskick.error
     @slowmode.error
     async def moderation_error(self, ctx, error):
         if isinstance(error, commands.MissingPermissions):
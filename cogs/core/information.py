@@ -353,6 +353,36 @@ class Information(commands.Cog):
         embed.set_footer(text=f"Total: {len(disabled_servers)} server(s)")
         await ctx.send(embed=embed)
 
+    @commands.command(name='httpstats', help='Shows outbound HTTP metrics per host (Bot Owner Only)')
+    @commands.is_owner()
+    async def http_stats(self, ctx):
+        """Show request counts and latency for every host the bot talks to"""
+        metrics = self.bot.http_pool.metrics()
+
+        if not metrics:
+            embed = discord.Embed(
+                description=f"{self.deny_emoji} No outbound requests have been made yet.",
+                color=self.color
+            )
+            await ctx.send(embed=embed)
+            return
+
+        description = ""
+        for host, stats in metrics[:15]:
+            description += (
+                f"**{host}** - {stats.requests:,} req, {stats.errors:,} err, "
+                f"avg `{stats.avg_latency * 1000:.0f}ms`, max `{stats.max_latency * 1000:.0f}ms`, "
+                f"last `{stats.last_status}`\n"
+            )
+
+        embed = discord.Embed(
+            title="🌐 HTTP Pool",
+            description=description,
+            color=self.color
+        )
+        embed.set_footer(text=f"{len(metrics)} host(s) • {sum(stats.in_flight for _, stats in metrics)} in flight")
+        await ctx.send(embed=embed)
+
     @commands.Cog.listener()
     async def on_guild_join(self, guild):
         """Check if bot joins a disabled server and leave immediately"""
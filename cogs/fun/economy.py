@@ -1,19 +1,267 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 import sqlite3
 import os
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
 import random
 import asyncio
+import time
 from config import COLOR
 
+ACCOUNT_CACHE_SIZE = 20000
+ACCOUNT_FLUSH_INTERVAL = 15
+LEADERBOARD_SIZE = 10
+LEADERBOARD_IN_LIMIT = 900  # Guilds up to this size are filtered with one IN query
+
+# Seconds each timed command stays locked after use
+COOLDOWNS = {
+    "daily": 86400,
+    "weekly": 604800,
+    "work": 60,
+    "rob": 3600,
+    "beg": 30,
+    "crime": 600,
+    "search": 45,
+    "fish": 20,
+    "hunt": 40,
+    "mine": 60,
+}
+COOLDOWN_SWEEP_INTERVAL = 600
+SNAPSHOT_INTERVAL = 3600
+LEDGER_PAGE_SIZE = 10
+MAX_ITEM_QUANTITY = 1000
+BANK_INTEREST_RATE = 0.002  # Per day, compounded
+LEADERBOARD_CANDIDATES = 5  # Rows fetched per leaderboard slot before reranking by accrued interest
+GAME_TIMEOUT = 60  # Seconds before a game session is abandoned and cleaned up
+MAX_CHANNEL_GAMES = 3
+MAX_GAMES = 200
+EDIT_BUDGET = 5  # Animation edits per channel per EDIT_WINDOW seconds, matching Discord's message rate limit
+EDIT_WINDOW = 5.0
+
+# Seeded into the items table; edit rows there to change the live catalog.
+# Effects: "cash:<min>:<max>" pays out on use, "cooldown:<name>" clears a timer,
+# "guard:<name>" is consumed automatically, no effect means a collectible.
+DEFAULT_ITEMS = [
+    ("padlock", "Padlock", "🔒", 2000, 1000, "Stops the next robbery against you", "guard:rob"),
+    ("energy_drink", "Energy Drink", "🥤", 300, 100, "Skip your work cooldown", "cooldown:work"),
+    ("fishing_bait", "Fishing Bait", "🪱", 150, 50, "Skip your fishing cooldown", "cooldown:fish"),
+    ("gift_box", "Gift Box", "🎁", 750, 300, "Open it for $100 - $1,500", "cash:100:1500"),
+    ("diamond_ring", "Diamond Ring", "💍", 25000, 15000, "A shiny collectible", None),
+    ("trophy", "Golden Trophy", "🏆", 100000, 50000, "Proof that you made it", None),
+]
+
+
+def economy_cooldown(name):
+    """Check that consumes an economy cooldown, raising CommandOnCooldown while it's pending"""
+    async def predicate(ctx):
+        retry_after = ctx.cog.use_cooldown(ctx.author.id, name)
+        if retry_after:
+            raise commands.CommandOnCooldown(commands.Cooldown(1, COOLDOWNS[name]), retry_after, commands.BucketType.user)
+        return True
+    return commands.check(predicate)
+
+
+def accrued_bank(bank, since, now):
+    """Closed-form compound interest on a bank balance left untouched from since to now"""
+    if bank <= 0 or now <= since:
+        return bank
+    return int(bank * (1 + BANK_INTEREST_RATE) ** ((now - since) / 86400))
+
+
+class Account:
+    """Cached users row; balance changes since the last flush are kept as deltas"""
+    __slots__ = ("balance", "bank", "balance_delta", "bank_delta", "bank_updated_at")
+
+    def __init__(self, balance, bank, bank_updated_at):
+        self.balance = balance
+        self.bank = bank
+        self.balance_delta = 0
+        self.bank_delta = 0
+        # Rows from before interest existed start accruing now rather than retroactively
+        self.bank_updated_at = bank_updated_at or int(time.time())
+
+    def add(self, amount, bank=False):
+        if bank:
+            self.bank += amount
+            self.bank_delta += amount
+        else:
+            self.balance += amount
+            self.balance_delta += amount
+
+
+class GameSession:
+    __slots__ = ("user_id", "channel_id", "game", "started_at")
+
+    def __init__(self, user_id, channel_id, game):
+        self.user_id = user_id
+        self.channel_id = channel_id
+        self.game = game
+        self.started_at = time.monotonic()
+
+
+class GameSessions:
+    """Tracks every running game: one per user, a few per channel, and a process-wide cap
+    
+    Also owns a per-channel edit budget so animations drop frames instead of queueing
+    behind Discord's rate limit.
+    """
+
+    def __init__(self):
+        self.by_user = {}  # {user_id: GameSession}
+        self.by_channel = {}  # {channel_id: {GameSession}}
+        self.edit_tokens = {}  # {channel_id: [tokens, last refill]}
+
+    def __len__(self):
+        return len(self.by_user)
+
+    def open(self, user_id, channel_id, game):
+        """Register a session and return (session, None), or (None, reason) if it isn't allowed"""
+        self.expire()
+        if user_id in self.by_user:
+            return None, f"Finish your current **{self.by_user[user_id].game}** game first!"
+        if len(self.by_channel.get(channel_id, ())) >= MAX_CHANNEL_GAMES:
+            return None, "Too many games are running in this channel, try again in a moment!"
+        if len(self.by_user) >= MAX_GAMES:
+            return None, "Too many games are running right now, try again in a moment!"
+
+        session = GameSession(user_id, channel_id, game)
+        self.by_user[user_id] = session
+        self.by_channel.setdefault(channel_id, set()).add(session)
+        return session, None
+
+    def close(self, session):
+        if self.by_user.get(session.user_id) is session:
+            del self.by_user[session.user_id]
+        channel = self.by_channel.get(session.channel_id)
+        if channel is not None:
+            channel.discard(session)
+            if not channel:
+                del self.by_channel[session.channel_id]
+                self.edit_tokens.pop(session.channel_id, None)
+
+    def expire(self):
+        """Drop sessions that outlived GAME_TIMEOUT without being closed"""
+        deadline = time.monotonic() - GAME_TIMEOUT * 2
+        for session in [session for session in self.by_user.values() if session.started_at < deadline]:
+            self.close(session)
+
+    def take_edit(self, channel_id):
+        now = time.monotonic()
+        bucket = self.edit_tokens.get(channel_id)
+        if bucket is None:
+            bucket = self.edit_tokens[channel_id] = [EDIT_BUDGET, now]
+        bucket[0] = min(EDIT_BUDGET, bucket[0] + (now - bucket[1]) * EDIT_BUDGET / EDIT_WINDOW)
+        bucket[1] = now
+        if bucket[0] < 1:
+            return (1 - bucket[0]) * EDIT_WINDOW / EDIT_BUDGET
+        bucket[0] -= 1
+        return 0
+
+    async def edit(self, message, final=False, **kwargs):
+        """Edit a game message within the channel's budget
+        
+        Animation frames are dropped when the budget is spent; final frames wait for it.
+        Returns whether the edit was sent.
+        """
+        wait = self.take_edit(message.channel.id)
+        while wait:
+            if not final:
+                return False
+            await asyncio.sleep(wait)
+            wait = self.take_edit(message.channel.id)
+
+        try:
+            await message.edit(**kwargs)
+        except discord.HTTPException as e:
+            if final and e.status != 429:
+                raise
+            return False
+        return True
+
+
+class RankIndex:
+    """Stored totals (balance + bank) kept sorted, so a rank is one bisect
+    
+    The global list holds every user. Guild lists are built from member totals the first
+    time a guild is ranked and kept in step with balance and membership changes after that.
+    """
+
+    def __init__(self):
+        self.totals = {}  # {user_id: total}
+        self.ordered = []  # every total, ascending
+        self.guilds = {}  # {guild_id: member totals, ascending}
+
+    def load(self, rows):
+        self.totals = dict(rows)
+        self.ordered = sorted(self.totals.values())
+        self.guilds.clear()
+
+    def set(self, user_id, total, guilds=()):
+        """Record a user's new total; guilds are the built guild lists the user belongs to"""
+        old = self.totals.get(user_id)
+        if old == total:
+            return
+        self.totals[user_id] = total
+        for ordered in (self.ordered, *(self.guilds[guild_id] for guild_id in guilds)):
+            if old is not None:
+                del ordered[bisect_left(ordered, old)]
+            insort(ordered, total)
+
+    def ahead(self, total, guild=None):
+        """Number of users (or members of guild) with a stored total above total"""
+        if guild is None:
+            ordered = self.ordered
+        else:
+            ordered = self.guilds.get(guild.id)
+            if ordered is None:
+                ordered = self.guilds[guild.id] = sorted(
+                    self.totals[member.id] for member in guild.members if member.id in self.totals
+                )
+        return len(ordered) - bisect_right(ordered, total)
+
+    def member_joined(self, guild_id, user_id):
+        ordered = self.guilds.get(guild_id)
+        if ordered is not None and user_id in self.totals:
+            insort(ordered, self.totals[user_id])
+
+    def member_left(self, guild_id, user_id):
+        ordered = self.guilds.get(guild_id)
+        if ordered is not None and user_id in self.totals:
+            del ordered[bisect_left(ordered, self.totals[user_id])]
+
+
 class Economy(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db_path = "data/economy.db"
         self.purple = COLOR
-        self.work_cooldowns = {}
+        self.cooldowns = {}  # {user_id: {name: expires_at}}
+        self.dirty_cooldowns = set()  # {(user_id, name)}
+        self.sessions = GameSessions()
+        self.accounts = OrderedDict()  # {user_id: Account}, least recently used first
+        self.dirty_accounts = set()
+        self.fetched_names = {}  # {user_id: display name} for leaderboard users outside the cache
+        self.ledger_buffer = []  # (user_id, wallet_delta, bank_delta, reason, counterparty, created_at)
+        self.item_deltas = {}  # {(user_id, item_id): qty change not yet written to inventory}
+        self.items = {}  # {item_id: item row dict}, the whole catalog
+        self.ranks = RankIndex()
         self.setup_database()
+        self.load_items()
+        self.load_ranks()
+        self.load_cooldowns()
+        self.flush_accounts.start()
+        self.sweep_cooldowns.start()
+        self.take_snapshots.start()
+    
+    def cog_unload(self):
+        # Also runs on bot.close(), which unloads every extension
+        self.flush_accounts.cancel()
+        self.sweep_cooldowns.cancel()
+        self.take_snapshots.cancel()
+        self.flush_dirty_accounts()
+        self.flush_dirty_cooldowns()
         
     def setup_database(self):
         """Initialize the database and create tables if they don't exist"""
@@ -32,86 +280,614 @@ class Economy(commands.Cog):
             inventory TEXT DEFAULT '{}'
         )''')
         
+        c.execute("PRAGMA table_info(users)")
+        if "bank_updated_at" not in [column[1] for column in c.fetchall()]:
+            c.execute("ALTER TABLE users ADD COLUMN bank_updated_at INTEGER")
+        
+        # Leaderboard queries order by this expression, so top-N is an index walk
+        c.execute("CREATE INDEX IF NOT EXISTS idx_users_total ON users(balance + bank)")
+        
+        # Append-only history of every balance change, plus periodic checkpoints of it
+        c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ledger'")
+        new_ledger = c.fetchone() is None
+        c.execute('''CREATE TABLE IF NOT EXISTS ledger (
+            id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            wallet_delta INTEGER NOT NULL,
+            bank_delta INTEGER NOT NULL,
+            reason TEXT NOT NULL,
+            counterparty INTEGER,
+            created_at INTEGER NOT NULL
+        )''')
+        c.execute("CREATE INDEX IF NOT EXISTS idx_ledger_user ON ledger(user_id, id)")
+        c.execute('''CREATE TABLE IF NOT EXISTS balance_snapshots (
+            user_id INTEGER NOT NULL,
+            ledger_id INTEGER NOT NULL,
+            balance INTEGER NOT NULL,
+            bank INTEGER NOT NULL,
+            created_at INTEGER NOT NULL,
+            PRIMARY KEY (user_id, ledger_id)
+        ) WITHOUT ROWID''')
+        if new_ledger:
+            # Baseline for balances that predate the ledger
+            c.execute(
+                "INSERT OR IGNORE INTO balance_snapshots (user_id, ledger_id, balance, bank, created_at) "
+                "SELECT user_id, 0, balance, bank, ? FROM users",
+                (int(time.time()),)
+            )
+        
+        c.execute('''CREATE TABLE IF NOT EXISTS items (
+            item_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            emoji TEXT NOT NULL,
+            price INTEGER NOT NULL,
+            sell_price INTEGER NOT NULL,
+            description TEXT NOT NULL,
+            effect TEXT
+        )''')
+        c.executemany("INSERT OR IGNORE INTO items VALUES (?, ?, ?, ?, ?, ?, ?)", DEFAULT_ITEMS)
+        
+        # Replaces the unused users.inventory JSON blob
+        c.execute('''CREATE TABLE IF NOT EXISTS inventory (
+            user_id INTEGER NOT NULL,
+            item_id TEXT NOT NULL,
+            qty INTEGER NOT NULL CHECK (qty > 0),
+            PRIMARY KEY (user_id, item_id)
+        ) WITHOUT ROWID''')
+        c.execute("CREATE INDEX IF NOT EXISTS idx_inventory_item ON inventory(item_id)")
+        
+        c.execute('''CREATE TABLE IF NOT EXISTS cooldowns (
+            user_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            expires_at INTEGER NOT NULL,
+            PRIMARY KEY (user_id, name)
+        ) WITHOUT ROWID''')
+        c.execute("CREATE INDEX IF NOT EXISTS idx_cooldowns_expires ON cooldowns(expires_at)")
+        
+        # Move the old ISO-string claim columns into the cooldowns table once
+        c.execute("SELECT user_id, last_daily, last_weekly FROM users WHERE last_daily IS NOT NULL OR last_weekly IS NOT NULL")
+        migrated = []
+        for user_id, last_daily, last_weekly in c.fetchall():
+            for name, claimed in (("daily", last_daily), ("weekly", last_weekly)):
+                if claimed:
+                    expires_at = int(datetime.fromisoformat(claimed).timestamp()) + COOLDOWNS[name]
+                    migrated.append((user_id, name, expires_at))
+        if migrated:
+            c.executemany("INSERT OR REPLACE INTO cooldowns (user_id, name, expires_at) VALUES (?, ?, ?)", migrated)
+            c.execute("UPDATE users SET last_daily = NULL, last_weekly = NULL")
+        
         conn.commit()
         conn.close()
     
-    def get_user(self, user_id):
-        """Get user data from database"""
+    def get_account(self, user_id):
+        """Return the cached account for a user, loading (and creating) the row on a miss"""
+        account = self.accounts.get(user_id)
+        if account is not None:
+            self.accounts.move_to_end(user_id)
+            self.accrue_interest(user_id, account)
+            return account
+        
         conn = sqlite3.connect(self.db_path)
         c = conn.cursor()
         
-        c.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
-        user = c.fetchone()
+        c.execute("INSERT OR IGNORE INTO users (user_id) VALUES (?)", (user_id,))
+        c.execute("SELECT balance, bank, bank_updated_at FROM users WHERE user_id = ?", (user_id,))
+        account = Account(*c.fetchone())
+        # New and pre-interest rows start their clock now; persist it so a reload doesn't restart it
+        c.execute(
+            "UPDATE users SET bank_updated_at = ? WHERE user_id = ? AND bank_updated_at IS NULL",
+            (account.bank_updated_at, user_id)
+        )
+        
+        conn.commit()
+        conn.close()
+        
+        self.accounts[user_id] = account
+        if len(self.accounts) > ACCOUNT_CACHE_SIZE:
+            self.evict_accounts()
+        if user_id not in self.ranks.totals:
+            self.update_rank(user_id, account.balance + account.bank)
+        self.accrue_interest(user_id, account)
+        return account
+    
+    def accrue_interest(self, user_id, account, settle=False):
+        """Settle bank interest earned since the last settlement
+        
+        Runs whenever an account is touched, so idle accounts cost nothing. On reads the
+        clock only advances once at least $1 has accrued, so frequent reads don't round
+        interest away. Before the bank balance changes (settle=True) it always advances,
+        otherwise the old clock would compound the new money retroactively.
+        """
+        now = int(time.time())
+        if account.bank <= 0:
+            account.bank_updated_at = now
+            return
+        
+        interest = accrued_bank(account.bank, account.bank_updated_at, now) - account.bank
+        if interest < 1:
+            if settle:
+                account.bank_updated_at = now
+            return
         
-        if not user:
-            c.execute("INSERT INTO users (user_id) VALUES (?)", (user_id,))
+        account.add(interest, bank=True)
+        account.bank_updated_at = now
+        self.mark_dirty(user_id)
+        self.ledger_buffer.append((user_id, 0, interest, "interest", None, now))
+    
+    def evict_accounts(self):
+        """Drop least recently used clean accounts; dirty ones wait for the next flush"""
+        excess = len(self.accounts) - ACCOUNT_CACHE_SIZE
+        for user_id in list(self.accounts):
+            if excess <= 0:
+                break
+            if user_id not in self.dirty_accounts:
+                del self.accounts[user_id]
+                excess -= 1
+    
+    def mark_dirty(self, user_id):
+        self.dirty_accounts.add(user_id)
+    
+    def flush_dirty_accounts(self):
+        """Write every dirty account back in one transaction
+        
+        Balances are written as deltas (balance = balance + ?), so a flush never
+        overwrites changes made to the row outside this cache. Inventory changes go in
+        the same transaction, so an item and the money paid for it land together.
+        """
+        if not self.dirty_accounts and not self.item_deltas:
+            return 0
+        
+        dirty, self.dirty_accounts = self.dirty_accounts, set()
+        entries, self.ledger_buffer = self.ledger_buffer, []
+        item_deltas, self.item_deltas = self.item_deltas, {}
+        added = [(user_id, item_id, qty) for (user_id, item_id), qty in item_deltas.items() if qty > 0]
+        removed = [(user_id, item_id, -qty) for (user_id, item_id), qty in item_deltas.items() if qty < 0]
+        deltas = []
+        for user_id in dirty:
+            account = self.accounts.get(user_id)
+            if account is not None and (account.balance_delta or account.bank_delta):
+                deltas.append((account.balance_delta, account.bank_delta, account.bank_updated_at, user_id))
+        
+        try:
+            conn = sqlite3.connect(self.db_path)
+            c = conn.cursor()
+            c.executemany(
+                "UPDATE users SET balance = balance + ?, bank = bank + ?, bank_updated_at = ? WHERE user_id = ?",
+                deltas
+            )
+            # Same transaction as the balances, so snapshot + ledger tail always adds up
+            c.executemany(
+                "INSERT INTO ledger (user_id, wallet_delta, bank_delta, reason, counterparty, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                entries
+            )
+            c.executemany(
+                "INSERT INTO inventory (user_id, item_id, qty) VALUES (?, ?, ?) "
+                "ON CONFLICT (user_id, item_id) DO UPDATE SET qty = qty + excluded.qty",
+                added
+            )
+            # Rows that would drop to zero are deleted; qty > 0 is a CHECK constraint
+            c.executemany("DELETE FROM inventory WHERE user_id = ? AND item_id = ? AND qty <= ?", removed)
+            c.executemany(
+                "UPDATE inventory SET qty = qty - ? WHERE user_id = ? AND item_id = ?",
+                [(qty, user_id, item_id) for user_id, item_id, qty in removed]
+            )
             conn.commit()
-            c.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
-            user = c.fetchone()
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"Error flushing economy accounts: {e}")
+            self.dirty_accounts |= dirty
+            self.ledger_buffer[:0] = entries
+            for key, qty in item_deltas.items():
+                self.item_deltas[key] = self.item_deltas.get(key, 0) + qty
+            return 0
+        
+        for balance_delta, bank_delta, _, user_id in deltas:
+            account = self.accounts[user_id]
+            account.balance_delta -= balance_delta
+            account.bank_delta -= bank_delta
+            self.update_rank(user_id, account.balance + account.bank)
+        return len(dirty)
+    
+    def load_ranks(self):
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute("SELECT user_id, balance + bank FROM users")
+        self.ranks.load(c.fetchall())
+        conn.close()
+    
+    def update_rank(self, user_id, total):
+        guilds = []
+        for guild_id in self.ranks.guilds:
+            guild = self.bot.get_guild(guild_id)
+            if guild is not None and guild.get_member(user_id) is not None:
+                guilds.append(guild_id)
+        self.ranks.set(user_id, total, guilds)
+    
+    @tasks.loop(seconds=ACCOUNT_FLUSH_INTERVAL)
+    async def flush_accounts(self):
+        self.flush_dirty_accounts()
+        self.flush_dirty_cooldowns()
+        if len(self.accounts) > ACCOUNT_CACHE_SIZE:
+            self.evict_accounts()
+    
+    @flush_accounts.before_loop
+    async def before_flush_accounts(self):
+        await self.bot.wait_until_ready()
+    
+    @tasks.loop(seconds=SNAPSHOT_INTERVAL)
+    async def take_snapshots(self):
+        """Checkpoint the balance of every account that has ledger rows since its last snapshot"""
+        self.flush_dirty_accounts()
+        
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        
+        c.execute("SELECT COALESCE(MAX(ledger_id), 0) FROM balance_snapshots")
+        last_id = c.fetchone()[0]
+        c.execute(
+            "INSERT OR IGNORE INTO balance_snapshots (user_id, ledger_id, balance, bank, created_at) "
+            "SELECT users.user_id, tail.last_id, users.balance, users.bank, ? FROM users "
+            "JOIN (SELECT user_id, MAX(id) AS last_id FROM ledger WHERE id > ? GROUP BY user_id) AS tail "
+            "ON tail.user_id = users.user_id",
+            (int(time.time()), last_id)
+        )
         
+        conn.commit()
         conn.close()
-        return user
     
-    def update_balance(self, user_id, amount, bank=False):
-        """Update user balance"""
+    @take_snapshots.before_loop
+    async def before_take_snapshots(self):
+        await self.bot.wait_until_ready()
+    
+    def replay_balance(self, user_id):
+        """Recompute (wallet, bank) from the latest snapshot plus the ledger rows after it"""
+        self.flush_dirty_accounts()
+        
         conn = sqlite3.connect(self.db_path)
         c = conn.cursor()
         
-        if bank:
-            c.execute("UPDATE users SET bank = bank + ? WHERE user_id = ?", (amount, user_id))
-        else:
-            c.execute("UPDATE users SET balance = balance + ? WHERE user_id = ?", (amount, user_id))
+        c.execute(
+            "SELECT ledger_id, balance, bank FROM balance_snapshots WHERE user_id = ? "
+            "ORDER BY ledger_id DESC LIMIT 1",
+            (user_id,)
+        )
+        ledger_id, balance, bank = c.fetchone() or (0, 0, 0)
+        c.execute(
+            "SELECT COALESCE(SUM(wallet_delta), 0), COALESCE(SUM(bank_delta), 0) FROM ledger "
+            "WHERE user_id = ? AND id > ?",
+            (user_id, ledger_id)
+        )
+        wallet_delta, bank_delta = c.fetchone()
+        
+        conn.close()
+        return balance + wallet_delta, bank + bank_delta
+    
+    def get_ledger_page(self, user_id, before_id=None):
+        """Return up to LEDGER_PAGE_SIZE ledger rows older than before_id, newest first"""
+        self.flush_dirty_accounts()
+        
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        
+        c.execute(
+            "SELECT id, wallet_delta, bank_delta, reason, counterparty, created_at FROM ledger "
+            "WHERE user_id = ? AND id < ? ORDER BY id DESC LIMIT ?",
+            (user_id, before_id or 2 ** 63 - 1, LEDGER_PAGE_SIZE)
+        )
+        rows = c.fetchall()
+        
+        conn.close()
+        return rows
+    
+    def load_cooldowns(self):
+        """Load every pending cooldown into memory"""
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        
+        c.execute("SELECT user_id, name, expires_at FROM cooldowns WHERE expires_at > ?", (int(time.time()),))
+        for user_id, name, expires_at in c.fetchall():
+            self.cooldowns.setdefault(user_id, {})[name] = expires_at
+        
+        conn.close()
+    
+    def get_cooldown(self, user_id, name):
+        """Seconds left on a cooldown, or 0 if it's ready"""
+        expires_at = self.cooldowns.get(user_id, {}).get(name, 0)
+        return max(expires_at - int(time.time()), 0)
+    
+    def use_cooldown(self, user_id, name):
+        """Start a cooldown if it's ready and return 0, otherwise return the seconds left"""
+        now = int(time.time())
+        timers = self.cooldowns.setdefault(user_id, {})
+        expires_at = timers.get(name, 0)
+        if expires_at > now:
+            return expires_at - now
+        
+        timers[name] = now + COOLDOWNS[name]
+        self.dirty_cooldowns.add((user_id, name))
+        return 0
+    
+    def reset_cooldown(self, user_id, name):
+        timers = self.cooldowns.get(user_id)
+        if timers and timers.pop(name, None) is not None:
+            self.dirty_cooldowns.add((user_id, name))
+    
+    def flush_dirty_cooldowns(self):
+        """Persist started and reset cooldowns in one transaction"""
+        if not self.dirty_cooldowns:
+            return
+        
+        dirty, self.dirty_cooldowns = self.dirty_cooldowns, set()
+        upserts = []
+        deletes = []
+        for user_id, name in dirty:
+            expires_at = self.cooldowns.get(user_id, {}).get(name)
+            if expires_at:
+                upserts.append((user_id, name, expires_at))
+            else:
+                deletes.append((user_id, name))
         
+        try:
+            conn = sqlite3.connect(self.db_path)
+            c = conn.cursor()
+            c.executemany("INSERT OR REPLACE INTO cooldowns (user_id, name, expires_at) VALUES (?, ?, ?)", upserts)
+            c.executemany("DELETE FROM cooldowns WHERE user_id = ? AND name = ?", deletes)
+            conn.commit()
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"Error flushing economy cooldowns: {e}")
+            self.dirty_cooldowns |= dirty
+    
+    @tasks.loop(seconds=COOLDOWN_SWEEP_INTERVAL)
+    async def sweep_cooldowns(self):
+        """Drop expired timers from memory and disk"""
+        now = int(time.time())
+        for user_id in list(self.cooldowns):
+            timers = self.cooldowns[user_id]
+            for name in [name for name, expires_at in timers.items() if expires_at <= now]:
+                del timers[name]
+            if not timers:
+                del self.cooldowns[user_id]
+        
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("DELETE FROM cooldowns WHERE expires_at <= ?", (now,))
         conn.commit()
         conn.close()
     
+    @sweep_cooldowns.before_loop
+    async def before_sweep_cooldowns(self):
+        await self.bot.wait_until_ready()
+    
+    def apply(self, user_id, wallet_delta, bank_delta, reason, counterparty=None):
+        """Change an account and queue the matching ledger row; every balance change goes through here"""
+        account = self.get_account(user_id)
+        if wallet_delta:
+            account.add(wallet_delta)
+        if bank_delta:
+            self.accrue_interest(user_id, account, settle=True)
+            account.add(bank_delta, bank=True)
+        self.mark_dirty(user_id)
+        self.ledger_buffer.append((user_id, wallet_delta, bank_delta, reason, counterparty, int(time.time())))
+        return account
+    
+    def credit(self, user_id, amount, bank=False, reason="credit"):
+        """Add amount to a wallet (or bank) unconditionally and return the new value"""
+        account = self.apply(user_id, 0 if bank else amount, amount if bank else 0, reason)
+        return account.bank if bank else account.balance
+    
+    def transfer(self, user_id, target_id, amount, from_bank=False, to_bank=False, reason="transfer"):
+        """Move amount between two accounts (or a wallet and its bank)
+        
+        The debit only applies while the source still covers it, so concurrent commands
+        can't spend the same money twice. Returns (success, source value after the call).
+        """
+        source = self.get_account(user_id)
+        available = source.bank if from_bank else source.balance
+        if available < amount:
+            return False, available
+        
+        if user_id == target_id:
+            wallet_delta = (0 if from_bank else -amount) + (0 if to_bank else amount)
+            bank_delta = (-amount if from_bank else 0) + (amount if to_bank else 0)
+            self.apply(user_id, wallet_delta, bank_delta, reason)
+        else:
+            self.apply(user_id, 0 if from_bank else -amount, -amount if from_bank else 0, reason, target_id)
+            self.apply(target_id, 0 if to_bank else amount, amount if to_bank else 0, reason, user_id)
+        return True, available - amount
+    
+    def transfer_all(self, user_id, to_bank, reason="transfer"):
+        """Move a user's whole wallet into the bank (or back) and return the amount moved"""
+        account = self.get_account(user_id)
+        amount = account.balance if to_bank else account.bank
+        if amount > 0:
+            sign = 1 if to_bank else -1
+            self.apply(user_id, -amount * sign, amount * sign, reason)
+        return amount
+    
+    def settle(self, user_id, bet, delta, reason="game"):
+        """Apply a game result only if the wallet still covers the bet
+        
+        Returns (success, wallet after the call).
+        """
+        account = self.get_account(user_id)
+        if account.balance < bet:
+            return False, account.balance
+        
+        self.apply(user_id, delta, 0, reason)
+        return True, account.balance
+    
+    def debit(self, user_id, amount, reason="debit"):
+        """Take amount from a wallet only if it's covered; returns (success, wallet after the call)"""
+        return self.settle(user_id, amount, -amount, reason)
+    
+    def fine(self, user_id, fraction, reason="fine"):
+        """Take a fraction of a user's wallet and return the amount taken"""
+        account = self.get_account(user_id)
+        amount = max(int(account.balance * fraction), 0)
+        if amount:
+            self.apply(user_id, -amount, 0, reason)
+        return amount
+    
+    def claim_reward(self, user_id, name, amount):
+        """Pay a timed reward if its cooldown is ready; returns the seconds left otherwise (0 on success)"""
+        retry_after = self.use_cooldown(user_id, name)
+        if not retry_after:
+            self.credit(user_id, amount, reason=name)
+        return retry_after
+    
+    def load_items(self):
+        """Load the item catalog into memory"""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        c = conn.cursor()
+        
+        c.execute("SELECT * FROM items ORDER BY price")
+        self.items = {row["item_id"]: dict(row) for row in c.fetchall()}
+        
+        conn.close()
+    
+    def find_item(self, query):
+        """Look up a catalog item by id or name"""
+        query = query.lower().strip()
+        item = self.items.get(query.replace(" ", "_"))
+        if item is not None:
+            return item
+        for item in self.items.values():
+            if item["name"].lower() == query:
+                return item
+        return None
+    
+    def get_inventory(self, user_id):
+        """Return [(item_id, qty)] for a user, including changes not flushed yet"""
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        
+        c.execute("SELECT item_id, qty FROM inventory WHERE user_id = ?", (user_id,))
+        holdings = dict(c.fetchall())
+        
+        conn.close()
+        for (owner_id, item_id), qty in self.item_deltas.items():
+            if owner_id == user_id:
+                holdings[item_id] = holdings.get(item_id, 0) + qty
+        return [(item_id, qty) for item_id, qty in holdings.items() if qty > 0]
+    
+    def change_items(self, user_id, item_id, qty):
+        """Add (or with a negative qty, remove) items; removal only applies if the user has enough
+        
+        The change is buffered and written by the next account flush, in the same
+        transaction as any balance change made alongside it.
+        """
+        key = (user_id, item_id)
+        if qty < 0:
+            conn = sqlite3.connect(self.db_path)
+            c = conn.cursor()
+            c.execute("SELECT qty FROM inventory WHERE user_id = ? AND item_id = ?", key)
+            row = c.fetchone()
+            conn.close()
+            if (row[0] if row else 0) + self.item_deltas.get(key, 0) < -qty:
+                return False
+        
+        self.item_deltas[key] = self.item_deltas.get(key, 0) + qty
+        return True
+    
+    def buy_item(self, user_id, item, qty):
+        """Charge for and hand over items in the same flush; returns (success, wallet after the call)"""
+        account = self.get_account(user_id)
+        cost = item["price"] * qty
+        if account.balance < cost:
+            return False, account.balance
+        
+        # Nothing awaits between the check and the charge, so the wallet can't change underneath
+        self.change_items(user_id, item["item_id"], qty)
+        self.apply(user_id, -cost, 0, f"buy:{item['item_id']}")
+        return True, account.balance
+    
+    def sell_item(self, user_id, item, qty):
+        """Take items back and pay their sell price; returns the amount paid or None if not owned"""
+        if not self.change_items(user_id, item["item_id"], -qty):
+            return None
+        
+        amount = item["sell_price"] * qty
+        self.apply(user_id, amount, 0, f"sell:{item['item_id']}")
+        return amount
+    
+    def use_guard(self, user_id, name):
+        """Consume one passive item protecting against name, if the user owns any"""
+        for item_id, item in self.items.items():
+            if item["effect"] == f"guard:{name}" and self.change_items(user_id, item_id, -1):
+                return item
+        return None
+    
+    async def open_session(self, ctx, game):
+        """Start a game session for the author, telling them why if they can't play right now"""
+        session, reason = self.sessions.open(ctx.author.id, ctx.channel.id, game)
+        if session is None:
+            embed = discord.Embed(
+                title="❌ Game In Progress",
+                description=reason,
+                color=self.purple
+            )
+            await ctx.send(embed=embed)
+        return session
+    
     @commands.command(name="balance", aliases=["bal", "money"])
     async def balance(self, ctx, member: discord.Member = None):
         """Check balance of yourself or another user"""
         target = member or ctx.author
-        user_data = self.get_user(target.id)
+        account = self.get_account(target.id)
         
         embed = discord.Embed(
             title=f"💰 {target.display_name}'s Balance",
             color=self.purple
         )
-        embed.add_field(name="Wallet", value=f"${user_data[1]:,}", inline=True)
-        embed.add_field(name="Bank", value=f"${user_data[2]:,}", inline=True)
-        embed.add_field(name="Total", value=f"${user_data[1] + user_data[2]:,}", inline=True)
+        embed.add_field(name="Wallet", value=f"${account.balance:,}", inline=True)
+        embed.add_field(name="Bank", value=f"${account.bank:,}", inline=True)
+        embed.add_field(name="Total", value=f"${account.balance + account.bank:,}", inline=True)
         embed.set_thumbnail(url=target.display_avatar.url)
+        embed.set_footer(text=f"Bank balances earn {BANK_INTEREST_RATE:.1%} interest daily")
+        
+        await ctx.send(embed=embed)
+    
+    @commands.command(name="cooldowns", aliases=["cd", "timers"])
+    async def cooldowns_command(self, ctx):
+        """Show all of your pending economy cooldowns"""
+        now = int(time.time())
+        timers = self.cooldowns.get(ctx.author.id, {})
+        
+        lines = []
+        for name in COOLDOWNS:
+            expires_at = timers.get(name, 0)
+            if expires_at > now:
+                lines.append(f"**{name.title()}** - ready <t:{expires_at}:R>")
+            else:
+                lines.append(f"**{name.title()}** - ✅ ready")
+        
+        embed = discord.Embed(
+            title="⏰ Cooldowns",
+            description="\n".join(lines),
+            color=self.purple
+        )
         
         await ctx.send(embed=embed)
     
     @commands.command(name="daily")
     async def daily(self, ctx):
         """Claim daily reward"""
-        user_data = self.get_user(ctx.author.id)
-        last_daily = user_data[3]
-        
-        if last_daily:
-            last_time = datetime.fromisoformat(last_daily)
-            if datetime.now() - last_time < timedelta(days=1):
-                time_left = timedelta(days=1) - (datetime.now() - last_time)
-                hours, remainder = divmod(time_left.seconds, 3600)
-                minutes, _ = divmod(remainder, 60)
-                
-                embed = discord.Embed(
-                    title="⏰ Daily Cooldown",
-                    description=f"You've already claimed your daily reward!\nCome back in **{hours} hours** and **{minutes} minutes**",
-                    color=self.purple
-                )
-                await ctx.send(embed=embed)
-                return
-        
         amount = random.randint(500, 1500)
-        self.update_balance(ctx.author.id, amount)
+        retry_after = self.claim_reward(ctx.author.id, "daily", amount)
         
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("UPDATE users SET last_daily = ? WHERE user_id = ?", 
-                 (datetime.now().isoformat(), ctx.author.id))
-        conn.commit()
-        conn.close()
+        if retry_after:
+            hours, remainder = divmod(retry_after, 3600)
+            minutes, _ = divmod(remainder, 60)
+            
+            embed = discord.Embed(
+                title="⏰ Daily Cooldown",
+                description=f"You've already claimed your daily reward!\nCome back in **{hours} hours** and **{minutes} minutes**",
+                color=self.purple
+            )
+            await ctx.send(embed=embed)
+            return
         
         embed = discord.Embed(
             title="🎁 Daily Reward Claimed!",
@@ -124,33 +900,20 @@ class Economy(commands.Cog):
     @commands.command(name="weekly")
     async def weekly(self, ctx):
         """Claim weekly reward"""
-        user_data = self.get_user(ctx.author.id)
-        last_weekly = user_data[4]
-        
-        if last_weekly:
-            last_time = datetime.fromisoformat(last_weekly)
-            if datetime.now() - last_time < timedelta(days=7):
-                time_left = timedelta(days=7) - (datetime.now() - last_time)
-                days = time_left.days
-                hours, remainder = divmod(time_left.seconds, 3600)
-                
-                embed = discord.Embed(
-                    title="⏰ Weekly Cooldown",
-                    description=f"You've already claimed your weekly reward!\nCome back in **{days} days** and **{hours} hours**",
-                    color=self.purple
-                )
-                await ctx.send(embed=embed)
-                return
-        
         amount = random.randint(5000, 10000)
-        self.update_balance(ctx.author.id, amount)
+        retry_after = self.claim_reward(ctx.author.id, "weekly", amount)
         
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("UPDATE users SET last_weekly = ? WHERE user_id = ?", 
-                 (datetime.now().isoformat(), ctx.author.id))
-        conn.commit()
-        conn.close()
+        if retry_after:
+            days, remainder = divmod(retry_after, 86400)
+            hours, remainder = divmod(remainder, 3600)
+            
+            embed = discord.Embed(
+                title="⏰ Weekly Cooldown",
+                description=f"You've already claimed your weekly reward!\nCome back in **{days} days** and **{hours} hours**",
+                color=self.purple
+            )
+            await ctx.send(embed=embed)
+            return
         
         embed = discord.Embed(
             title="🎉 Weekly Reward Claimed!",
@@ -163,11 +926,68 @@ class Economy(commands.Cog):
     @commands.command(name="deposit", aliases=["dep"])
     async def deposit(self, ctx, amount: str):
         """Deposit money into your bank"""
-        user_data = self.get_user(ctx.author.id)
-        wallet = user_data[1]
+        if amount.lower() == "all":
+            amount = self.transfer_all(ctx.author.id, to_bank=True, reason="deposit")
+            if amount <= 0:
+                embed = discord.Embed(
+                    title="❌ Insufficient Funds",
+                    description="Your wallet is empty!",
+                    color=self.purple
+                )
+                await ctx.send(embed=embed)
+                return
+        else:
+            try:
+                amount = int(amount)
+            except ValueError:
+                embed = discord.Embed(
+                    title="❌ Invalid Amount",
+                    description="Please enter a valid number or 'all'",
+                    color=self.purple
+                )
+                await ctx.send(embed=embed)
+                return
+            
+            if amount <= 0:
+                embed = discord.Embed(
+                    title="❌ Invalid Amount",
+                    description="Amount must be positive!",
+                    color=self.purple
+                )
+                await ctx.send(embed=embed)
+                return
+            
+            success, wallet = self.transfer(ctx.author.id, ctx.author.id, amount, to_bank=True, reason="deposit")
+            if not success:
+                embed = discord.Embed(
+                    title="❌ Insufficient Funds",
+                    description=f"You only have **${wallet:,}** in your wallet!",
+                    color=self.purple
+                )
+                await ctx.send(embed=embed)
+                return
+        
+        embed = discord.Embed(
+            title="🏦 Deposit Successful",
+            description=f"Deposited **${amount:,}** into your bank!",
+            color=self.purple
+        )
         
+        await ctx.send(embed=embed)
+    
+    @commands.command(name="withdraw", aliases=["with"])
+    async def withdraw(self, ctx, amount: str):
+        """Withdraw money from your bank"""
         if amount.lower() == "all":
-            amount = wallet
+            amount = self.transfer_all(ctx.author.id, to_bank=False, reason="withdraw")
+            if amount <= 0:
+                embed = discord.Embed(
+                    title="❌ Insufficient Funds",
+                    description="Your bank is empty!",
+                    color=self.purple
+                )
+                await ctx.send(embed=embed)
+                return
         else:
             try:
                 amount = int(amount)
@@ -179,6 +999,54 @@ class Economy(commands.Cog):
                 )
                 await ctx.send(embed=embed)
                 return
+            
+            if amount <= 0:
+                embed = discord.Embed(
+                    title="❌ Invalid Amount",
+                    description="Amount must be positive!",
+                    color=self.purple
+                )
+                await ctx.send(embed=embed)
+                return
+            
+            success, bank = self.transfer(ctx.author.id, ctx.author.id, amount, from_bank=True, reason="withdraw")
+            if not success:
+                embed = discord.Embed(
+                    title="❌ Insufficient Funds",
+                    description=f"You only have **${bank:,}** in your bank!",
+                    color=self.purple
+                )
+                await ctx.send(embed=embed)
+                return
+        
+        embed = discord.Embed(
+            title="🏦 Withdrawal Successful",
+            description=f"Withdrew **${amount:,}** from your bank!",
+            color=self.purple
+        )
+        
+        await ctx.send(embed=embed)
+    
+    @commands.command(name="give", aliases=["pay"])
+    async def give(self, ctx, member: discord.Member, amount: int):
+        """Give money to another user"""
+        if member.id == ctx.author.id:
+            embed = discord.Embed(
+                title="❌ Invalid Action",
+                description="You can't give money to yourself!",
+                color=self.purple
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        if member.bot:
+            embed = discord.Embed(
+                title="❌ Invalid Action",
+                description="You can't give money to bots!",
+                color=self.purple
+            )
+            await ctx.send(embed=embed)
+            return
         
         if amount <= 0:
             embed = discord.Embed(
@@ -189,7 +1057,8 @@ class Economy(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        if amount > wallet:
+        success, wallet = self.transfer(ctx.author.id, member.id, amount, reason="give")
+        if not success:
             embed = discord.Embed(
                 title="❌ Insufficient Funds",
                 description=f"You only have **${wallet:,}** in your wallet!",
@@ -198,36 +1067,120 @@ class Economy(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        self.update_balance(ctx.author.id, -amount)
-        self.update_balance(ctx.author.id, amount, bank=True)
+        embed = discord.Embed(
+            title="💸 Money Sent",
+            description=f"You gave **${amount:,}** to {member.mention}!",
+            color=self.purple
+        )
+        
+        await ctx.send(embed=embed)
+    
+    @commands.command(name="work")
+    async def work(self, ctx):
+        """Work to earn money (10 second cooldown)"""
+        time_left = self.use_cooldown(ctx.author.id, "work")
+        if time_left:
+            embed = discord.Embed(
+                title="⏰ Work Cooldown",
+                description=f"You need to rest! Try again in **{time_left} seconds**",
+                color=self.purple
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        jobs = [
+            ("programming", "💻"),
+            ("teaching", "👨‍🏫"),
+            ("cooking", "👨‍🍳"),
+            ("cleaning", "🧹"),
+            ("delivery driving", "🚗"),
+            ("gardening", "🌱"),
+            ("writing", "✍️"),
+            ("painting", "🎨")
+        ]
+        
+        job, emoji = random.choice(jobs)
+        amount = random.randint(100, 500)
+        
+        self.credit(ctx.author.id, amount, reason="work")
         
         embed = discord.Embed(
-            title="🏦 Deposit Successful",
-            description=f"Deposited **${amount:,}** into your bank!",
+            title=f"{emoji} Work Complete!",
+            description=f"You worked as a **{job}** and earned **${amount:,}**!",
             color=self.purple
         )
         
         await ctx.send(embed=embed)
     
-    @commands.command(name="withdraw", aliases=["with"])
-    async def withdraw(self, ctx, amount: str):
-        """Withdraw money from your bank"""
-        user_data = self.get_user(ctx.author.id)
-        bank = user_data[2]
+    @commands.command(name="shop", aliases=["store"])
+    async def shop(self, ctx):
+        """Browse the item shop"""
+        embed = discord.Embed(
+            title="🛒 Item Shop",
+            description=f"Buy with `{ctx.clean_prefix}buy <item> [amount]`",
+            color=self.purple
+        )
+        for item in self.items.values():
+            embed.add_field(
+                name=f"{item['emoji']} {item['name']} - ${item['price']:,}",
+                value=f"{item['description']}\nID: `{item['item_id']}` • Sells for ${item['sell_price']:,}",
+                inline=False
+            )
         
-        if amount.lower() == "all":
-            amount = bank
-        else:
-            try:
-                amount = int(amount)
-            except ValueError:
-                embed = discord.Embed(
-                    title="❌ Invalid Amount",
-                    description="Please enter a valid number or 'all'",
-                    color=self.purple
-                )
-                await ctx.send(embed=embed)
-                return
+        await ctx.send(embed=embed)
+    
+    @commands.command(name="buy", aliases=["purchase"])
+    async def buy(self, ctx, item_name: str, amount: int = 1):
+        """Buy an item from the shop"""
+        item = self.find_item(item_name)
+        if item is None:
+            embed = discord.Embed(
+                title="❌ Unknown Item",
+                description=f"Check `{ctx.clean_prefix}shop` for the item list!",
+                color=self.purple
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        if amount <= 0 or amount > MAX_ITEM_QUANTITY:
+            embed = discord.Embed(
+                title="❌ Invalid Amount",
+                description=f"Amount must be between 1 and {MAX_ITEM_QUANTITY:,}!",
+                color=self.purple
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        success, wallet = self.buy_item(ctx.author.id, item, amount)
+        if not success:
+            embed = discord.Embed(
+                title="❌ Insufficient Funds",
+                description=f"That costs **${item['price'] * amount:,}** and you only have **${wallet:,}** in your wallet!",
+                color=self.purple
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        embed = discord.Embed(
+            title="🛒 Purchase Successful",
+            description=f"You bought **{amount}x {item['emoji']} {item['name']}** for **${item['price'] * amount:,}**!",
+            color=self.purple
+        )
+        
+        await ctx.send(embed=embed)
+    
+    @commands.command(name="sell")
+    async def sell(self, ctx, item_name: str, amount: int = 1):
+        """Sell items back to the shop"""
+        item = self.find_item(item_name)
+        if item is None:
+            embed = discord.Embed(
+                title="❌ Unknown Item",
+                description=f"Check `{ctx.clean_prefix}inventory` for your items!",
+                color=self.purple
+            )
+            await ctx.send(embed=embed)
+            return
         
         if amount <= 0:
             embed = discord.Embed(
@@ -238,118 +1191,106 @@ class Economy(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        if amount > bank:
+        paid = self.sell_item(ctx.author.id, item, amount)
+        if paid is None:
             embed = discord.Embed(
-                title="❌ Insufficient Funds",
-                description=f"You only have **${bank:,}** in your bank!",
+                title="❌ Not Enough Items",
+                description=f"You don't have **{amount}x {item['name']}**!",
                 color=self.purple
             )
             await ctx.send(embed=embed)
             return
         
-        self.update_balance(ctx.author.id, amount)
-        self.update_balance(ctx.author.id, -amount, bank=True)
-        
         embed = discord.Embed(
-            title="🏦 Withdrawal Successful",
-            description=f"Withdrew **${amount:,}** from your bank!",
+            title="💰 Item Sold",
+            description=f"You sold **{amount}x {item['emoji']} {item['name']}** for **${paid:,}**!",
             color=self.purple
         )
         
         await ctx.send(embed=embed)
     
-    @commands.command(name="give", aliases=["pay"])
-    async def give(self, ctx, member: discord.Member, amount: int):
-        """Give money to another user"""
-        if member.id == ctx.author.id:
+    @commands.command(name="use")
+    async def use(self, ctx, *, item_name: str):
+        """Use an item from your inventory"""
+        item = self.find_item(item_name)
+        if item is None:
             embed = discord.Embed(
-                title="❌ Invalid Action",
-                description="You can't give money to yourself!",
+                title="❌ Unknown Item",
+                description=f"Check `{ctx.clean_prefix}inventory` for your items!",
                 color=self.purple
             )
             await ctx.send(embed=embed)
             return
         
-        if member.bot:
+        effect = item["effect"] or ""
+        kind, _, argument = effect.partition(":")
+        if kind not in ("cash", "cooldown"):
+            description = "It works on its own while it's in your inventory!" if kind == "guard" else "You can't use this item!"
             embed = discord.Embed(
-                title="❌ Invalid Action",
-                description="You can't give money to bots!",
+                title=f"{item['emoji']} {item['name']}",
+                description=description,
                 color=self.purple
             )
             await ctx.send(embed=embed)
             return
         
-        if amount <= 0:
+        if kind == "cooldown" and not self.get_cooldown(ctx.author.id, argument):
             embed = discord.Embed(
-                title="❌ Invalid Amount",
-                description="Amount must be positive!",
+                title=f"{item['emoji']} {item['name']}",
+                description=f"Your **{argument}** cooldown is already ready!",
                 color=self.purple
             )
             await ctx.send(embed=embed)
             return
         
-        user_data = self.get_user(ctx.author.id)
-        wallet = user_data[1]
-        
-        if amount > wallet:
+        if not self.change_items(ctx.author.id, item["item_id"], -1):
             embed = discord.Embed(
-                title="❌ Insufficient Funds",
-                description=f"You only have **${wallet:,}** in your wallet!",
+                title="❌ Not Enough Items",
+                description=f"You don't have a **{item['name']}**!",
                 color=self.purple
             )
             await ctx.send(embed=embed)
             return
         
-        self.update_balance(ctx.author.id, -amount)
-        self.update_balance(member.id, amount)
+        if kind == "cash":
+            low, high = map(int, argument.split(":"))
+            amount = random.randint(low, high)
+            self.apply(ctx.author.id, amount, 0, f"use:{item['item_id']}")
+            description = f"You opened a **{item['name']}** and found **${amount:,}**!"
+        else:
+            self.reset_cooldown(ctx.author.id, argument)
+            description = f"Your **{argument}** cooldown has been reset!"
         
         embed = discord.Embed(
-            title="💸 Money Sent",
-            description=f"You gave **${amount:,}** to {member.mention}!",
+            title=f"{item['emoji']} {item['name']} Used",
+            description=description,
             color=self.purple
         )
         
         await ctx.send(embed=embed)
     
-    @commands.command(name="work")
-    async def work(self, ctx):
-        """Work to earn money (10 second cooldown)"""
-        user_id = ctx.author.id
-        
-        # Check cooldown
-        if user_id in self.work_cooldowns:
-            time_left = 60 - (datetime.now() - self.work_cooldowns[user_id]).total_seconds()
-            if time_left > 0:
-                embed = discord.Embed(
-                    title="⏰ Work Cooldown",
-                    description=f"You need to rest! Try again in **{int(time_left)} seconds**",
-                    color=self.purple
-                )
-                await ctx.send(embed=embed)
-                return
-        
-        jobs = [
-            ("programming", "💻"),
-            ("teaching", "👨‍🏫"),
-            ("cooking", "👨‍🍳"),
-            ("cleaning", "🧹"),
-            ("delivery driving", "🚗"),
-            ("gardening", "🌱"),
-            ("writing", "✍️"),
-            ("painting", "🎨")
-        ]
-        
-        job, emoji = random.choice(jobs)
-        amount = random.randint(100, 500)
+    @commands.command(name="inventory", aliases=["bag", "items"])
+    async def inventory(self, ctx, member: discord.Member = None):
+        """Show your (or another user's) items"""
+        target = member or ctx.author
+        rows = self.get_inventory(target.id)
         
-        self.update_balance(ctx.author.id, amount)
-        self.work_cooldowns[user_id] = datetime.now()
+        lines = []
+        worth = 0
+        for item_id, qty in rows:
+            item = self.items.get(item_id)
+            if item is None:
+                continue
+            worth += item["sell_price"] * qty
+            lines.append(f"{item['emoji']} **{item['name']}** x{qty:,}")
         
         embed = discord.Embed(
-            title=f"{emoji} Work Complete!",
-            description=f"You worked as a **{job}** and earned **${amount:,}**!",
+            title=f"🎒 {target.display_name}'s Inventory",
+            description="\n".join(lines) or "No items yet!",
             color=self.purple
         )
+        if lines:
+            embed.set_footer(text=f"Sell value: ${worth:,}")
         
         await ctx.send(embed=embed)
     
@@ -365,20 +1306,54 @@ class Economy(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        user_data = self.get_user(ctx.author.id)
-        wallet = user_data[1]
-        
-        if bet > wallet:
-            embed = discord.Embed(
-                title="❌ Insufficient Funds",
-                description=f"You only have **${wallet:,}** in your wallet!",
-                color=self.purple
-            )
-            await ctx.send(embed=embed)
+        session = await self.open_session(ctx, "slots")
+        if session is None:
             return
         
-        emojis = ["🍒", "🍋", "🍊", "🍇", "💎", "7️⃣"]
-        
+        try:
+            # The bet is held for the whole spin and paid back with the winnings
+            success, wallet = self.debit(ctx.author.id, bet, reason="slots")
+            if not success:
+                embed = discord.Embed(
+                    title="❌ Insufficient Funds",
+                    description=f"You only have **${wallet:,}** in your wallet!",
+                    color=self.purple
+                )
+                await ctx.send(embed=embed)
+                return
+            
+            emojis = ["🍒", "🍋", "🍊", "🍇", "💎", "7️⃣"]
+            results = [random.choice(emojis) for _ in range(3)]
+            
+            # Calculate winnings up front so the payout never depends on the animation finishing
+            if results[0] == results[1] == results[2]:
+                if results[0] == "💎":
+                    multiplier = 10
+                elif results[0] == "7️⃣":
+                    multiplier = 7
+                else:
+                    multiplier = 3
+                winnings = bet * multiplier
+                payout = bet + winnings
+                result_text = f"🎉 **JACKPOT!** You won **${winnings:,}**!"
+            elif results[0] == results[1] or results[1] == results[2] or results[0] == results[2]:
+                payout = bet
+                result_text = f"You got your bet back! **${bet:,}**"
+            else:
+                payout = 0
+                result_text = f"💸 You lost **${bet:,}**"
+            
+            if payout:
+                self.credit(ctx.author.id, payout, reason="slots")
+            
+            try:
+                await asyncio.wait_for(self.animate_slots(ctx, emojis, results, result_text), timeout=GAME_TIMEOUT)
+            except asyncio.TimeoutError:
+                pass
+        finally:
+            self.sessions.close(session)
+    
+    async def animate_slots(self, ctx, emojis, results, result_text):
         # Create initial spinning message
         embed = discord.Embed(
             title="🎰 Slot Machine",
@@ -387,38 +1362,15 @@ class Economy(commands.Cog):
         )
         message = await ctx.send(embed=embed)
         
-        # Animate the slots
-        final_results = [random.choice(emojis) for _ in range(3)]
-        
-        # Animation frames
+        # Animation frames; skipped when the channel is busy
         for i in range(3):
             await asyncio.sleep(0.7)
-            current = [random.choice(emojis) if j > i else final_results[j] for j in range(3)]
+            current = [random.choice(emojis) if j > i else results[j] for j in range(3)]
             embed.description = f"{current[0]} | {current[1]} | {current[2]}\n\n*Spinning...*"
-            await message.edit(embed=embed)
+            await self.sessions.edit(message, embed=embed)
         
         # Final result
         await asyncio.sleep(0.5)
-        results = final_results
-        
-        # Calculate winnings
-        if results[0] == results[1] == results[2]:
-            if results[0] == "💎":
-                multiplier = 10
-            elif results[0] == "7️⃣":
-                multiplier = 7
-            else:
-                multiplier = 3
-            winnings = bet * multiplier
-            self.update_balance(ctx.author.id, winnings)
-            result_text = f"🎉 **JACKPOT!** You won **${winnings:,}**!"
-        elif results[0] == results[1] or results[1] == results[2] or results[0] == results[2]:
-            winnings = bet
-            self.update_balance(ctx.author.id, 0)
-            result_text = f"You got your bet back! **${bet:,}**"
-        else:
-            self.update_balance(ctx.author.id, -bet)
-            result_text = f"💸 You lost **${bet:,}**"
         
         embed = discord.Embed(
             title="🎰 Slot Machine",
@@ -426,7 +1378,7 @@ class Economy(commands.Cog):
             color=self.purple
         )
         
-        await message.edit(embed=embed)
+        await self.sessions.edit(message, final=True, embed=embed)
     
     @commands.command(name="coinflip", aliases=["cf", "flip"])
     async def coinflip(self, ctx, bet: int, choice: str):
@@ -450,18 +1402,6 @@ class Economy(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        user_data = self.get_user(ctx.author.id)
-        wallet = user_data[1]
-        
-        if bet > wallet:
-            embed = discord.Embed(
-                title="❌ Insufficient Funds",
-                description=f"You only have **${wallet:,}** in your wallet!",
-                color=self.purple
-            )
-            await ctx.send(embed=embed)
-            return
-        
         # Normalize choice
         if choice in ["h", "heads"]:
             choice = "heads"
@@ -471,13 +1411,22 @@ class Economy(commands.Cog):
         result = random.choice(["heads", "tails"])
         
         if result == choice:
-            winnings = bet * 2
-            self.update_balance(ctx.author.id, bet)
+            delta = bet
             outcome = f"🎉 **You won!** +**${bet:,}**"
         else:
-            self.update_balance(ctx.author.id, -bet)
+            delta = -bet
             outcome = f"💸 **You lost!** -**${bet:,}**"
         
+        success, wallet = self.settle(ctx.author.id, bet, delta, reason="coinflip")
+        if not success:
+            embed = discord.Embed(
+                title="❌ Insufficient Funds",
+                description=f"You only have **${wallet:,}** in your wallet!",
+                color=self.purple
+            )
+            await ctx.send(embed=embed)
+            return
+        
         embed = discord.Embed(
             title="🪙 Coin Flip",
             description=f"You chose: **{choice}**\nResult: **{result}**\n\n{outcome}",
@@ -507,10 +1456,18 @@ class Economy(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        user_data = self.get_user(ctx.author.id)
-        wallet = user_data[1]
+        result = random.randint(1, 6)
+        
+        if result == guess:
+            winnings = bet * 6
+            delta = winnings - bet
+            outcome = f"🎉 **Perfect guess!** You won **${winnings:,}**!"
+        else:
+            delta = -bet
+            outcome = f"💸 **Wrong guess!** You lost **${bet:,}**"
         
-        if bet > wallet:
+        success, wallet = self.settle(ctx.author.id, bet, delta, reason="dice")
+        if not success:
             embed = discord.Embed(
                 title="❌ Insufficient Funds",
                 description=f"You only have **${wallet:,}** in your wallet!",
@@ -519,16 +1476,6 @@ class Economy(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        result = random.randint(1, 6)
-        
-        if result == guess:
-            winnings = bet * 6
-            self.update_balance(ctx.author.id, winnings - bet)
-            outcome = f"🎉 **Perfect guess!** You won **${winnings:,}**!"
-        else:
-            self.update_balance(ctx.author.id, -bet)
-            outcome = f"💸 **Wrong guess!** You lost **${bet:,}**"
-        
         embed = discord.Embed(
             title="🎲 Dice Roll",
             description=f"You guessed: **{guess}**\nRolled: **{result}**\n\n{outcome}",
@@ -549,96 +1496,204 @@ class Economy(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        user_data = self.get_user(ctx.author.id)
-        wallet = user_data[1]
+        session = await self.open_session(ctx, "blackjack")
+        if session is None:
+            return
         
-        if bet > wallet:
+        try:
+            # Simple blackjack simulation
+            def card_value():
+                return random.randint(1, 11)
+            
+            player_hand = [card_value(), card_value()]
+            dealer_hand = [card_value(), card_value()]
+            
+            player_total = sum(player_hand)
+            dealer_total = sum(dealer_hand)
+            
+            # Dealer draws until 17+
+            while dealer_total < 17:
+                dealer_hand.append(card_value())
+                dealer_total = sum(dealer_hand)
+            
+            # Determine winner
+            if player_total > 21:
+                delta = -bet
+                result = f"💸 **BUST!** You went over 21 and lost **${bet:,}**"
+            elif dealer_total > 21:
+                delta = bet
+                result = f"🎉 **Dealer busts!** You won **${bet:,}**!"
+            elif player_total > dealer_total:
+                delta = bet
+                result = f"🎉 **You win!** You won **${bet:,}**!"
+            elif player_total < dealer_total:
+                delta = -bet
+                result = f"💸 **Dealer wins!** You lost **${bet:,}**"
+            else:
+                delta = 0
+                result = f"🤝 **Push!** It's a tie, you keep your **${bet:,}**"
+            
+            success, wallet = self.settle(ctx.author.id, bet, delta, reason="blackjack")
+            if not success:
+                embed = discord.Embed(
+                    title="❌ Insufficient Funds",
+                    description=f"You only have **${wallet:,}** in your wallet!",
+                    color=self.purple
+                )
+                await ctx.send(embed=embed)
+                return
+            
             embed = discord.Embed(
-                title="❌ Insufficient Funds",
-                description=f"You only have **${wallet:,}** in your wallet!",
+                title="🃏 Blackjack",
+                description=f"**Your hand:** {player_total}\n**Dealer's hand:** {dealer_total}\n\n{result}",
                 color=self.purple
             )
+            
             await ctx.send(embed=embed)
-            return
+        finally:
+            self.sessions.close(session)
+    
+    def top_accounts(self, limit, guild=None):
+        """Return [(user_id, total)] for the richest users, optionally only members of guild
         
-        # Simple blackjack simulation
-        def card_value():
-            return random.randint(1, 11)
+        Stored totals lag behind unsettled interest, so a few extra rows are pulled from
+        the index and reranked by their accrued value.
+        """
+        self.flush_dirty_accounts()
+        candidates = limit * LEADERBOARD_CANDIDATES
         
-        player_hand = [card_value(), card_value()]
-        dealer_hand = [card_value(), card_value()]
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
         
-        player_total = sum(player_hand)
-        dealer_total = sum(dealer_hand)
+        query = "SELECT user_id, balance, bank, bank_updated_at FROM users"
+        if guild is None:
+            c.execute(f"{query} ORDER BY balance + bank DESC LIMIT ?", (candidates,))
+            rows = c.fetchall()
+        elif guild.member_count and guild.member_count <= LEADERBOARD_IN_LIMIT:
+            member_ids = [member.id for member in guild.members]
+            c.execute(
+                f"{query} WHERE user_id IN ({','.join('?' * len(member_ids))}) ORDER BY balance + bank DESC LIMIT ?",
+                (*member_ids, candidates)
+            )
+            rows = c.fetchall()
+        else:
+            # Large guilds: walk the index from the top and keep members until we have enough
+            rows = []
+            c.execute(f"{query} ORDER BY balance + bank DESC")
+            for row in c:
+                if guild.get_member(row[0]) is not None:
+                    rows.append(row)
+                    if len(rows) >= candidates:
+                        break
         
-        # Dealer draws until 17+
-        while dealer_total < 17:
-            dealer_hand.append(card_value())
-            dealer_total = sum(dealer_hand)
+        conn.close()
         
-        # Determine winner
-        if player_total > 21:
-            self.update_balance(ctx.author.id, -bet)
-            result = f"💸 **BUST!** You went over 21 and lost **${bet:,}**"
-        elif dealer_total > 21:
-            winnings = bet * 2
-            self.update_balance(ctx.author.id, bet)
-            result = f"🎉 **Dealer busts!** You won **${bet:,}**!"
-        elif player_total > dealer_total:
-            winnings = bet * 2
-            self.update_balance(ctx.author.id, bet)
-            result = f"🎉 **You win!** You won **${bet:,}**!"
-        elif player_total < dealer_total:
-            self.update_balance(ctx.author.id, -bet)
-            result = f"💸 **Dealer wins!** You lost **${bet:,}**"
-        else:
-            result = f"🤝 **Push!** It's a tie, you keep your **${bet:,}**"
+        now = int(time.time())
+        totals = [
+            (user_id, balance + accrued_bank(bank, bank_updated_at or now, now))
+            for user_id, balance, bank, bank_updated_at in rows
+        ]
+        totals.sort(key=lambda row: row[1], reverse=True)
+        return totals[:limit]
+    
+    def get_rank(self, user_id, guild=None):
+        """Return (rank, total) for a user, globally or among members of guild"""
+        account = self.get_account(user_id)
+        total = account.balance + account.bank
+        self.flush_dirty_accounts()
+        return self.ranks.ahead(total, guild) + 1, total
+    
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        self.ranks.member_joined(member.guild.id, member.id)
+    
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        self.ranks.member_left(member.guild.id, member.id)
+    
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.ranks.guilds.pop(guild.id, None)
+    
+    async def resolve_names(self, user_ids, guild=None):
+        """Map user ids to display names from cache, fetching any misses concurrently"""
+        names = {}
+        missing = []
+        for user_id in user_ids:
+            user = (guild and guild.get_member(user_id)) or self.bot.get_user(user_id)
+            if user is not None:
+                names[user_id] = user.display_name
+            elif user_id in self.fetched_names:
+                names[user_id] = self.fetched_names[user_id]
+            else:
+                missing.append(user_id)
         
-        embed = discord.Embed(
-            title="🃏 Blackjack",
-            description=f"**Your hand:** {player_total}\n**Dealer's hand:** {dealer_total}\n\n{result}",
-            color=self.purple
-        )
+        if missing:
+            results = await asyncio.gather(*(self.bot.fetch_user(user_id) for user_id in missing), return_exceptions=True)
+            for user_id, user in zip(missing, results):
+                if isinstance(user, discord.User):
+                    names[user_id] = self.fetched_names[user_id] = user.display_name
+                else:
+                    names[user_id] = f"Unknown User ({user_id})"
         
-        await ctx.send(embed=embed)
+        return names
     
     @commands.command(name="leaderboard", aliases=["lb", "top"])
-    async def leaderboard(self, ctx):
-        """Display economy leaderboard"""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        c.execute("SELECT user_id, balance + bank as total FROM users ORDER BY total DESC LIMIT 10")
-        top_users = c.fetchall()
-        conn.close()
+    async def leaderboard(self, ctx, scope: str = "global"):
+        """Display economy leaderboard (global or server)"""
+        guild = ctx.guild if scope.lower() in ("server", "guild", "local") else None
+        top_users = self.top_accounts(LEADERBOARD_SIZE, guild)
+        title = f"📊 {guild.name} Leaderboard" if guild else "📊 Economy Leaderboard"
         
         if not top_users:
             embed = discord.Embed(
-                title="📊 Economy Leaderboard",
+                title=title,
                 description="No users found!",
                 color=self.purple
             )
             await ctx.send(embed=embed)
             return
         
+        names = await self.resolve_names([user_id for user_id, _ in top_users], guild)
+        
         description = ""
         for idx, (user_id, total) in enumerate(top_users, 1):
-            user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
             medal = "🥇" if idx == 1 else "🥈" if idx == 2 else "🥉" if idx == 3 else f"`#{idx}`"
-            description += f"{medal} **{user.display_name}** - ${total:,}\n"
+            description += f"{medal} **{names[user_id]}** - ${total:,}\n"
         
+        rank, total = self.get_rank(ctx.author.id, guild)
         embed = discord.Embed(
-            title="📊 Economy Leaderboard",
+            title=title,
             description=description,
             color=self.purple
         )
+        embed.set_footer(text=f"You are #{rank:,} with ${total:,}")
+        
+        await ctx.send(embed=embed)
+    
+    @commands.command(name="rank", aliases=["networth", "nw"])
+    async def rank(self, ctx, member: discord.Member = None):
+        """Show where you (or another user) stand on the leaderboards"""
+        target = member or ctx.author
+        global_rank, total = self.get_rank(target.id)
+        
+        embed = discord.Embed(
+            title=f"📊 {target.display_name}'s Rank",
+            color=self.purple
+        )
+        embed.add_field(name="Net Worth", value=f"${total:,}", inline=True)
+        embed.add_field(name="Global", value=f"#{global_rank:,}", inline=True)
+        if ctx.guild:
+            guild_rank, _ = self.get_rank(target.id, ctx.guild)
+            embed.add_field(name="Server", value=f"#{guild_rank:,}", inline=True)
+        embed.set_thumbnail(url=target.display_avatar.url)
         
         await ctx.send(embed=embed)
     
     # NEW COMMANDS BELOW
     
     @commands.command(name="rob")
-    @commands.cooldown(1, 3600, commands.BucketType.user)
+    @economy_cooldown("rob")
     async def rob(self, ctx, member: discord.Member):
         """Attempt to rob another user (1 hour cooldown)"""
         if member.id == ctx.author.id:
@@ -648,7 +1703,7 @@ class Economy(commands.Cog):
                 color=self.purple
             )
             await ctx.send(embed=embed)
-            ctx.command.reset_cooldown(ctx)
+            self.reset_cooldown(ctx.author.id, "rob")
             return
         
         if member.bot:
@@ -658,11 +1713,10 @@ class Economy(commands.Cog):
                 color=self.purple
             )
             await ctx.send(embed=embed)
-            ctx.command.reset_cooldown(ctx)
+            self.reset_cooldown(ctx.author.id, "rob")
             return
         
-        target_data = self.get_user(member.id)
-        target_wallet = target_data[1]
+        target_wallet = self.get_account(member.id).balance
         
         if target_wallet < 100:
             embed = discord.Embed(
@@ -671,21 +1725,28 @@ class Economy(commands.Cog):
                 color=self.purple
             )
             await ctx.send(embed=embed)
-            ctx.command.reset_cooldown(ctx)
+            self.reset_cooldown(ctx.author.id, "rob")
             return
         
-        user_data = self.get_user(ctx.author.id)
-        user_wallet = user_data[1]
+        guard = self.use_guard(member.id, "rob")
+        if guard is not None:
+            embed = discord.Embed(
+                title=f"{guard['emoji']} Robbery Blocked!",
+                description=f"{member.mention}'s **{guard['name']}** stopped you! It broke in the process.",
+                color=self.purple
+            )
+            await ctx.send(embed=embed)
+            return
         
         # 40% success rate
         success = random.random() < 0.4
         
         if success:
-            # Rob 20-50% of their wallet
+            # Rob 20-50% of their wallet; the transfer fails if they spent it in the meantime
             amount = random.randint(int(target_wallet * 0.2), int(target_wallet * 0.5))
-            self.update_balance(ctx.author.id, amount)
-            self.update_balance(member.id, -amount)
-            
+            success, _ = self.transfer(member.id, ctx.author.id, amount, reason="rob")
+        
+        if success:
             embed = discord.Embed(
                 title="💰 Robbery Successful!",
                 description=f"You successfully robbed **${amount:,}** from {member.mention}!",
@@ -693,9 +1754,7 @@ class Economy(commands.Cog):
             )
         else:
             # Pay 25% of your wallet as fine
-            fine = int(user_wallet * 0.25) if user_wallet > 0 else 0
-            if fine > 0:
-                self.update_balance(ctx.author.id, -fine)
+            fine = self.fine(ctx.author.id, 0.25, reason="rob")
             
             embed = discord.Embed(
                 title="🚔 Robbery Failed!",
@@ -717,7 +1776,7 @@ class Economy(commands.Cog):
             await ctx.send(embed=embed)
     
     @commands.command(name="beg")
-    @commands.cooldown(1, 30, commands.BucketType.user)
+    @economy_cooldown("beg")
     async def beg(self, ctx):
         """Beg for money (30 second cooldown)"""
         responses = [
@@ -731,7 +1790,7 @@ class Economy(commands.Cog):
         # 70% success rate
         if random.random() < 0.7:
             person, amount = random.choice(responses)
-            self.update_balance(ctx.author.id, amount)
+            self.credit(ctx.author.id, amount, reason="beg")
             
             embed = discord.Embed(
                 title="🙏 Begging Successful",
@@ -759,7 +1818,7 @@ class Economy(commands.Cog):
             await ctx.send(embed=embed)
     
     @commands.command(name="crime")
-    @commands.cooldown(1, 600, commands.BucketType.user)
+    @economy_cooldown("crime")
     async def crime(self, ctx):
         """Commit a crime for big rewards (10 minute cooldown)"""
         crimes = [
@@ -775,7 +1834,7 @@ class Economy(commands.Cog):
         # 50% success rate
         if random.random() < 0.5:
             amount = random.randint(min_reward, max_reward)
-            self.update_balance(ctx.author.id, amount)
+            self.credit(ctx.author.id, amount, reason="crime")
             
             embed = discord.Embed(
                 title="😈 Crime Successful!",
@@ -783,12 +1842,7 @@ class Economy(commands.Cog):
                 color=self.purple
             )
         else:
-            user_data = self.get_user(ctx.author.id)
-            user_wallet = user_data[1]
-            fine = int(user_wallet * 0.4) if user_wallet > 0 else 0
-            
-            if fine > 0:
-                self.update_balance(ctx.author.id, -fine)
+            fine = self.fine(ctx.author.id, 0.4, reason="crime")
             
             embed = discord.Embed(
                 title="🚨 Crime Failed!",
@@ -821,38 +1875,32 @@ class Economy(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        user_data = self.get_user(ctx.author.id)
-        wallet = user_data[1]
-        
-        if amount > wallet:
+        # 45% win chance
+        won = random.random() < 0.45
+        success, wallet = self.settle(ctx.author.id, amount, amount if won else -amount, reason="gamble")
+        if not success:
             embed = discord.Embed(
                 title="❌ Insufficient Funds",
                 description=f"You only have **${wallet:,}** in your wallet!",
                 color=self.purple
             )
-            await ctx.send(embed=embed)
-            return
-        
-        # 45% win chance
-        if random.random() < 0.45:
-            self.update_balance(ctx.author.id, amount)
+        elif won:
             embed = discord.Embed(
                 title="🎰 Gamble Won!",
-                description=f"You won **${amount:,}**!\nNew balance: **${wallet + amount:,}**",
+                description=f"You won **${amount:,}**!\nNew balance: **${wallet:,}**",
                 color=self.purple
             )
         else:
-            self.update_balance(ctx.author.id, -amount)
             embed = discord.Embed(
                 title="💸 Gamble Lost!",
-                description=f"You lost **${amount:,}**!\nNew balance: **${wallet - amount:,}**",
+                description=f"You lost **${amount:,}**!\nNew balance: **${wallet:,}**",
                 color=self.purple
             )
         
         await ctx.send(embed=embed)
     
     @commands.command(name="search")
-    @commands.cooldown(1, 45, commands.BucketType.user)
+    @economy_cooldown("search")
     async def search(self, ctx):
         """Search random places for money (45 second cooldown)"""
         places = [
@@ -869,7 +1917,7 @@ class Economy(commands.Cog):
         place, min_amount, max_amount = random.choice(places)
         amount = random.randint(min_amount, max_amount)
         
-        self.update_balance(ctx.author.id, amount)
+        self.credit(ctx.author.id, amount, reason="search")
         
         embed = discord.Embed(
             title="🔍 Search Complete",
@@ -891,7 +1939,7 @@ class Economy(commands.Cog):
             await ctx.send(embed=embed)
     
     @commands.command(name="fish")
-    @commands.cooldown(1, 20, commands. BucketType.user)
+    @economy_cooldown("fish")
     async def fish(self, ctx):
         """Go fishing to earn money (20 second cooldown)"""
         catches = [
@@ -908,7 +1956,7 @@ class Economy(commands.Cog):
         catch, emoji, min_amount, max_amount = random.choice(catches)
         amount = random.randint(min_amount, max_amount)
         
-        self.update_balance(ctx.author.id, amount)
+        self.credit(ctx.author.id, amount, reason="fish")
         
         embed = discord.Embed(
             title="🎣 Fishing Success!",
@@ -930,7 +1978,7 @@ class Economy(commands.Cog):
             await ctx.send(embed=embed)
     
     @commands.command(name="hunt")
-    @commands.cooldown(1, 40, commands.BucketType.user)
+    @economy_cooldown("hunt")
     async def hunt(self, ctx):
         """Go hunting for animals (40 second cooldown)"""
         animals = [
@@ -949,7 +1997,7 @@ class Economy(commands.Cog):
             animal, emoji, min_amount, max_amount = random.choice(animals)
             amount = random.randint(min_amount, max_amount)
             
-            self.update_balance(ctx.author.id, amount)
+            self.credit(ctx.author.id, amount, reason="hunt")
             
             embed = discord.Embed(
                 title="🏹 Successful Hunt!",
@@ -977,7 +2025,7 @@ class Economy(commands.Cog):
             await ctx.send(embed=embed)
     
     @commands.command(name="mine")
-    @commands.cooldown(1, 60, commands.BucketType.user)
+    @economy_cooldown("mine")
     async def mine(self, ctx):
         """Mine for valuable resources (1 minute cooldown)"""
         resources = [
@@ -994,7 +2042,7 @@ class Economy(commands.Cog):
         resource, emoji, min_amount, max_amount = random.choice(resources)
         amount = random.randint(min_amount, max_amount)
         
-        self.update_balance(ctx.author.id, amount)
+        self.credit(ctx.author.id, amount, reason="mine")
         
         embed = discord.Embed(
             title="⛏️ Mining Success!",
@@ -1027,18 +2075,37 @@ class Economy(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        user_data = self.get_user(ctx.author.id)
-        wallet = user_data[1]
-        
-        if bet > wallet:
-            embed = discord.Embed(
-                title="❌ Insufficient Funds",
-                description=f"You only have **${wallet:,}** in your wallet!",
-                color=self.purple
-            )
-            await ctx.send(embed=embed)
+        session = await self.open_session(ctx, "highlow")
+        if session is None:
             return
         
+        try:
+            # The bet is held while waiting for the guess and paid back with any winnings
+            success, wallet = self.debit(ctx.author.id, bet, reason="highlow")
+            if not success:
+                embed = discord.Embed(
+                    title="❌ Insufficient Funds",
+                    description=f"You only have **${wallet:,}** in your wallet!",
+                    color=self.purple
+                )
+                await ctx.send(embed=embed)
+                return
+            
+            payout = bet  # Refunded if the round errors out or is cancelled before it resolves
+            try:
+                payout, message, embed = await asyncio.wait_for(self.play_highlow(ctx, bet), timeout=GAME_TIMEOUT)
+            except asyncio.TimeoutError:
+                return
+            finally:
+                if payout:
+                    self.credit(ctx.author.id, payout, reason="highlow")
+            
+            await self.sessions.edit(message, final=True, embed=embed)
+        finally:
+            self.sessions.close(session)
+    
+    async def play_highlow(self, ctx, bet):
+        """Run a highlow round and return (payout, message, result embed) without touching the wallet"""
         first_num = random.randint(1, 100)
         
         embed = discord.Embed(
@@ -1056,35 +2123,35 @@ class Economy(commands.Cog):
         
         try:
             reaction, user = await self.bot.wait_for("reaction_add", timeout=15.0, check=check)
-            
-            second_num = random.randint(1, 100)
-            user_guess = "higher" if str(reaction.emoji) == "⬆️" else "lower"
-            
-            correct = (user_guess == "higher" and second_num > first_num) or (user_guess == "lower" and second_num < first_num)
-            
-            if second_num == first_num:
-                result_text = f"It's a tie! The number was **{second_num}**\nYou keep your **${bet:,}**"
-            elif correct:
-                self.update_balance(ctx.author.id, bet)
-                result_text = f"✅ Correct! The number was **{second_num}**\nYou won **${bet:,}**!"
-            else:
-                self.update_balance(ctx.author.id, -bet)
-                result_text = f"❌ Wrong! The number was **{second_num}**\nYou lost **${bet:,}**"
-            
-            embed = discord.Embed(
-                title="📊 High or Low - Result",
-                description=f"First number: **{first_num}**\nSecond number: **{second_num}**\n\n{result_text}",
-                color=self.purple
-            )
-            await message.edit(embed=embed)
-            
         except asyncio.TimeoutError:
             embed = discord.Embed(
                 title="⏰ Timeout",
                 description="You took too long to respond!",
                 color=self.purple
             )
-            await message.edit(embed=embed)
+            return bet, message, embed
+        
+        second_num = random.randint(1, 100)
+        user_guess = "higher" if str(reaction.emoji) == "⬆️" else "lower"
+        
+        correct = (user_guess == "higher" and second_num > first_num) or (user_guess == "lower" and second_num < first_num)
+        
+        if second_num == first_num:
+            payout = bet
+            result_text = f"It's a tie! The number was **{second_num}**\nYou keep your **${bet:,}**"
+        elif correct:
+            payout = bet * 2
+            result_text = f"✅ Correct! The number was **{second_num}**\nYou won **${bet:,}**!"
+        else:
+            payout = 0
+            result_text = f"❌ Wrong! The number was **{second_num}**\nYou lost **${bet:,}**"
+        
+        embed = discord.Embed(
+            title="📊 High or Low - Result",
+            description=f"First number: **{first_num}**\nSecond number: **{second_num}**\n\n{result_text}",
+            color=self.purple
+        )
+        return payout, message, embed
 
     @commands.command(name="add", aliases=["addmoney"])
     @commands.is_owner()
@@ -1099,7 +2166,7 @@ class Economy(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        self.update_balance(member.id, amount)
+        self.credit(member.id, amount, reason="add")
         
         embed = discord.Embed(
             title="💰 Money Added",
@@ -1123,12 +2190,8 @@ class Economy(commands.Cog):
     @commands.is_owner()
     async def reset_balance(self, ctx, member: discord.Member):
         """Reset a user's wallet and bank to 0"""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        c.execute("UPDATE users SET balance = 0, bank = 0 WHERE user_id = ?", (member.id,))
-        conn.commit()
-        conn.close()
+        account = self.get_account(member.id)
+        self.apply(member.id, -account.balance, -account.bank, "reset")
         
         embed = discord.Embed(
             title="🔄 Balance Reset",
@@ -1147,6 +2210,72 @@ class Economy(commands.Cog):
                 color=self.purple
             )
             await ctx.send(embed=embed)
+    
+    @commands.command(name="ledger", aliases=["transactions", "history"])
+    @commands.is_owner()
+    async def ledger(self, ctx, user: discord.User, before: int = None):
+        """Show a user's transaction history, newest first (pass the last id shown to page back)"""
+        rows = self.get_ledger_page(user.id, before)
+        
+        if not rows:
+            embed = discord.Embed(
+                title=f"📒 {user.display_name}'s Ledger",
+                description="No transactions found!",
+                color=self.purple
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        lines = []
+        for entry_id, wallet_delta, bank_delta, reason, counterparty, created_at in rows:
+            changes = []
+            if wallet_delta:
+                changes.append(f"wallet {wallet_delta:+,}")
+            if bank_delta:
+                changes.append(f"bank {bank_delta:+,}")
+            line = f"`#{entry_id}` <t:{created_at}:R> **{reason}** {', '.join(changes) or 'no change'}"
+            if counterparty:
+                line += f" (<@{counterparty}>)"
+            lines.append(line)
+        
+        embed = discord.Embed(
+            title=f"📒 {user.display_name}'s Ledger",
+            description="\n".join(lines),
+            color=self.purple
+        )
+        if len(rows) == LEDGER_PAGE_SIZE:
+            embed.set_footer(text=f"Older: {ctx.clean_prefix}ledger {user.id} {rows[-1][0]}")
+        
+        await ctx.send(embed=embed)
+    
+    @commands.command(name="audit")
+    @commands.is_owner()
+    async def audit(self, ctx, user: discord.User):
+        """Compare a user's balance against the one replayed from the ledger"""
+        account = self.get_account(user.id)
+        wallet, bank = self.replay_balance(user.id)
+        matches = wallet == account.balance and bank == account.bank
+        
+        embed = discord.Embed(
+            title=f"🔎 {user.display_name}'s Audit",
+            description="✅ Balance matches the ledger" if matches else "⚠️ Balance does not match the ledger",
+            color=self.purple
+        )
+        embed.add_field(name="Current", value=f"Wallet: ${account.balance:,}\nBank: ${account.bank:,}", inline=True)
+        embed.add_field(name="Replayed", value=f"Wallet: ${wallet:,}\nBank: ${bank:,}", inline=True)
+        
+        await ctx.send(embed=embed)
+    
+    @ledger.error
+    @audit.error
+    async def ledger_error(self, ctx, error):
+        if isinstance(error, commands.NotOwner):
+            embed = discord.Embed(
+                title="❌ Permission Denied",
+                description="Only the bot owner can use this command!",
+                color=self.purple
+            )
+            await ctx.send(embed=embed)
             
 async def setup(bot):
     await bot.add_cog(Economy(bot))
\ No newline at end of file
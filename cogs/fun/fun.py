@@ -1,14 +1,118 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 import sqlite3
-from datetime import datetime
+from datetime import date, datetime, timedelta, time as dt_time, timezone as dt_timezone
 from typing import Union, Optional
 import pytz
-import aiohttp
 import random
 import json
 import re
+import asyncio
+import aiohttp
+import time
+from collections import deque, OrderedDict
+from functools import lru_cache
+from bisect import bisect_left
+
+GIF_BATCH_SIZE = 20  # nekos.best returns up to 20 results per request
+GIF_LOW_WATER = 5
+GIF_RECENT = 40  # Recently served URLs skipped when refilling
+GIF_ENDPOINTS = (
+    "hug", "kiss", "pat", "laugh", "happy", "slap", "punch", "poke", "tickle", "bite",
+    "cuddle", "feed", "wave", "cry", "dance", "sleep", "blush", "smug", "wink", "bored",
+    "yawn", "nod", "nope", "stare", "handhold", "highfive", "nom", "pout", "shrug", "thumbsup"
+)
+
+AUTOCOMPLETE_LIMIT = 25  # Discord's cap on autocomplete choices
+TIMEZONE_LIST_MEMBERS = 8  # Members shown per zone in "timezone list"
+
+
+@lru_cache(maxsize=None)
+def get_zone(name):
+    """pytz zone for a name, resolved once per name; raises UnknownTimeZoneError"""
+    return pytz.timezone(name)
+
+
+def build_zone_index():
+    """Sorted (key, zone) pairs so autocomplete can bisect to a prefix
+
+    Every zone is keyed by its full name and by each path part, so "tok", "asia/t"
+    and "new y" all find their zone.
+    """
+    index = set()
+    for name in pytz.common_timezones:
+        lowered = name.lower()
+        index.add((lowered, name))
+        for part in lowered.split("/")[1:]:
+            index.add((part, name))
+            index.add((part.replace("_", " "), name))
+    return sorted(index)
+
+
+ZONE_INDEX = build_zone_index()
+
+
+def search_zones(query, limit=AUTOCOMPLETE_LIMIT):
+    query = query.strip().lower()
+    matches = []
+    position = bisect_left(ZONE_INDEX, (query, ""))
+    while position < len(ZONE_INDEX) and len(matches) < limit:
+        key, name = ZONE_INDEX[position]
+        if not key.startswith(query):
+            break
+        if name not in matches:
+            matches.append(name)
+        position += 1
+    return matches
+
+
+BIRTHDAY_MENTIONS_PER_MESSAGE = 20
+BIRTHDAY_ROLE_BATCH = 10  # Role edits sent concurrently per batch
+BIRTHDAY_MAX_SLEEP = 3600  # Re-check at least hourly so DST and clock changes settle
+BIRTHDAY_CATCHUP_DAYS = 7  # Missed dates replayed after downtime; older ones are skipped
+
+
+def birthday_days(date):
+    """(month, days) to look up for a date; Feb 29 birthdays are celebrated on Feb 28 in common years"""
+    if date.month == 2 and date.day == 28 and not is_leap_year(date.year):
+        return 2, (28, 29)
+    return date.month, (date.day,)
+
+
+def is_leap_year(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def next_birthday(month, day, now):
+    """Next occurrence of month/day on or after now's date"""
+    for year in (now.year, now.year + 1):
+        actual_day = 28 if (month, day) == (2, 29) and not is_leap_year(year) else day
+        candidate = datetime(year, month, actual_day, tzinfo=now.tzinfo)
+        if candidate.date() >= now.date():
+            return candidate
+
+
+def next_midnight(zone, now):
+    """Next local midnight in a pytz zone, as an aware UTC datetime"""
+    tomorrow = now.astimezone(zone).date() + timedelta(days=1)
+    return zone.localize(datetime.combine(tomorrow, dt_time())).astimezone(dt_timezone.utc)
+
+
+ROBLOX_ID_TTL = 3600  # Usernames rarely change hands
+ROBLOX_PROFILE_TTL = 300
+ROBLOX_CACHE_SIZE = 1000
+
+INTERACTION_FLUSH_INTERVAL = 30
+INTERACTION_CACHE_SIZE = 50000
+TOP_PAIRS_SIZE = 10
+# Roleplay actions that have a target, with the verb used in "X has hugged Y 3 times"
+INTERACTION_VERBS = {
+    "hug": "hugged", "kiss": "kissed", "fuck": "fucked", "pat": "patted", "slap": "slapped",
+    "punch": "punched", "poke": "poked", "tickle": "tickled", "bite": "bitten", "cuddle": "cuddled",
+    "feed": "fed", "wave": "waved at", "wink": "winked at", "stare": "stared at",
+    "handhold": "held hands with", "highfive": "high fived"
+}
 
 class TicTacToeButton(discord.ui.Button):
     def __init__(self, x: int, y: int):
@@ -128,8 +232,21 @@ class Fun(commands.Cog):
         self.bot = bot
         self.timezone_db = "data/timezones.db"
         self.bday_db = "data/bday.db"
+        self.interactions_db = "data/interactions.db"
         self.api_base = "https://nekos.best/api/v2/"
+        self.gif_buffers = {}
+        self.recent_gifs = {}
+        self.gif_refills = {}
+        self.interaction_counts = OrderedDict()  # Persisted counts, LRU
+        self.pending_interactions = {}  # Increments not yet flushed
         self.init_databases()
+        self.user_timezones = self.load_timezones()
+        self.birthday_settings = self.load_birthday_settings()
+        self.birthday_wakeup = asyncio.Event()
+        self.birthday_task = None
+        self.roblox_ids = OrderedDict()  # username -> (expires, user ID), LRU
+        self.roblox_profiles = OrderedDict()  # user ID -> (expires, profile), LRU
+        self.lookups_in_flight = {}
         self.color = 0xa6afe7
         self.eightball_responses = [
             # Positive responses
@@ -152,17 +269,63 @@ class Fun(commands.Cog):
         # Dice emojis
         self.dice_emojis = ["⚀", "⚁", "⚂", "⚃", "⚄", "⚅"]
     
+    async def cog_load(self):
+        # Warm every roleplay buffer in the background so the first uses are instant too
+        for endpoint in GIF_ENDPOINTS:
+            self.refill_gifs(endpoint)
+        self.flush_interactions.start()
+        self.birthday_task = asyncio.create_task(self.birthday_scheduler())
+
+    async def cog_unload(self):
+        for task in self.gif_refills.values():
+            task.cancel()
+        if self.birthday_task:
+            self.birthday_task.cancel()
+        self.flush_interactions.cancel()
+        self.flush_pending_interactions()
+
     async def get_gif(self, endpoint: str):
-        """Fetch a GIF from nekos.best API"""
+        """Serve a GIF for a nekos.best endpoint from the prefetch buffer
+
+        Falls back to waiting on a live fetch only when the buffer is empty.
+        """
+        buffer = self.gif_buffers.setdefault(endpoint, deque())
+        if len(buffer) <= GIF_LOW_WATER:
+            refill = self.refill_gifs(endpoint)
+            if not buffer:
+                await asyncio.shield(refill)
+
+        if not buffer:
+            # A burst drained the refill too; a repeat beats failing the command
+            recent = self.recent_gifs.get(endpoint)
+            return random.choice(recent) if recent else None
+
+        url = buffer.popleft()
+        self.recent_gifs.setdefault(endpoint, deque(maxlen=GIF_RECENT)).append(url)
+        return url
+
+    def refill_gifs(self, endpoint):
+        """Start (or join) the background fetch topping up an endpoint's buffer"""
+        task = self.gif_refills.get(endpoint)
+        if task is None or task.done():
+            task = self.gif_refills[endpoint] = asyncio.create_task(self.fetch_gifs(endpoint))
+        return task
+
+    async def fetch_gifs(self, endpoint):
+        data = await self.bot.http_pool.get_json(
+            f"{self.api_base}{endpoint}",
+            params={"amount": GIF_BATCH_SIZE}
+        )
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.api_base}{endpoint}") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data['results'][0]['url']
-        except:
-            pass
-        return None
+            urls = [result['url'] for result in data['results']]
+        except (TypeError, KeyError):
+            return
+
+        buffer = self.gif_buffers.setdefault(endpoint, deque())
+        recent = self.recent_gifs.get(endpoint, ())
+        fresh = [url for url in dict.fromkeys(urls) if url not in recent and url not in buffer]
+        # Endpoints with only a handful of GIFs would never refill if repeats were dropped
+        buffer.extend(fresh or urls)
 
     def init_databases(self):
         """Initialize the SQLite databases"""
@@ -187,22 +350,263 @@ class Fun(commands.Cog):
                 birthday TEXT NOT NULL
             )
         ''')
+        # Normalized date parts so the scheduler can look up a day with one indexed query
+        cursor.execute('PRAGMA table_info(birthdays)')
+        if 'month' not in [column[1] for column in cursor.fetchall()]:
+            cursor.execute('ALTER TABLE birthdays ADD COLUMN month INTEGER')
+            cursor.execute('ALTER TABLE birthdays ADD COLUMN day INTEGER')
+            cursor.execute('ALTER TABLE birthdays ADD COLUMN year INTEGER')
+            cursor.execute('SELECT discord_id, birthday FROM birthdays')
+            migrated = []
+            for discord_id, birthday in cursor.fetchall():
+                parts = [int(part) for part in birthday.split('/')]
+                migrated.append((parts[0], parts[1], parts[2] if len(parts) == 3 else None, discord_id))
+            cursor.executemany('UPDATE birthdays SET month = ?, day = ?, year = ? WHERE discord_id = ?', migrated)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_birthdays_month_day ON birthdays (month, day)')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS birthday_settings (
+                guild_id INTEGER PRIMARY KEY,
+                channel_id INTEGER,
+                role_id INTEGER,
+                timezone TEXT NOT NULL DEFAULT 'UTC',
+                last_run TEXT
+            )
+        ''')
+        # Birthday roles handed out, removed again at the guild's next midnight
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS birthday_roles (
+                guild_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                role_id INTEGER NOT NULL,
+                expires_at INTEGER NOT NULL,
+                PRIMARY KEY (guild_id, user_id)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_birthday_roles_expires ON birthday_roles (expires_at)')
+        conn.commit()
+        conn.close()
+
+        # Roleplay interaction counters
+        conn = sqlite3.connect(self.interactions_db)
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS interactions (
+                guild_id INTEGER NOT NULL,
+                actor_id INTEGER NOT NULL,
+                target_id INTEGER NOT NULL,
+                action TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (guild_id, actor_id, target_id, action)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_interactions_top
+            ON interactions (guild_id, action, count DESC)
+        ''')
         conn.commit()
         conn.close()
     
+    # ===== ROBLOX LOOKUP FUNCTIONS =====
+
+    async def single_flight(self, key, fetch):
+        """Run fetch() once per key at a time; concurrent callers share its result"""
+        task = self.lookups_in_flight.get(key)
+        if task is None:
+            task = self.lookups_in_flight[key] = asyncio.create_task(fetch())
+            task.add_done_callback(lambda _: self.lookups_in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def get_cached(self, cache, key):
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del cache[key]
+            return None
+        cache.move_to_end(key)
+        return entry[1]
+
+    def set_cached(self, cache, key, value, ttl):
+        cache[key] = (time.monotonic() + ttl, value)
+        cache.move_to_end(key)
+        if len(cache) > ROBLOX_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    async def get_roblox_id(self, username):
+        """User ID for a username, None if it doesn't exist, False if Roblox didn't answer"""
+        key = username.lower()
+        user_id = self.get_cached(self.roblox_ids, key)
+        if user_id is not None:
+            return user_id
+
+        try:
+            async with self.bot.http_pool.post(
+                "https://users.roblox.com/v1/usernames/users",
+                json={"usernames": [username], "excludeBannedUsers": False}
+            ) as response:
+                if response.status != 200:
+                    return False
+                data = await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return False
+
+        if not data.get('data'):
+            return None
+
+        user_id = data['data'][0]['id']
+        self.set_cached(self.roblox_ids, key, user_id, ROBLOX_ID_TTL)
+        return user_id
+
+    async def get_roblox_user(self, user_id):
+        """Users API record, None if the user doesn't exist, False if Roblox didn't answer"""
+        try:
+            async with self.bot.http_pool.get(f"https://users.roblox.com/v1/users/{user_id}") as response:
+                if response.status == 404:
+                    return None
+                if response.status != 200:
+                    return False
+                return await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            return False
+
+    async def get_roblox_profile(self, user_id):
+        """Profile, avatar and social counts fetched concurrently
+        
+        None if the user doesn't exist, False if Roblox didn't answer. Profiles missing
+        any part are returned but not cached, so the next lookup retries them.
+        """
+        profile = self.get_cached(self.roblox_profiles, user_id)
+        if profile is not None:
+            return profile
+
+        http = self.bot.http_pool
+        user_data, thumbnail_data, friends_data, followers_data, following_data = await asyncio.gather(
+            self.get_roblox_user(user_id),
+            http.get_json(f"https://thumbnails.roblox.com/v1/users/avatar-headshot?userIds={user_id}&size=150x150&format=Png"),
+            http.get_json(f"https://friends.roblox.com/v1/users/{user_id}/friends/count"),
+            http.get_json(f"https://friends.roblox.com/v1/users/{user_id}/followers/count"),
+            http.get_json(f"https://friends.roblox.com/v1/users/{user_id}/followings/count")
+        )
+        if not user_data:
+            return user_data
+
+        profile = {
+            'username': user_data.get('name'),
+            'display_name': user_data.get('displayName'),
+            'description': user_data.get('description', 'No description'),
+            'created': user_data.get('created'),
+            'avatar_url': thumbnail_data['data'][0]['imageUrl'] if thumbnail_data and thumbnail_data.get('data') else None,
+            'friends': (friends_data or {}).get('count', 0),
+            'followers': (followers_data or {}).get('count', 0),
+            'following': (following_data or {}).get('count', 0)
+        }
+        if None not in (thumbnail_data, friends_data, followers_data, following_data):
+            self.set_cached(self.roblox_profiles, user_id, profile, ROBLOX_PROFILE_TTL)
+        return profile
+
+    # ===== INTERACTION COUNTER FUNCTIONS =====
+
+    def get_interaction_count(self, key):
+        """Persisted count for (guild, actor, target, action) plus unflushed increments"""
+        count = self.interaction_counts.get(key)
+        if count is None:
+            conn = sqlite3.connect(self.interactions_db)
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT count FROM interactions WHERE guild_id = ? AND actor_id = ? AND target_id = ? AND action = ?',
+                key
+            )
+            result = cursor.fetchone()
+            conn.close()
+            count = result[0] if result else 0
+            self.interaction_counts[key] = count
+            if len(self.interaction_counts) > INTERACTION_CACHE_SIZE:
+                self.interaction_counts.popitem(last=False)
+        else:
+            self.interaction_counts.move_to_end(key)
+        return count + self.pending_interactions.get(key, 0)
+
+    def record_interaction(self, ctx, embed, user, action):
+        """Count a roleplay action and show the running total in the embed footer"""
+        key = (ctx.guild.id if ctx.guild else 0, ctx.author.id, user.id, action)
+        self.pending_interactions[key] = self.pending_interactions.get(key, 0) + 1
+        count = self.get_interaction_count(key)
+        embed.set_footer(
+            text=f"{ctx.author.display_name} has {INTERACTION_VERBS[action]} {user.display_name} "
+                 f"{count:,} time{'s' if count != 1 else ''}"
+        )
+
+    def flush_pending_interactions(self):
+        """Write all pending increments in one batched upsert"""
+        if not self.pending_interactions:
+            return
+
+        pending, self.pending_interactions = self.pending_interactions, {}
+        try:
+            conn = sqlite3.connect(self.interactions_db)
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT INTO interactions (guild_id, actor_id, target_id, action, count)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (guild_id, actor_id, target_id, action)
+                DO UPDATE SET count = count + excluded.count
+            ''', [(*key, delta) for key, delta in pending.items()])
+            conn.commit()
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"Error flushing interaction counters: {e}")
+            # Keep the increments for the next flush instead of losing them
+            for key, delta in pending.items():
+                self.pending_interactions[key] = self.pending_interactions.get(key, 0) + delta
+            return
+
+        for key, delta in pending.items():
+            if key in self.interaction_counts:
+                self.interaction_counts[key] += delta
+
+    @tasks.loop(seconds=INTERACTION_FLUSH_INTERVAL)
+    async def flush_interactions(self):
+        self.flush_pending_interactions()
+
+    def get_top_pairs(self, guild_id, action=None, limit=TOP_PAIRS_SIZE):
+        """Most frequent (actor, target, count) pairs in a guild, for one action or all of them"""
+        self.flush_pending_interactions()
+        conn = sqlite3.connect(self.interactions_db)
+        cursor = conn.cursor()
+        if action:
+            cursor.execute('''
+                SELECT actor_id, target_id, count FROM interactions
+                WHERE guild_id = ? AND action = ?
+                ORDER BY count DESC LIMIT ?
+            ''', (guild_id, action, limit))
+        else:
+            cursor.execute('''
+                SELECT actor_id, target_id, SUM(count) AS total FROM interactions
+                WHERE guild_id = ?
+                GROUP BY actor_id, target_id
+                ORDER BY total DESC LIMIT ?
+            ''', (guild_id, limit))
+        results = cursor.fetchall()
+        conn.close()
+        return results
+
     # ===== TIMEZONE HELPER FUNCTIONS =====
     
-    def get_user_timezone(self, discord_id):
-        """Get user's timezone from database"""
+    def load_timezones(self):
+        """Load every user's timezone; reads are then served from memory"""
         conn = sqlite3.connect(self.timezone_db)
         cursor = conn.cursor()
-        cursor.execute('SELECT timezone FROM timezones WHERE discord_id = ?', (discord_id,))
-        result = cursor.fetchone()
+        cursor.execute('SELECT discord_id, timezone FROM timezones')
+        results = dict(cursor.fetchall())
         conn.close()
-        return result[0] if result else None
+        return results
+
+    def get_user_timezone(self, discord_id):
+        """Get user's timezone"""
+        return self.user_timezones.get(discord_id)
     
     def set_user_timezone(self, discord_id, timezone):
-        """Set user's timezone in database"""
+        """Set user's timezone in database and cache"""
         conn = sqlite3.connect(self.timezone_db)
         cursor = conn.cursor()
         cursor.execute('''
@@ -211,26 +615,221 @@ class Fun(commands.Cog):
         ''', (discord_id, timezone))
         conn.commit()
         conn.close()
+        self.user_timezones[discord_id] = timezone
+
+    def remove_user_timezone(self, discord_id):
+        """Remove user's timezone from database and cache"""
+        conn = sqlite3.connect(self.timezone_db)
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM timezones WHERE discord_id = ?', (discord_id,))
+        conn.commit()
+        conn.close()
+        self.user_timezones.pop(discord_id, None)
     
     # ===== BIRTHDAY HELPER FUNCTIONS =====
     
     def get_user_birthday(self, discord_id):
-        """Get user's birthday from database"""
+        """Get user's birthday from database as (month, day, year or None)"""
         conn = sqlite3.connect(self.bday_db)
         cursor = conn.cursor()
-        cursor.execute('SELECT birthday FROM birthdays WHERE discord_id = ?', (discord_id,))
+        cursor.execute('SELECT month, day, year FROM birthdays WHERE discord_id = ?', (discord_id,))
         result = cursor.fetchone()
         conn.close()
-        return result[0] if result else None
+        return result
     
-    def set_user_birthday(self, discord_id, birthday):
+    def set_user_birthday(self, discord_id, month, day, year=None):
         """Set user's birthday in database"""
+        birthday = f"{month:02d}/{day:02d}" + (f"/{year}" if year else "")
         conn = sqlite3.connect(self.bday_db)
         cursor = conn.cursor()
         cursor.execute('''
-            INSERT OR REPLACE INTO birthdays (discord_id, birthday)
-            VALUES (?, ?)
-        ''', (discord_id, birthday))
+            INSERT OR REPLACE INTO birthdays (discord_id, birthday, month, day, year)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (discord_id, birthday, month, day, year))
+        conn.commit()
+        conn.close()
+
+    def get_birthdays_on(self, date):
+        """IDs of everyone whose birthday falls on a date"""
+        month, days = birthday_days(date)
+        conn = sqlite3.connect(self.bday_db)
+        cursor = conn.cursor()
+        cursor.execute(
+            f'SELECT discord_id FROM birthdays WHERE month = ? AND day IN ({", ".join("?" * len(days))})',
+            (month, *days)
+        )
+        results = [row[0] for row in cursor.fetchall()]
+        conn.close()
+        return results
+
+    def load_birthday_settings(self):
+        conn = sqlite3.connect(self.bday_db)
+        cursor = conn.cursor()
+        cursor.execute('SELECT guild_id, channel_id, role_id, timezone, last_run FROM birthday_settings')
+        results = {
+            guild_id: {'channel_id': channel_id, 'role_id': role_id, 'timezone': timezone, 'last_run': last_run}
+            for guild_id, channel_id, role_id, timezone, last_run in cursor.fetchall()
+        }
+        conn.close()
+        return results
+
+    def update_birthday_settings(self, guild_id, **fields):
+        """Change a guild's birthday settings and wake the scheduler to pick them up"""
+        settings = self.birthday_settings.setdefault(
+            guild_id, {'channel_id': None, 'role_id': None, 'timezone': 'UTC', 'last_run': None}
+        )
+        settings.update(fields)
+        conn = sqlite3.connect(self.bday_db)
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO birthday_settings (guild_id, channel_id, role_id, timezone, last_run)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (guild_id) DO UPDATE SET
+                channel_id = excluded.channel_id, role_id = excluded.role_id,
+                timezone = excluded.timezone, last_run = excluded.last_run
+        ''', (guild_id, settings['channel_id'], settings['role_id'], settings['timezone'], settings['last_run']))
+        conn.commit()
+        conn.close()
+        self.birthday_wakeup.set()
+
+    # ===== BIRTHDAY SCHEDULER =====
+
+    async def birthday_scheduler(self):
+        """Sleep until the next guild's local midnight (or role expiry), then announce"""
+        await self.bot.wait_until_ready()
+        while True:
+            self.birthday_wakeup.clear()
+            try:
+                await self.run_due_birthdays()
+                await self.expire_birthday_roles()
+            except Exception as e:
+                print(f"Error in birthday scheduler: {e}")
+
+            try:
+                await asyncio.wait_for(self.birthday_wakeup.wait(), timeout=self.seconds_until_birthday_event())
+            except asyncio.TimeoutError:
+                pass
+
+    def seconds_until_birthday_event(self):
+        now = datetime.now(dt_timezone.utc)
+        wake_at = now.timestamp() + BIRTHDAY_MAX_SLEEP
+
+        for settings in self.birthday_settings.values():
+            if settings['channel_id'] or settings['role_id']:
+                wake_at = min(wake_at, next_midnight(get_zone(settings['timezone']), now).timestamp())
+
+        conn = sqlite3.connect(self.bday_db)
+        cursor = conn.cursor()
+        cursor.execute('SELECT MIN(expires_at) FROM birthday_roles')
+        next_expiry = cursor.fetchone()[0]
+        conn.close()
+        if next_expiry is not None:
+            wake_at = min(wake_at, next_expiry)
+
+        return max(1, wake_at - now.timestamp())
+
+    async def run_due_birthdays(self):
+        """Celebrate in every guild whose local date has moved past its last run
+        
+        Dates missed while the bot was down (up to BIRTHDAY_CATCHUP_DAYS) are celebrated
+        together with today's; everyone's role expires at the coming local midnight.
+        """
+        now = datetime.now(dt_timezone.utc)
+        birthdays = {}  # One indexed query per distinct local date, shared across guilds
+
+        for guild_id, settings in list(self.birthday_settings.items()):
+            if not (settings['channel_id'] or settings['role_id']):
+                continue
+            guild = self.bot.get_guild(guild_id)
+            if guild is None:
+                continue
+
+            zone = get_zone(settings['timezone'])
+            local_date = now.astimezone(zone).date()
+            if settings['last_run'] and settings['last_run'] >= local_date.isoformat():
+                continue
+
+            first_date = local_date
+            if settings['last_run']:
+                first_date = max(
+                    date.fromisoformat(settings['last_run']) + timedelta(days=1),
+                    local_date - timedelta(days=BIRTHDAY_CATCHUP_DAYS - 1)
+                )
+
+            member_ids = []
+            day = first_date
+            while day <= local_date:
+                if day not in birthdays:
+                    birthdays[day] = self.get_birthdays_on(day)
+                member_ids.extend(birthdays[day])
+                day += timedelta(days=1)
+            members = [member for member in map(guild.get_member, dict.fromkeys(member_ids)) if member]
+            if members:
+                await self.celebrate_birthdays(guild, settings, members, next_midnight(zone, now))
+
+            self.update_birthday_settings(guild_id, last_run=local_date.isoformat())
+
+    async def celebrate_birthdays(self, guild, settings, members, expires):
+        channel = guild.get_channel(settings['channel_id']) if settings['channel_id'] else None
+        if channel:
+            for start in range(0, len(members), BIRTHDAY_MENTIONS_PER_MESSAGE):
+                batch = members[start:start + BIRTHDAY_MENTIONS_PER_MESSAGE]
+                embed = discord.Embed(
+                    title="🎂 Happy Birthday!",
+                    description=f"Happy birthday to {', '.join(member.mention for member in batch)}! 🎉",
+                    color=discord.Color.from_str("#a6afe7")
+                )
+                try:
+                    await channel.send(
+                        content=" ".join(member.mention for member in batch),
+                        embed=embed,
+                        allowed_mentions=discord.AllowedMentions(users=True)
+                    )
+                except discord.HTTPException:
+                    break
+
+        role = guild.get_role(settings['role_id']) if settings['role_id'] else None
+        if role:
+            for start in range(0, len(members), BIRTHDAY_ROLE_BATCH):
+                batch = members[start:start + BIRTHDAY_ROLE_BATCH]
+                await asyncio.gather(
+                    *(member.add_roles(role, reason="Birthday") for member in batch),
+                    return_exceptions=True
+                )
+
+            conn = sqlite3.connect(self.bday_db)
+            cursor = conn.cursor()
+            cursor.executemany(
+                'INSERT OR REPLACE INTO birthday_roles (guild_id, user_id, role_id, expires_at) VALUES (?, ?, ?, ?)',
+                [(guild.id, member.id, role.id, int(expires.timestamp())) for member in members]
+            )
+            conn.commit()
+            conn.close()
+
+    async def expire_birthday_roles(self):
+        now = int(datetime.now(dt_timezone.utc).timestamp())
+        conn = sqlite3.connect(self.bday_db)
+        cursor = conn.cursor()
+        cursor.execute('SELECT guild_id, user_id, role_id FROM birthday_roles WHERE expires_at <= ?', (now,))
+        expired = cursor.fetchall()
+        conn.close()
+        if not expired:
+            return
+
+        removals = []
+        for guild_id, user_id, role_id in expired:
+            guild = self.bot.get_guild(guild_id)
+            member = guild.get_member(user_id) if guild else None
+            role = guild.get_role(role_id) if guild else None
+            if member and role and role in member.roles:
+                removals.append(member.remove_roles(role, reason="Birthday is over"))
+
+        for start in range(0, len(removals), BIRTHDAY_ROLE_BATCH):
+            await asyncio.gather(*removals[start:start + BIRTHDAY_ROLE_BATCH], return_exceptions=True)
+
+        conn = sqlite3.connect(self.bday_db)
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM birthday_roles WHERE expires_at <= ?', (now,))
         conn.commit()
         conn.close()
     
@@ -257,7 +856,7 @@ class Fun(commands.Cog):
             return await ctx.send(embed=embed)
         
         try:
-            tz = pytz.timezone(user_tz)
+            tz = get_zone(user_tz)
             current_time = datetime.now(tz).strftime("%B %d, %I:%M %p")
             
             if target_user == ctx.author:
@@ -282,8 +881,9 @@ class Fun(commands.Cog):
         """Set your timezone (e.g. America/New_York, Europe/London, Asia/Tokyo)"""
         
         try:
-            # Validate timezone
-            tz = pytz.timezone(timezone)
+            # Validate timezone, storing the canonical name so members group by zone
+            tz = get_zone(timezone)
+            timezone = tz.zone
             self.set_user_timezone(ctx.author.id, timezone)
             
             current_time = datetime.now(tz).strftime("%I:%M %p")
@@ -313,17 +913,97 @@ class Fun(commands.Cog):
             )
             return await ctx.send(embed=embed)
         
-        conn = sqlite3.connect(self.timezone_db)
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM timezones WHERE discord_id = ?', (ctx.author.id,))
-        conn.commit()
-        conn.close()
+        self.remove_user_timezone(ctx.author.id)
         
         embed = discord.Embed(
             description="✅ Your timezone has been removed",
             color=discord.Color.from_str("#a6afe7")
         )
         await ctx.send(embed=embed)
+
+    @timezone.command(name="list", aliases=["all", "board"])
+    @commands.guild_only()
+    async def timezone_list(self, ctx):
+        """Show the current time of every member with a timezone set"""
+        
+        # Walk whichever side is smaller: the registrations or the member list
+        if len(self.user_timezones) < ctx.guild.member_count:
+            registered = ((ctx.guild.get_member(uid), zone) for uid, zone in self.user_timezones.items())
+        else:
+            registered = ((member, self.user_timezones.get(member.id)) for member in ctx.guild.members)
+        
+        zones = {}
+        for member, zone in registered:
+            if member is not None and zone is not None:
+                zones.setdefault(zone, []).append(member)
+        
+        if not zones:
+            embed = discord.Embed(
+                description=f"❌ Nobody here has set their timezone! Use `{ctx.prefix}timezone set <timezone>`",
+                color=discord.Color.from_str("#a6afe7")
+            )
+            return await ctx.send(embed=embed)
+        
+        # One conversion per zone, not per member
+        now = datetime.now(dt_timezone.utc)
+        board = []
+        for zone, members in zones.items():
+            try:
+                local = now.astimezone(get_zone(zone))
+            except pytz.exceptions.UnknownTimeZoneError:
+                continue
+            board.append((local.utcoffset(), local, zone, members))
+        board.sort(key=lambda entry: entry[0])
+        
+        lines = []
+        for _, local, zone, members in board:
+            shown = ", ".join(member.mention for member in members[:TIMEZONE_LIST_MEMBERS])
+            if len(members) > TIMEZONE_LIST_MEMBERS:
+                shown += f" +{len(members) - TIMEZONE_LIST_MEMBERS} more"
+            lines.append(f"**{local.strftime('%I:%M %p')}** `{zone}` {shown}")
+        
+        description = ""
+        for index, line in enumerate(lines):
+            if len(description) + len(line) > 4000:
+                description += f"*+{len(lines) - index} more zones*"
+                break
+            description += line + "\n"
+        
+        embed = discord.Embed(
+            title=f"⏰ Times in {ctx.guild.name}",
+            description=description,
+            color=discord.Color.from_str("#a6afe7")
+        )
+        embed.set_footer(text=f"{sum(len(members) for members in zones.values())} member(s) across {len(zones)} timezone(s)")
+        await ctx.send(embed=embed)
+
+    @app_commands.command(name="settimezone", description="Set your timezone")
+    @app_commands.describe(timezone="Your timezone, e.g. America/New_York")
+    async def timezone_set_slash(self, interaction: discord.Interaction, timezone: str):
+        """Set your timezone (slash command)"""
+        
+        try:
+            tz = get_zone(timezone)
+        except pytz.exceptions.UnknownTimeZoneError:
+            embed = discord.Embed(
+                description="❌ Invalid timezone! Pick one of the suggestions, like `America/New_York`",
+                color=discord.Color.from_str("#a6afe7")
+            )
+            return await interaction.response.send_message(embed=embed, ephemeral=True)
+        
+        self.set_user_timezone(interaction.user.id, tz.zone)
+        current_time = datetime.now(tz).strftime("%I:%M %p")
+        
+        embed = discord.Embed(
+            description=f"✅ Your timezone has been set to **{tz.zone}**\n**Current Time:** {current_time}",
+            color=discord.Color.from_str("#a6afe7")
+        )
+        await interaction.response.send_message(embed=embed)
+
+    @timezone_set_slash.autocomplete("timezone")
+    async def timezone_autocomplete(self, interaction: discord.Interaction, current: str):
+        names = search_zones(current) if current else ["UTC", "America/New_York", "Europe/London", "Asia/Tokyo"]
+        return [app_commands.Choice(name=name, value=name) for name in names]
     
     # ===== BIRTHDAY COMMANDS =====
     
@@ -348,21 +1028,9 @@ class Fun(commands.Cog):
             return await ctx.send(embed=embed)
         
         try:
-            # Parse birthday
-            if len(user_bday.split('/')) == 3:
-                bday_obj = datetime.strptime(user_bday, "%m/%d/%Y")
-                # Calculate next birthday occurrence
-                today = datetime.now()
-                next_bday = datetime(bday_obj.month, bday_obj.day)
-                if next_bday < today:
-                    next_bday = datetime(bday_obj.month, bday_obj.day)
-            else:
-                bday_obj = datetime.strptime(user_bday, "%m/%d")
-                # Calculate next birthday occurrence
-                today = datetime.now()
-                next_bday = datetime(today.year, bday_obj.month, bday_obj.day)
-                if next_bday < today:
-                    next_bday = datetime(today.year + 1, bday_obj.month, bday_obj.day)
+            # Calculate next birthday occurrence
+            month, day, _ = user_bday
+            next_bday = next_birthday(month, day, datetime.now())
             
             # Format date as text
             formatted_date = next_bday.strftime("%B %d, %Y")
@@ -393,35 +1061,33 @@ class Fun(commands.Cog):
         
         try:
             bday_obj = None
-            stored_format = None
+            year = None
             
+            # Dates without a year are parsed against leap year 2000 so 02/29 is accepted
             # Try MM/DD or MM/DD/YYYY format first
             if '/' in birthday:
                 parts = birthday.split('/')
                 if len(parts) == 2:
                     # MM/DD format
-                    bday_obj = datetime.strptime(birthday, "%m/%d")
+                    bday_obj = datetime.strptime(f"{birthday}/2000", "%m/%d/%Y")
                     formatted_bday = bday_obj.strftime("%B %d")
-                    stored_format = birthday
                 elif len(parts) == 3:
                     # MM/DD/YYYY format
                     bday_obj = datetime.strptime(birthday, "%m/%d/%Y")
                     formatted_bday = bday_obj.strftime("%B %d, %Y")
-                    stored_format = birthday
+                    year = bday_obj.year
             else:
                 # Try "18 sep" or "sep 18" format
                 parts = birthday.lower().split()
                 if len(parts) == 2:
                     # Try "18 sep" format (day month)
                     try:
-                        bday_obj = datetime.strptime(birthday, "%d %b")
-                        stored_format = bday_obj.strftime("%m/%d")
+                        bday_obj = datetime.strptime(f"{birthday} 2000", "%d %b %Y")
                         formatted_bday = bday_obj.strftime("%B %d")
                     except ValueError:
                         # Try "sep 18" format (month day)
                         try:
-                            bday_obj = datetime.strptime(birthday, "%b %d")
-                            stored_format = bday_obj.strftime("%m/%d")
+                            bday_obj = datetime.strptime(f"{birthday} 2000", "%b %d %Y")
                             formatted_bday = bday_obj.strftime("%B %d")
                         except ValueError:
                             pass
@@ -429,20 +1095,20 @@ class Fun(commands.Cog):
                     # Try with year: "18 sep 2000" or "sep 18 2000"
                     try:
                         bday_obj = datetime.strptime(birthday, "%d %b %Y")
-                        stored_format = bday_obj.strftime("%m/%d/%Y")
                         formatted_bday = bday_obj.strftime("%B %d, %Y")
+                        year = bday_obj.year
                     except ValueError:
                         try:
                             bday_obj = datetime.strptime(birthday, "%b %d %Y")
-                            stored_format = bday_obj.strftime("%m/%d/%Y")
                             formatted_bday = bday_obj.strftime("%B %d, %Y")
+                            year = bday_obj.year
                         except ValueError:
                             pass
             
-            if bday_obj is None or stored_format is None:
+            if bday_obj is None:
                 raise ValueError("Invalid format")
             
-            self.set_user_birthday(ctx.author.id, stored_format)
+            self.set_user_birthday(ctx.author.id, bday_obj.month, bday_obj.day, year)
             
             embed = discord.Embed(
                 description=f"✅ Your birthday has been set to **{formatted_bday}**",
@@ -481,6 +1147,64 @@ class Fun(commands.Cog):
         )
         await ctx.send(embed=embed)
 
+    @birthday.command(name="channel")
+    @commands.guild_only()
+    @commands.has_permissions(manage_guild=True)
+    async def birthday_channel(self, ctx, channel: discord.TextChannel = None):
+        """Set the channel birthday announcements are posted in (leave empty to turn them off)"""
+        
+        self.update_birthday_settings(ctx.guild.id, channel_id=channel.id if channel else None)
+        
+        embed = discord.Embed(
+            description=f"✅ Birthday announcements will be posted in {channel.mention}" if channel else "✅ Birthday announcements have been turned off",
+            color=discord.Color.from_str("#a6afe7")
+        )
+        await ctx.send(embed=embed)
+
+    @birthday.command(name="role")
+    @commands.guild_only()
+    @commands.has_permissions(manage_guild=True)
+    async def birthday_role(self, ctx, role: discord.Role = None):
+        """Set a role given to members for their birthday (leave empty to turn it off)"""
+        
+        if role and role >= ctx.guild.me.top_role:
+            embed = discord.Embed(
+                description="❌ That role is above my highest role, so I can't give it out!",
+                color=discord.Color.from_str("#a6afe7")
+            )
+            return await ctx.send(embed=embed)
+        
+        self.update_birthday_settings(ctx.guild.id, role_id=role.id if role else None)
+        
+        embed = discord.Embed(
+            description=f"✅ Members will get {role.mention} on their birthday" if role else "✅ The birthday role has been turned off",
+            color=discord.Color.from_str("#a6afe7")
+        )
+        await ctx.send(embed=embed)
+
+    @birthday.command(name="timezone", aliases=["tz"])
+    @commands.guild_only()
+    @commands.has_permissions(manage_guild=True)
+    async def birthday_timezone(self, ctx, *, timezone: str):
+        """Set the timezone whose midnight starts each birthday in this server"""
+        
+        try:
+            tz = get_zone(timezone)
+        except pytz.exceptions.UnknownTimeZoneError:
+            embed = discord.Embed(
+                description="❌ Invalid timezone! Use format like `America/New_York`, `Europe/London`, `Asia/Tokyo`",
+                color=discord.Color.from_str("#a6afe7")
+            )
+            return await ctx.send(embed=embed)
+        
+        self.update_birthday_settings(ctx.guild.id, timezone=tz.zone)
+        
+        embed = discord.Embed(
+            description=f"✅ Birthdays in this server now start at midnight **{tz.zone}** time",
+            color=discord.Color.from_str("#a6afe7")
+        )
+        await ctx.send(embed=embed)
+
     @commands.command(name="spotify", aliases=["sp"])
     async def spotify_prefix(self, ctx, user: discord.User = None):
         """Get the current Spotify song from a user's Discord activity"""
@@ -563,6 +1287,7 @@ class Fun(commands.Cog):
                 color=discord.Color.from_str("#a6afe7")
             )
             embed.set_image(url=gif_url)
+            self.record_interaction(ctx, embed, user, "hug")
             await ctx.send(embed=embed)
         else:
             embed = discord.Embed(
@@ -596,6 +1321,7 @@ class Fun(commands.Cog):
                 color=discord.Color.from_str("#a6afe7")
             )
             embed.set_image(url=gif_url)
+            self.record_interaction(ctx, embed, user, "kiss")
             await ctx.send(embed=embed)
         else:
             embed = discord.Embed(
@@ -638,6 +1364,7 @@ class Fun(commands.Cog):
                 color=discord.Color.from_str("#a6afe7")
             )
             embed.set_image(url=gif_url)
+            self.record_interaction(ctx, embed, user, "fuck")
             await ctx.send(embed=embed)
         else:
             embed = discord.Embed(
@@ -671,6 +1398,7 @@ class Fun(commands.Cog):
                 color=discord.Color.from_str("#a6afe7")
             )
             embed.set_image(url=gif_url)
+            self.record_interaction(ctx, embed, user, "pat")
             await ctx.send(embed=embed)
         else:
             embed = discord.Embed(
@@ -742,6 +1470,7 @@ class Fun(commands.Cog):
                 color=discord.Color.from_str("#a6afe7")
             )
             embed.set_image(url=gif_url)
+            self.record_interaction(ctx, embed, user, "slap")
             await ctx.send(embed=embed)
         else:
             embed = discord.Embed(
@@ -775,6 +1504,7 @@ class Fun(commands.Cog):
                 color=discord.Color.from_str("#a6afe7")
             )
             embed.set_image(url=gif_url)
+            self.record_interaction(ctx, embed, user, "punch")
             await ctx.send(embed=embed)
         else:
             embed = discord.Embed(
@@ -808,6 +1538,7 @@ class Fun(commands.Cog):
                 color=discord.Color.from_str("#a6afe7")
             )
             embed.set_image(url=gif_url)
+            self.record_interaction(ctx, embed, user, "poke")
             await ctx.send(embed=embed)
         else:
             embed = discord.Embed(
@@ -841,6 +1572,7 @@ class Fun(commands.Cog):
                 color=discord.Color.from_str("#a6afe7")
             )
             embed.set_image(url=gif_url)
+            self.record_interaction(ctx, embed, user, "tickle")
             await ctx.send(embed=embed)
         else:
             embed = discord.Embed(
@@ -874,6 +1606,7 @@ class Fun(commands.Cog):
                 color=discord.Color.from_str("#a6afe7")
             )
             embed.set_image(url=gif_url)
+            self.record_interaction(ctx, embed, user, "bite")
             await ctx.send(embed=embed)
         else:
             embed = discord.Embed(
@@ -907,6 +1640,7 @@ class Fun(commands.Cog):
                 color=discord.Color.from_str("#a6afe7")
             )
             embed.set_image(url=gif_url)
+            self.record_interaction(ctx, embed, user, "cuddle")
             await ctx.send(embed=embed)
         else:
             embed = discord.Embed(
@@ -940,6 +1674,7 @@ class Fun(commands.Cog):
                 color=discord.Color.from_str("#a6afe7")
             )
             embed.set_image(url=gif_url)
+            self.record_interaction(ctx, embed, user, "feed")
             await ctx.send(embed=embed)
         else:
             embed = discord.Embed(
@@ -984,6 +1719,7 @@ class Fun(commands.Cog):
                 color=discord.Color.from_str("#a6afe7")
             )
             embed.set_image(url=gif_url)
+            self.record_interaction(ctx, embed, user, "wave")
             await ctx.send(embed=embed)
         else:
             embed = discord.Embed(
@@ -1121,6 +1857,7 @@ class Fun(commands.Cog):
                 color=discord.Color.from_str("#a6afe7")
             )
             embed.set_image(url=gif_url)
+            self.record_interaction(ctx, embed, user, "wink")
             await ctx.send(embed=embed)
         else:
             embed = discord.Embed(
@@ -1230,6 +1967,7 @@ class Fun(commands.Cog):
                 color=discord.Color.from_str("#a6afe7")
             )
             embed.set_image(url=gif_url)
+            self.record_interaction(ctx, embed, user, "stare")
             await ctx.send(embed=embed)
         else:
             embed = discord.Embed(
@@ -1263,6 +2001,7 @@ class Fun(commands.Cog):
                 color=discord.Color.from_str("#a6afe7")
             )
             embed.set_image(url=gif_url)
+            self.record_interaction(ctx, embed, user, "handhold")
             await ctx.send(embed=embed)
         else:
             embed = discord.Embed(
@@ -1296,6 +2035,7 @@ class Fun(commands.Cog):
                 color=discord.Color.from_str("#a6afe7")
             )
             embed.set_image(url=gif_url)
+            self.record_interaction(ctx, embed, user, "highfive")
             await ctx.send(embed=embed)
         else:
             embed = discord.Embed(
@@ -1380,6 +2120,38 @@ class Fun(commands.Cog):
             )
             await ctx.send(embed=embed)
 
+    @commands.command(name="toppairs", aliases=["pairs"])
+    @commands.guild_only()
+    async def toppairs(self, ctx, action: str = None):
+        """Show who hugs, kisses, pats... whom the most in this server"""
+        if action is not None:
+            action = action.lower()
+            if action not in INTERACTION_VERBS:
+                embed = discord.Embed(
+                    description=f"<:deny:1429468818094424075> Unknown action! Choose from: {', '.join(f'`{a}`' for a in INTERACTION_VERBS)}",
+                    color=discord.Color.from_str("#a6afe7")
+                )
+                return await ctx.send(embed=embed)
+
+        pairs = self.get_top_pairs(ctx.guild.id, action)
+        if not pairs:
+            embed = discord.Embed(
+                description="<:deny:1429468818094424075> No interactions recorded yet!",
+                color=discord.Color.from_str("#a6afe7")
+            )
+            return await ctx.send(embed=embed)
+
+        lines = []
+        for index, (actor_id, target_id, count) in enumerate(pairs, start=1):
+            lines.append(f"`{index}.` <@{actor_id}> → <@{target_id}> - **{count:,}**")
+
+        embed = discord.Embed(
+            title=f"Top {action} pairs" if action else "Top pairs",
+            description="\n".join(lines),
+            color=discord.Color.from_str("#a6afe7")
+        )
+        await ctx.send(embed=embed)
+
     @commands.command(name="8ball", aliases=["eightball"])
     async def eightball(self, ctx, *, question: str = None):
         """Ask the magic 8ball a question"""
@@ -1675,96 +2447,57 @@ class Fun(commands.Cog):
     async def roblox(self, ctx, *, user_input: str):
         async with ctx.typing():
             try:
-                async with aiohttp.ClientSession() as session:
-                    user_id = None
-                    
-                    # Check if input is a user ID (numeric)
-                    if user_input.isdigit():
-                        user_id = int(user_input)
-                    else:
-                        # Try using the username directly via POST request
-                        usernames_url = "https://users.roblox.com/v1/usernames/users"
-                        payload = {
-                            "usernames": [user_input],
-                            "excludeBannedUsers": False
-                        }
-                        headers = {
-                            "Content-Type": "application/json"
-                        }
-                        
-                        async with session.post(usernames_url, json=payload, headers=headers) as response:
-                            if response.status != 200:
-                                return await ctx.send(embed=discord.Embed(
-                                    description="❌ Failed to fetch Roblox data!",
-                                    color=discord.Color.from_str("#a6afe7")
-                                ))
-                            
-                            data = await response.json()
-                            
-                            if not data.get('data') or len(data['data']) == 0:
-                                return await ctx.send(embed=discord.Embed(
-                                    description=f"❌ Roblox user `{user_input}` not found!",
-                                    color=discord.Color.from_str("#a6afe7")
-                                ))
-                            
-                            user_id = data['data'][0]['id']
-                    
-                    # Now fetch user info using the user ID
-                    user_url = f"https://users.roblox.com/v1/users/{user_id}"
-                    async with session.get(user_url) as response:
-                        if response.status != 200:
-                            return await ctx.send(embed=discord.Embed(
-                                description=f"❌ Roblox user with ID `{user_id}` not found!",
-                                color=discord.Color.from_str("#a6afe7")
-                            ))
-                        
-                        user_data = await response.json()
-                        username = user_data.get('name')
-                        display_name = user_data.get('displayName')
-                        description = user_data.get('description', 'No description')
-                        created = user_data.get('created', 'Unknown')
-                        is_banned = user_data.get('isBanned', False)
-                    
-                    # Get avatar thumbnail
-                    thumbnail_url = f"https://thumbnails.roblox.com/v1/users/avatar-headshot?userIds={user_id}&size=150x150&format=Png"
-                    async with session.get(thumbnail_url) as response:
-                        thumbnail_data = await response.json()
-                        avatar_url = thumbnail_data['data'][0]['imageUrl'] if thumbnail_data.get('data') else None
-                    
-                    # Get friends count
-                    friends_url = f"https://friends.roblox.com/v1/users/{user_id}/friends/count"
-                    async with session.get(friends_url) as response:
-                        friends_data = await response.json()
-                        friends_count = friends_data.get('count', 0)
-                    
-                    # Get followers count
-                    followers_url = f"https://friends.roblox.com/v1/users/{user_id}/followers/count"
-                    async with session.get(followers_url) as response:
-                        followers_data = await response.json()
-                        followers_count = followers_data.get('count', 0)
-                    
-                    # Get following count
-                    following_url = f"https://friends.roblox.com/v1/users/{user_id}/followings/count"
-                    async with session.get(following_url) as response:
-                        following_data = await response.json()
-                        following_count = following_data.get('count', 0)
+                # Check if input is a user ID (numeric)
+                if user_input.isdigit():
+                    user_id = int(user_input)
+                else:
+                    user_id = await self.single_flight(
+                        ("roblox_id", user_input.lower()),
+                        lambda: self.get_roblox_id(user_input)
+                    )
+                    if user_id is False:
+                        return await ctx.send(embed=discord.Embed(
+                            description="❌ Failed to fetch Roblox data!",
+                            color=discord.Color.from_str("#a6afe7")
+                        ))
+                    if user_id is None:
+                        return await ctx.send(embed=discord.Embed(
+                            description=f"❌ Roblox user `{user_input}` not found!",
+                            color=discord.Color.from_str("#a6afe7")
+                        ))
+                
+                profile = await self.single_flight(
+                    ("roblox_profile", user_id),
+                    lambda: self.get_roblox_profile(user_id)
+                )
+                if profile is False:
+                    return await ctx.send(embed=discord.Embed(
+                        description="❌ Failed to fetch Roblox data!",
+                        color=discord.Color.from_str("#a6afe7")
+                    ))
+                if profile is None:
+                    return await ctx.send(embed=discord.Embed(
+                        description=f"❌ Roblox user with ID `{user_id}` not found!",
+                        color=discord.Color.from_str("#a6afe7")
+                    ))
                 
                 # Create embed with profile link
                 embed = discord.Embed(
-                    title=f"{display_name} (@{username})",
-                    description=description[:256] if description else "No description",
+                    title=f"{profile['display_name']} (@{profile['username']})",
+                    description=profile['description'][:256] if profile['description'] else "No description",
                     color=discord.Color.from_str("#a6afe7"),
                     url=f"https://www.roblox.com/users/{user_id}/profile"
                 )
                 
-                if avatar_url:
-                    embed.set_thumbnail(url=avatar_url)
+                if profile['avatar_url']:
+                    embed.set_thumbnail(url=profile['avatar_url'])
                 
                 embed.add_field(name="User ID", value=f"{user_id}", inline=True)
-                embed.add_field(name="Created", value=f"<t:{int(datetime.datetime.fromisoformat(created.replace('Z', '+00:00')).timestamp())}:D>", inline=True)
-                embed.add_field(name="Connections", value=f"{friends_count:,}", inline=True)
-                embed.add_field(name="Followers", value=f"{followers_count:,}", inline=True)
-                embed.add_field(name="Following", value=f"{following_count:,}", inline=True)
+                if profile['created']:
+                    embed.add_field(name="Created", value=f"<t:{int(datetime.fromisoformat(profile['created'].replace('Z', '+00:00')).timestamp())}:D>", inline=True)
+                embed.add_field(name="Connections", value=f"{profile['friends']:,}", inline=True)
+                embed.add_field(name="Followers", value=f"{profile['followers']:,}", inline=True)
+                embed.add_field(name="Following", value=f"{profile['following']:,}", inline=True)
                 
                 embed.set_footer(text=f"Requested by {ctx.author.name}", icon_url=ctx.author.display_avatar.url)
                 
@@ -1790,46 +2523,45 @@ class Fun(commands.Cog):
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, timeout=10) as response:
-                    if response.status != 200:
-                        await ctx.send(f"Failed to fetch profile (Status: {response.status})")
-                        return
+            async with self.bot.http_pool.get(url, headers=headers, timeout=10) as response:
+                if response.status != 200:
+                    await ctx.send(f"Failed to fetch profile (Status: {response.status})")
+                    return
                     
-                    html = await response.text()
+                html = await response.text()
                     
-                    # Extract JSON data from HTML
-                    match = re.search(r'<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">(.*?)</script>', html, re.DOTALL)
+                # Extract JSON data from HTML
+                match = re.search(r'<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">(.*?)</script>', html, re.DOTALL)
                     
-                    if not match:
-                        await ctx.send("Could not find profile data in page")
-                        return
+                if not match:
+                    await ctx.send("Could not find profile data in page")
+                    return
                     
-                    data = json.loads(match.group(1))
-                    user_info = data.get('__DEFAULT_SCOPE__', {}).get('webapp.user-detail', {}).get('userInfo', {})
-                    if not user_info:
-                        await ctx.send("Profile not found or is private")
-                        return
+                data = json.loads(match.group(1))
+                user_info = data.get('__DEFAULT_SCOPE__', {}).get('webapp.user-detail', {}).get('userInfo', {})
+                if not user_info:
+                    await ctx.send("Profile not found or is private")
+                    return
                     
-                    user = user_info.get('user', {})
-                    stats = user_info.get('stats', {})
+                user = user_info.get('user', {})
+                stats = user_info.get('stats', {})
                     
-                    embed = discord.Embed(
-                        title=f"@{user.get('uniqueId', 'Unknown')}",
-                        description=user.get('signature', 'No bio'),
-                        color=0xa6afe7
-                    )
+                embed = discord.Embed(
+                    title=f"@{user.get('uniqueId', 'Unknown')}",
+                    description=user.get('signature', 'No bio'),
+                    color=0xa6afe7
+                )
                     
-                    # Set profile picture as thumbnail
-                    avatar_url = user.get('avatarLarger') or user.get('avatarMedium') or user.get('avatarThumb')
-                    if avatar_url:
-                        embed.set_thumbnail(url=avatar_url)
+                # Set profile picture as thumbnail
+                avatar_url = user.get('avatarLarger') or user.get('avatarMedium') or user.get('avatarThumb')
+                if avatar_url:
+                    embed.set_thumbnail(url=avatar_url)
                     
-                    embed.add_field(name="Followers", value=f"{stats.get('followerCount', 0):,}")
-                    embed.add_field(name="Following", value=f"{stats.get('followingCount', 0):,}")
-                    embed.add_field(name="Likes", value=f"{stats.get('heartCount', 0):,}")
+                embed.add_field(name="Followers", value=f"{stats.get('followerCount', 0):,}")
+                embed.add_field(name="Following", value=f"{stats.get('followingCount', 0):,}")
+                embed.add_field(name="Likes", value=f"{stats.get('heartCount', 0):,}")
                     
-                    await ctx.send(embed=embed)
+                await ctx.send(embed=embed)
                         
         except json.JSONDecodeError:
             await ctx.send("Failed to parse profile data")
@@ -1,7 +1,6 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import aiohttp
 import sqlite3
 from typing import Union, Optional
 
@@ -113,11 +112,7 @@ class LastFM(commands.Cog):
             'format': 'json'
         })
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.api_url, params=params) as response:
-                if response.status == 200:
-                    return await response.json()
-                return None
+        return await self.bot.http_pool.get_json(self.api_url, params=params)
     
     async def create_nowplaying_embed(self, target_user, lastfm_username):
         """Create the now playing embed (shared logic)"""
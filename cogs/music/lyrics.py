@@ -60,7 +60,8 @@ class Lyrics(commands.Cog):
         self.mxm = Musixmatch({
             'requestTimeoutMs': 10000,
             'cacheTTL': 300000,
-            'maxCacheEntries': 100
+            'maxCacheEntries': 100,
+            'http': bot.http_pool
         })
     
     def split_lyrics(self, lyrics, max_length=500):
@@ -0,0 +1,245 @@
+"""Monte Carlo model of the economy games in cogs/fun/economy.py
+
+Usage: python economy_sim.py [--rounds 2000000] [--db data/economy.db] [--days 30]
+
+Each game's payout rules are re-implemented as vectorized NumPy so millions of rounds
+run in well under a second. Results are reported as expected value (EV), standard
+deviation and win rate per round. With an economy.db present, the activity mix of the
+last --days days is read from the ledger and used to project how fast the money
+supply grows. Keep the rules below in sync with the cog when payouts are tuned.
+"""
+import argparse
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+DEFAULT_BET = 1000
+DEFAULT_WALLET = 5000
+
+# Commands that only create money: (payout ranges picked uniformly, chance of paying at all)
+FAUCETS = {
+    "daily": ([(500, 1500)], 1.0),
+    "weekly": ([(5000, 10000)], 1.0),
+    "work": ([(100, 500)], 1.0),
+    "beg": ([(50, 150), (100, 300), (25, 100), (75, 200), (30, 120)], 0.7),
+    "search": ([(50, 200), (75, 250), (30, 150), (40, 180), (60, 220), (80, 300), (45, 175), (35, 160)], 1.0),
+    "fish": ([(100, 300), (300, 600), (400, 800), (800, 1500), (500, 1000), (600, 1200), (10, 50), (1000, 2000)], 1.0),
+    "hunt": ([(200, 400), (500, 800), (800, 1200), (600, 1000), (400, 700), (450, 750), (150, 350), (2000, 4000)], 0.75),
+    "mine": ([(100, 250), (200, 400), (500, 800), (1000, 1500), (800, 1200), (700, 1100), (750, 1150), (2000, 3000)], 1.0),
+}
+CRIMES = [(5000, 10000), (7000, 12000), (4000, 8000), (6000, 11000), (5500, 9500)]
+
+
+def pick_ranges(rng, ranges, n):
+    """Uniform integer draw from a randomly chosen (min, max) table row, like random.choice + randint"""
+    table = np.array(ranges)
+    rows = table[rng.integers(0, len(table), n)]
+    return rng.integers(rows[:, 0], rows[:, 1] + 1)
+
+
+def slots(rng, n, bet):
+    reels = rng.integers(0, 6, (n, 3))  # 4 = 💎, 5 = 7️⃣
+    triple = (reels[:, 0] == reels[:, 1]) & (reels[:, 1] == reels[:, 2])
+    pair = ~triple & (
+        (reels[:, 0] == reels[:, 1]) | (reels[:, 1] == reels[:, 2]) | (reels[:, 0] == reels[:, 2])
+    )
+    multiplier = np.where(reels[:, 0] == 4, 10, np.where(reels[:, 0] == 5, 7, 3))
+    return np.where(triple, bet * multiplier, np.where(pair, 0, -bet))
+
+
+def coinflip(rng, n, bet):
+    return np.where(rng.random(n) < 0.5, bet, -bet)
+
+
+def dice(rng, n, bet):
+    return np.where(rng.integers(1, 7, n) == rng.integers(1, 7, n), bet * 5, -bet)
+
+
+def blackjack(rng, n, bet):
+    player = rng.integers(1, 12, (n, 2)).sum(axis=1)
+    dealer = rng.integers(1, 12, (n, 2)).sum(axis=1)
+    drawing = dealer < 17
+    while drawing.any():
+        dealer[drawing] += rng.integers(1, 12, drawing.sum())
+        drawing = dealer < 17
+
+    return np.select(
+        [player > 21, dealer > 21, player > dealer, player < dealer],
+        [-bet, bet, bet, -bet],
+        0
+    )
+
+
+def gamble(rng, n, bet):
+    return np.where(rng.random(n) < 0.45, bet, -bet)
+
+
+def highlow(rng, n, bet):
+    # Assumes players guess the better side of the first number
+    first = rng.integers(1, 101, n)
+    second = rng.integers(1, 101, n)
+    guess_higher = first <= 50
+    correct = np.where(guess_higher, second > first, second < first)
+    return np.where(second == first, 0, np.where(correct, bet, -bet))
+
+
+def rob(rng, n, wallet):
+    # Stolen money only changes hands; the fine on failure is what leaves the economy
+    success = rng.random(n) < 0.4
+    stolen = rng.integers(int(wallet * 0.2), int(wallet * 0.5) + 1, n)
+    return np.where(success, stolen, -int(wallet * 0.25)), np.where(success, 0, -int(wallet * 0.25))
+
+
+def crime(rng, n, wallet):
+    success = rng.random(n) < 0.5
+    reward = pick_ranges(rng, CRIMES, n)
+    delta = np.where(success, reward, -int(wallet * 0.4))
+    return delta, delta
+
+
+def faucet(rng, n, reason):
+    ranges, chance = FAUCETS[reason]
+    return np.where(rng.random(n) < chance, pick_ranges(rng, ranges, n), 0)
+
+
+BET_GAMES = {
+    "slots": slots,
+    "coinflip": coinflip,
+    "dice": dice,
+    "blackjack": blackjack,
+    "gamble": gamble,
+    "highlow": highlow,
+}
+WALLET_GAMES = {"rob": rob, "crime": crime}
+
+
+def load_activity(db_path, days):
+    """Read rounds per day, typical bet and wallet size and money supply from economy.db"""
+    if not os.path.exists(db_path):
+        return None
+
+    conn = sqlite3.connect(db_path)
+    c = conn.cursor()
+    since = int(time.time()) - days * 86400
+
+    try:
+        # One row per round: slots/highlow also write a payout row, rob writes the victim's row too
+        c.execute(
+            "SELECT reason, COUNT(*) FROM ledger WHERE created_at >= ? "
+            "AND NOT (reason IN ('slots', 'highlow') AND wallet_delta > 0) "
+            "AND NOT (reason = 'rob' AND wallet_delta < 0 AND counterparty IS NOT NULL) "
+            "GROUP BY reason",
+            (since,)
+        )
+        rounds = {reason: count / days for reason, count in c.fetchall()}
+
+        # Every losing round records exactly -bet, so losses give the typical bet size
+        c.execute(
+            "SELECT reason, AVG(-wallet_delta) FROM ledger WHERE created_at >= ? AND wallet_delta < 0 "
+            f"AND reason IN ({','.join('?' * len(BET_GAMES))}) GROUP BY reason",
+            (since, *BET_GAMES)
+        )
+        bets = {reason: int(bet) for reason, bet in c.fetchall()}
+    except sqlite3.OperationalError:
+        conn.close()
+        return None
+
+    c.execute("SELECT COUNT(*), COALESCE(SUM(balance + bank), 0), COALESCE(SUM(bank), 0) FROM users")
+    users, supply, banked = c.fetchone()
+    c.execute("SELECT balance FROM users ORDER BY balance LIMIT 1 OFFSET ?", (users // 2,))
+    median = c.fetchone()
+    conn.close()
+
+    return {
+        "rounds": rounds,
+        "bets": bets,
+        "wallet": median[0] if median and median[0] > 0 else DEFAULT_WALLET,
+        "supply": supply,
+        "banked": banked,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=2_000_000, help="rounds simulated per game")
+    parser.add_argument("--db", default="data/economy.db", help="economy database for the activity mix")
+    parser.add_argument("--days", type=int, default=30, help="ledger window used for the activity mix")
+    parser.add_argument("--project", type=int, default=30, help="days of money supply to project")
+    parser.add_argument("--bet", type=int, default=None, help="bet size (defaults to the observed average)")
+    parser.add_argument("--wallet", type=int, default=None, help="wallet size for rob and crime fines")
+    parser.add_argument("--interest", type=float, default=0.002, help="daily bank interest rate")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    activity = load_activity(args.db, args.days) or {"rounds": {}, "bets": {}, "wallet": DEFAULT_WALLET, "supply": 0, "banked": 0}
+    wallet = args.wallet or activity["wallet"]
+    n = args.rounds
+
+    print(f"{'game':<10} {'bet':>8} {'EV/round':>12} {'EV % bet':>9} {'std dev':>12} {'win %':>7} {'Mrounds/s':>10}")
+    created = {}  # Money created (or destroyed) per round, for the projection
+
+    for name, game in BET_GAMES.items():
+        bet = args.bet or activity["bets"].get(name, DEFAULT_BET)
+        started = time.perf_counter()
+        results = game(rng, n, bet)
+        elapsed = time.perf_counter() - started
+
+        ev = results.mean()
+        created[name] = ev
+        print(
+            f"{name:<10} {bet:>8,} {ev:>12,.2f} {ev / bet:>9.2%} {results.std():>12,.2f} "
+            f"{(results > 0).mean():>7.2%} {n / elapsed / 1e6:>10.1f}"
+        )
+
+    for name, game in WALLET_GAMES.items():
+        started = time.perf_counter()
+        results, minted = game(rng, n, wallet)
+        elapsed = time.perf_counter() - started
+
+        created[name] = minted.mean()
+        print(
+            f"{name:<10} {'wallet':>8} {results.mean():>12,.2f} {'':>9} {results.std():>12,.2f} "
+            f"{(results > 0).mean():>7.2%} {n / elapsed / 1e6:>10.1f}"
+        )
+
+    for name in FAUCETS:
+        created[name] = faucet(rng, n, name).mean()
+
+    rounds = activity["rounds"]
+    if not rounds:
+        print("\nNo ledger activity found; pass --db pointing at a populated economy.db for projections.")
+        return
+
+    print(f"\nActivity over the last {args.days} days (rounds/day -> money created/day)")
+    daily = 0
+    for name, per_day in sorted(rounds.items(), key=lambda item: -item[1]):
+        if name not in created:
+            continue
+        flow = per_day * created[name]
+        daily += flow
+        print(f"  {name:<10} {per_day:>10,.1f} -> {flow:>14,.0f}")
+
+    interest = activity["banked"] * args.interest
+    print(f"  {'interest':<10} {'':>10}    {interest:>14,.0f}")
+    daily += interest
+
+    supply = activity["supply"]
+    print(f"\nMoney supply: ${supply:,.0f}, net change ${daily:,.0f}/day", end="")
+    print(f" ({daily / supply:.2%}/day)" if supply else "")
+
+    projected = supply
+    banked = activity["banked"]
+    for day in range(1, args.project + 1):
+        growth = daily - interest + banked * args.interest
+        banked += banked * args.interest
+        projected += growth
+        if day in (1, 7, 30, 90, 365) or day == args.project:
+            change = f" ({projected / supply - 1:+.1%})" if supply else ""
+            print(f"  day {day:>4}: ${projected:,.0f}{change}")
+
+
+if __name__ == "__main__":
+    main()
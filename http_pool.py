@@ -0,0 +1,144 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+import aiohttp
+
+CONNECTION_LIMIT = 100
+CONNECTIONS_PER_HOST = 20
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 30
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5)
+
+# Per-host overrides; slow scrapes get more time, fast JSON APIs fail sooner
+HOST_TIMEOUTS = {
+    "www.tiktok.com": aiohttp.ClientTimeout(total=10, connect=5),
+    "apic-desktop.musixmatch.com": aiohttp.ClientTimeout(total=10, connect=5),
+    "nekos.best": aiohttp.ClientTimeout(total=5, connect=3),
+}
+
+
+class HostStats:
+    __slots__ = ("requests", "errors", "in_flight", "total_latency", "max_latency", "last_status")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last_status = None
+
+    @property
+    def avg_latency(self):
+        return self.total_latency / self.requests if self.requests else 0.0
+
+
+class HttpPool:
+    """Bot-wide HTTP client registry
+
+    Every named session shares one TCPConnector, so connections, keep-alive and the DNS
+    cache are pooled per host across all cogs. Sessions only differ in their cookie jar:
+    "default" ignores cookies, anything else (e.g. "musixmatch") keeps its own jar.
+    Created lazily on first use and closed by the bot on shutdown.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, host_timeouts=None):
+        self.timeout = timeout
+        self.host_timeouts = {**HOST_TIMEOUTS, **(host_timeouts or {})}
+        self.connector = None
+        self.sessions = {}
+        self.stats = {}
+
+    def get_connector(self):
+        if self.connector is None or self.connector.closed:
+            self.connector = aiohttp.TCPConnector(
+                limit=CONNECTION_LIMIT,
+                limit_per_host=CONNECTIONS_PER_HOST,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=KEEPALIVE_TIMEOUT
+            )
+        return self.connector
+
+    def session(self, name="default"):
+        session = self.sessions.get(name)
+        if session is None or session.closed:
+            cookie_jar = aiohttp.DummyCookieJar() if name == "default" else aiohttp.CookieJar()
+            session = aiohttp.ClientSession(
+                connector=self.get_connector(),
+                connector_owner=False,
+                cookie_jar=cookie_jar,
+                timeout=self.timeout
+            )
+            self.sessions[name] = session
+        return session
+
+    def reset_cookies(self, name):
+        session = self.sessions.get(name)
+        if session is not None:
+            session.cookie_jar.clear()
+
+    @asynccontextmanager
+    async def request(self, method, url, *, session="default", **kwargs):
+        """Send a request through the shared pool and record per-host metrics
+
+        Yields the aiohttp response; latency covers everything up to leaving the block,
+        so reading the body is included.
+        """
+        host = urlsplit(url).hostname or ""
+        if "timeout" not in kwargs and host in self.host_timeouts:
+            kwargs["timeout"] = self.host_timeouts[host]
+        elif isinstance(kwargs.get("timeout"), (int, float)):
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=kwargs["timeout"])
+
+        stats = self.stats.get(host)
+        if stats is None:
+            stats = self.stats[host] = HostStats()
+
+        stats.in_flight += 1
+        started = time.perf_counter()
+        failed = True
+        try:
+            async with self.session(session).request(method, url, **kwargs) as response:
+                stats.last_status = response.status
+                yield response
+                failed = response.status >= 400
+        finally:
+            elapsed = time.perf_counter() - started
+            stats.in_flight -= 1
+            stats.requests += 1
+            stats.total_latency += elapsed
+            stats.max_latency = max(stats.max_latency, elapsed)
+            if failed:
+                stats.errors += 1
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    async def get_json(self, url, **kwargs):
+        """GET a JSON body, or None on a non-200 response or network error"""
+        try:
+            async with self.get(url, **kwargs) as response:
+                if response.status != 200:
+                    return None
+                return await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            return None
+
+    def metrics(self):
+        """Per-host stats, busiest first"""
+        return sorted(self.stats.items(), key=lambda item: -item[1].requests)
+
+    async def close(self):
+        for session in self.sessions.values():
+            if not session.closed:
+                await session.close()
+        self.sessions.clear()
+
+        if self.connector is not None and not self.connector.closed:
+            await self.connector.close()
+        self.connector = None
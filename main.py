@@ -9,9 +9,19 @@ import asyncio
 from config import TOKEN, PREFIX, OWNER_IDS, STATUS_MESSAGES, LAVALINK_NODES, COLOR
 from threading import Thread
 from api import start_flask  # Replace with your actual filename
+from http_pool import HttpPool
+
+class Bot(commands.Bot):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.http_pool = HttpPool()  # Shared HTTP client for all cogs (bot.http is discord.py's own)
+
+    async def close(self):
+        await super().close()
+        await self.http_pool.close()
 
 intents = discord.Intents.all()
-bot = commands.Bot(command_prefix=PREFIX, intents=intents, help_command=None)
+bot = Bot(command_prefix=PREFIX, intents=intents, help_command=None)
 
 for owner_id in OWNER_IDS:
     bot.owner_ids.add(owner_id)
@@ -6,7 +6,9 @@ import re
 import time
 from urllib.parse import urlencode, urlparse, urlunparse
 
-import httpx
+import aiohttp
+
+from http_pool import HttpPool
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -43,21 +45,8 @@ DEFAULT_HEADERS = {
     'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 }
 
-default_client = httpx.AsyncClient(follow_redirects=True)
-cookie_client = None
-
-async def get_client(with_cookies=True):
-    global cookie_client
-    if with_cookies:
-        if not cookie_client:
-            cookie_client = httpx.AsyncClient(cookies={}, follow_redirects=True)
-        return cookie_client
-    return default_client
-
-def reset_cookie_client():
-    global cookie_client
-    if cookie_client:
-        cookie_client.cookies.clear()
+# Cookie jar of the shared pool that Musixmatch requests go through
+COOKIE_SESSION = 'musixmatch'
 
 class Musixmatch:
     def __init__(self, opts=None):
@@ -67,6 +56,7 @@ class Musixmatch:
         self.token_promise = None
         self.last_token_persist = 0
         self.cache = {}
+        self.http = opts.get('http') or HttpPool()
         self.request_timeout_ms = opts.get('requestTimeoutMs', 8000)
         self.cache_ttl = opts.get('cacheTTL', 300000)
         self.max_cache_entries = max(10, opts.get('maxCacheEntries', 100))
@@ -97,21 +87,28 @@ class Musixmatch:
         except IOError:
             pass
 
+    def reset_cookies(self):
+        self.http.reset_cookies(COOKIE_SESSION)
+
     async def api_get(self, url):
-        client = await get_client(True)
         logger.debug(f"API Request: GET {url}")
         try:
-            response = await client.get(url, headers=DEFAULT_HEADERS, timeout=self.request_timeout_ms / 1000)
-            logger.debug(f"API Response: {response.status_code} {response.url}")
-            response.raise_for_status()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP Status Error for {url}: {e.response.status_code} - {e.response.text}")
-            raise HttpError(e.response.status_code) from e
-        except httpx.RequestError as e:
+            async with self.http.get(
+                url,
+                session=COOKIE_SESSION,
+                headers=DEFAULT_HEADERS,
+                timeout=self.request_timeout_ms / 1000
+            ) as response:
+                logger.debug(f"API Response: {response.status} {response.url}")
+                if response.status >= 400:
+                    text = await response.text()
+                    logger.error(f"HTTP Status Error for {url}: {response.status} - {text}")
+                    raise HttpError(response.status)
+                data = await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.error(f"Request Error for {url}: {e}")
             raise HttpError(0, f"Request error: {e}") from e
 
-        data = response.json()
         header = data.get('message', {}).get('header', {})
 
         if header.get('status_code') != 200:
@@ -167,7 +164,7 @@ class Musixmatch:
         except MxmApiError as err:
             if err.code in (401, 403):
                 await self.reset_token(True)
-                reset_cookie_client()
+                self.reset_cookies()
                 token = await self.fetch_token(True)
                 expires = time.time() * 1000 + TOKEN_TTL
                 self.token_data = {'value': token, 'expires': expires}
@@ -185,7 +182,7 @@ class Musixmatch:
                 is_captcha = err.hint and 'captcha' in err.hint.lower()
                 await self.reset_token(is_captcha)
                 if is_captcha:
-                    reset_cookie_client()
+                    self.reset_cookies()
                 new_token = await self.get_token(True)
                 url = self.build_url(endpoint, {**params, 'app_id': APP_ID, 'usertoken': new_token})
                 return await self.api_get(url)
@@ -0,0 +1,257 @@
+import asyncio
+import re
+import unicodedata
+
+# Characters people slip between letters to dodge filters
+ZERO_WIDTH = dict.fromkeys(map(ord, "\u00ad\u034f\u061c\u115f\u1160\u17b4\u17b5\u180e\u200b\u200c\u200d\u200e\u200f\u2060\u2061\u2062\u2063\u2064\ufeff"))
+COMBINING_MARKS = dict.fromkeys(range(0x0300, 0x0370))
+LEET = str.maketrans({
+    "0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b", "9": "g"
+})
+# Also ordinary punctuation, so messages are matched both with and without this folding
+LEET_SYMBOLS = str.maketrans({"@": "a", "$": "s", "!": "i", "|": "i", "+": "t", "€": "e"})
+TOKEN_REGEX = re.compile(r"[^\W_]+")
+
+
+def normalize(text):
+    """Fold case, accents, zero-width characters and leetspeak digits"""
+    text = text.translate(ZERO_WIDTH).lower()
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text).translate(COMBINING_MARKS)
+    return text.translate(LEET)
+
+
+def tokenize(text):
+    """Token lists to check for text: punctuation as separators, then as leetspeak
+    
+    "idiot!" only matches in the first form and "sh!t" only in the second.
+    """
+    normalized = normalize(text)
+    tokens = TOKEN_REGEX.findall(normalized)
+    folded = TOKEN_REGEX.findall(normalized.translate(LEET_SYMBOLS))
+    return (tokens,) if folded == tokens else (tokens, folded)
+
+
+class KeywordMatcher:
+    """Keyword filter for very large word lists
+
+    Patterns follow Discord's AutoMod wildcard rules:
+      word    matches the whole word
+      word*   matches words starting with "word"
+      *word   matches words ending with "word"
+      *word*  matches "word" anywhere
+
+    Whole-word, prefix and suffix patterns are answered with hash lookups per token,
+    so their cost depends on message length rather than list size. Anywhere-patterns
+    go through an Aho-Corasick automaton. Edits mark it stale and schedule_rebuild()
+    builds the replacement in a worker thread; messages keep matching against the
+    previous automaton until the new one is swapped in.
+    """
+
+    def __init__(self, patterns=()):
+        self.exact = set()
+        self.prefixes = set()
+        self.suffixes = set()
+        self.infixes = set()
+        self.phrase_lengths = {1}
+        self.prefix_lengths = set()
+        self.suffix_lengths = set()
+        self.automaton = None
+        self.version = 0  # Bumped on every anywhere-pattern edit
+        self.built_version = 0
+        self.rebuild_task = None
+        for pattern in patterns:
+            self.add(pattern)
+
+    def __len__(self):
+        return len(self.exact) + len(self.prefixes) + len(self.suffixes) + len(self.infixes)
+
+    @staticmethod
+    def parse(pattern):
+        """Split a raw pattern into (bucket, normalized core)"""
+        pattern = pattern.strip()
+        leading = pattern.startswith("*")
+        trailing = pattern.endswith("*")
+        core = " ".join(TOKEN_REGEX.findall(normalize(pattern.strip("*")).translate(LEET_SYMBOLS)))
+
+        if not core:
+            return None, None
+        if (leading and trailing) or (" " in core and (leading or trailing)):
+            return "infixes", core
+        if leading:
+            return "suffixes", core
+        if trailing:
+            return "prefixes", core
+        return "exact", core
+
+    def add(self, pattern):
+        bucket, core = self.parse(pattern)
+        if bucket is None or core in getattr(self, bucket):
+            return False
+
+        getattr(self, bucket).add(core)
+        if bucket == "exact":
+            self.phrase_lengths.add(core.count(" ") + 1)
+        elif bucket == "prefixes":
+            self.prefix_lengths.add(len(core))
+        elif bucket == "suffixes":
+            self.suffix_lengths.add(len(core))
+        else:
+            self.version += 1
+        return True
+
+    def remove(self, pattern):
+        bucket, core = self.parse(pattern)
+        if bucket is None or core not in getattr(self, bucket):
+            return False
+
+        getattr(self, bucket).discard(core)
+        if bucket == "infixes":
+            self.version += 1
+        # Length hints are only an optimisation; stale entries just cost a lookup
+        return True
+
+    @staticmethod
+    def compile_automaton(infixes):
+        """Aho-Corasick goto/fail/output tables for the given anywhere-patterns"""
+        goto = [{}]
+        output = [None]
+
+        for core in infixes:
+            node = 0
+            for char in core:
+                next_node = goto[node].get(char)
+                if next_node is None:
+                    next_node = len(goto)
+                    goto[node][char] = next_node
+                    goto.append({})
+                    output.append(None)
+                node = next_node
+            output[node] = core
+
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for node in queue:
+            for char, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(char, 0) if goto[state].get(char) != child else 0
+                if output[child] is None:
+                    output[child] = output[fail[child]]
+
+        return goto, fail, output
+
+    def build_automaton(self):
+        """Rebuild the automaton synchronously"""
+        self.built_version = self.version
+        self.automaton = self.compile_automaton(self.infixes) if self.infixes else None
+        return self.automaton
+
+    async def rebuild_automaton(self):
+        # Snapshot on the event loop thread, since edits keep mutating self.infixes
+        while self.built_version != self.version:
+            version = self.version
+            infixes = list(self.infixes)
+            automaton = await asyncio.to_thread(self.compile_automaton, infixes) if infixes else None
+            self.automaton = automaton
+            self.built_version = version
+
+    def schedule_rebuild(self):
+        """Start (or join) a background rebuild; returns the task so callers can wait for it"""
+        if self.rebuild_task is None or self.rebuild_task.done():
+            self.rebuild_task = asyncio.create_task(self.rebuild_automaton())
+        return self.rebuild_task
+
+    def match(self, text):
+        """Return the first pattern core found in text, or None"""
+        for tokens in tokenize(text):
+            if tokens:
+                keyword = self.match_tokens(tokens)
+                if keyword:
+                    return keyword
+        return None
+
+    def match_tokens(self, tokens):
+        exact = self.exact
+        for length in self.phrase_lengths:
+            if length == 1:
+                for token in tokens:
+                    if token in exact:
+                        return token
+            else:
+                for index in range(len(tokens) - length + 1):
+                    phrase = " ".join(tokens[index:index + length])
+                    if phrase in exact:
+                        return phrase
+
+        if self.prefixes or self.suffixes:
+            for token in tokens:
+                for length in self.prefix_lengths:
+                    if length <= len(token) and token[:length] in self.prefixes:
+                        return token[:length]
+                for length in self.suffix_lengths:
+                    if length <= len(token) and token[-length:] in self.suffixes:
+                        return token[-length:]
+
+        if self.automaton:
+            goto, fail, output = self.automaton
+            state = 0
+            for char in " ".join(tokens):
+                while state and char not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(char, 0)
+                if output[state]:
+                    return output[state]
+
+        return None
+
+
+if __name__ == "__main__":
+    # Benchmark: python wordfilter.py
+    import random
+    import string
+    import time
+
+    # Punctuation around a word must not hide it
+    matcher = KeywordMatcher(["idiot", "sh!t", "*scam*"])
+    matcher.build_automaton()
+    for message in ("you idiot!", "IDIOT!!!", "email me @idiot", "(idiot)", "idiot.", "1d10t", "sh!t", "$h1t", "fr33 $cam!"):
+        assert matcher.match(message), message
+    assert matcher.match("idiotic") is None
+
+    random.seed(0)
+
+    def random_word():
+        return "".join(random.choices(string.ascii_lowercase, k=random.randint(4, 10)))
+
+    messages = [
+        " ".join(random_word() for _ in range(random.randint(5, 40)))
+        for _ in range(2000)
+    ]
+
+    for size in (1_000, 10_000, 100_000, 250_000):
+        patterns = []
+        for _ in range(size):
+            word = random_word()
+            roll = random.random()
+            if roll < 0.05:
+                word = f"*{word}*"
+            elif roll < 0.15:
+                word = f"{word}*"
+            elif roll < 0.25:
+                word = f"*{word}"
+            patterns.append(word)
+
+        started = time.perf_counter()
+        matcher = KeywordMatcher(patterns)
+        matcher.build_automaton()
+        build = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for message in messages:
+            matcher.match(message)
+        per_message = (time.perf_counter() - started) / len(messages) * 1e6
+
+        print(f"{size:>8} patterns: build {build:.2f}s, match {per_message:.1f}µs/message")